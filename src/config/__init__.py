@@ -0,0 +1,53 @@
+import os
+import threading
+
+import yaml
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.yml')
+
+
+class Lazy:
+    """
+    Shared resource created on first use instead of at import time.
+
+    ``set`` injects a replacement, such as a test stand-in, and ``reset`` drops
+    the instance so the factory runs again on the next ``get``.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.value = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        if self.value is None:
+            with self.lock:
+                if self.value is None:
+                    self.value = self.factory()
+        return self.value
+
+    def set(self, value):
+        with self.lock:
+            self.value = value
+
+    def reset(self):
+        self.set(None)
+
+
+def _load_config():
+    # FINANCEML_CONFIG points workers and deployments at another file.
+    with open(os.environ.get("FINANCEML_CONFIG", CONFIG_PATH), 'r') as f:
+        return yaml.safe_load(f)
+
+
+_config = Lazy(_load_config)
+
+
+def get_config():
+    """Returns config.yml, read once per process."""
+    return _config.get()
+
+
+def set_config(config):
+    """Replaces the loaded config; None reloads it from disk on next use."""
+    _config.set(config)
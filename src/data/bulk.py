@@ -0,0 +1,97 @@
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.data.models.article import Article
+from src.data.models.analysis_summary import AnalysisSummary
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+SUMMARY_FIELDS = ("sentiment", "key_points", "potential_impact", "credibility_issues")
+
+
+def dialect_insert(session, model):
+    """Returns an INSERT for ``model`` that supports ON CONFLICT on the session's database."""
+    name = session.get_bind().dialect.name
+    if name not in _INSERTS:
+        raise ValueError(f"Bulk upsert is not supported on {name}.")
+    return _INSERTS[name](model)
+
+
+def insert_new_articles(session, rows):
+    """
+    Inserts articles with one multi-row INSERT ... ON CONFLICT (url) DO NOTHING.
+
+    Args:
+        rows (list): Article column dicts (source, title, url, content, published_at).
+
+    Returns:
+        dict: url -> id of the articles that were actually inserted.
+    """
+    if not rows:
+        return {}
+    stmt = dialect_insert(session, Article).on_conflict_do_nothing(index_elements=["url"])
+    inserted = session.execute(stmt.returning(Article.id, Article.url), rows)
+    return {url: article_id for article_id, url in inserted}
+
+
+def article_ids_by_title(session, titles, batch_size=5000):
+    """
+    Resolves article titles to ids with one query per ``batch_size`` distinct titles.
+
+    Returns:
+        dict: title -> id for the titles that exist; titles shared by several
+        articles map to the oldest one.
+    """
+    titles = list(dict.fromkeys(titles))
+    ids = {}
+    for start in range(0, len(titles), batch_size):
+        batch = titles[start:start + batch_size]
+        query = select(Article.title, func.min(Article.id)).where(Article.title.in_(batch)).group_by(Article.title)
+        ids.update(session.execute(query).all())
+    return ids
+
+
+def upsert_analysis_summaries(session, rows):
+    """
+    Writes analysis summaries with one INSERT ... ON CONFLICT (article_id) DO UPDATE.
+
+    Args:
+        rows (list): Dicts with article_id and any of the summary fields; fields
+            left out keep their stored value on update. When an article_id repeats,
+            the last row wins.
+    """
+    if not rows:
+        return
+    # One statement cannot update the same row twice.
+    rows = list({row["article_id"]: row for row in rows}.values())
+    # executemany needs the same keys in every row.
+    fields = [field for field in SUMMARY_FIELDS if any(field in row for row in rows)]
+    rows = [{"article_id": row["article_id"], **{field: row.get(field) for field in fields}} for row in rows]
+    stmt = dialect_insert(session, AnalysisSummary)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["article_id"],
+        set_={field: getattr(stmt.excluded, field) for field in fields},
+    )
+    session.execute(stmt, rows)
+
+
+def upsert_sentiments_by_title(session, titles, sentiments):
+    """
+    Sets the AnalysisSummary sentiment of articles given by title, in one lookup and one upsert.
+
+    Articles not in the database are skipped. The caller owns the transaction.
+
+    Returns:
+        int: Number of summaries written.
+    """
+    ids = article_ids_by_title(session, titles)
+    rows = [
+        {"article_id": ids[title], "sentiment": sentiment, "key_points": [], "credibility_issues": None}
+        for title, sentiment in zip(titles, sentiments) if title in ids
+    ]
+    upsert_analysis_summaries(session, rows)
+    return len(rows)
@@ -6,7 +6,7 @@ Base = declarative_base()
 from .article import Article
 from .market_data import MarketData
 from .analysis_summary import AnalysisSummary
-from .database import get_session, get_db_config
+from .database import get_session, get_db_config, get_engine, set_engine
 
 __all__ = [
     'Base',
@@ -14,5 +14,7 @@ __all__ = [
     'AnalysisSummary',
     'MarketData',
     'get_session',
-    'get_db_config'
+    'get_db_config',
+    'get_engine',
+    'set_engine'
 ]
\ No newline at end of file
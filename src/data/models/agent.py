@@ -1,103 +1,119 @@
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
 from abc import ABC, abstractmethod
-from sqlalchemy.orm import sessionmaker
-from src.data.models.database import engine
-from src.data.models.analysis_summary import AnalysisSummary
-from src.data.models.article import Article
+from src.data.bulk import upsert_analysis_summaries, upsert_sentiments_by_title
+from src.data.models.database import get_session
+from src.processing.sentiment import SENTIMENT_THRESHOLD, score_articles
+from src.processing.text import clean_text
 import logging
 
 logger = logging.getLogger(__name__)
 
 class AnalyticalAgent(ABC):
-    """Base class for analytical agents handling sentiment and credibility analysis."""
-    
+    """
+    Base class for analytical agents handling sentiment and credibility analysis.
+
+    Subclasses set ``signal_column`` and ``label`` and implement compute_signal,
+    which only reads a scored frame; AgentRunner calls it on one shared frame.
+    """
+
+    signal_column = None
+    label = None
+
     def __init__(self, articles):
-        self.df = pd.DataFrame(articles)
-        self.session = sessionmaker(bind=engine)()
-    
+        """
+        Args:
+            articles (list | pd.DataFrame): Article dicts, or a frame from score_articles.
+        """
+        self.df = articles.copy() if isinstance(articles, pd.DataFrame) else pd.DataFrame(articles)
+        self._session = None
+
+    @property
+    def session(self):
+        if self._session is None:
+            self._session = get_session()
+        return self._session
+
+    @classmethod
     @abstractmethod
+    def compute_signal(cls, scored):
+        """Returns the boolean signal per article of a frame from score_articles."""
+
     def analyze(self):
-        pass
+        """Scores the articles, adds the signal column and stores it as the articles' sentiment."""
+        self.preprocess_articles()
+        if self.df.empty or "clean_content" not in self.df.columns:
+            logger.info(f"No articles to analyze for {self.signal_column}.")
+            return self.df
+        self.df[self.signal_column] = self.compute_signal(self.df)
+        self.save_signals(self.signal_column, self.label)
+        return self.df
 
     def clean_text(self, text):
         """Removes HTML and special characters."""
-        import re
-        text = re.sub(r'<[^>]*>', '', text)
-        text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-        return text.lower().strip()
+        return clean_text(text)
 
     def preprocess_articles(self):
-        """Prepares the text for sentiment analysis."""
+        """Prepares the text and sentiment scores, unless the frame was scored already."""
         if self.df.empty:
             logger.warning("Empty DataFrame provided; skipping preprocessing.")
             return
-        if "content" not in self.df.columns:
+        if "content" not in self.df.columns and "clean_content" not in self.df.columns:
             raise KeyError("Missing 'content' column in DataFrame.")
-        self.df["clean_content"] = self.df["content"].apply(self.clean_text)
-        self.df["date_parsed"] = pd.to_datetime(self.df["published_at"], errors='coerce')
+        self.df = score_articles(self.df)
 
     def save_analysis(self, article_id, sentiment, key_points, credibility_issues):
         """Save or update analysis results in the database."""
-        existing_analysis = self.session.query(AnalysisSummary).filter_by(article_id=article_id).first()
-        if existing_analysis:
-            existing_analysis.sentiment = sentiment
-            existing_analysis.key_points = key_points
-            existing_analysis.credibility_issues = credibility_issues
-        else:
-            analysis = AnalysisSummary(
-                article_id=article_id,
-                sentiment=sentiment,
-                key_points=key_points,
-                credibility_issues=credibility_issues
-            )
-            self.session.add(analysis)
+        self.save_analyses([{
+            "article_id": article_id,
+            "sentiment": sentiment,
+            "key_points": key_points,
+            "credibility_issues": credibility_issues,
+        }])
+
+    def save_analyses(self, rows):
+        """Upserts many analysis results with one statement and one commit."""
+        if not rows:
+            return
+        try:
+            upsert_analysis_summaries(self.session, rows)
+            self.session.commit()
+        except Exception as e:
+            logger.error(f"Error saving analyses for {len(rows)} articles: {e}")
+            self.session.rollback()
+
+    def save_signals(self, signal_column, label):
+        """
+        Stores each article's signal as its AnalysisSummary sentiment in one upsert.
+
+        Args:
+            signal_column (str): Boolean signal column of self.df.
+            label (str): Sentiment stored where the signal is set; others get "Neutral".
+        """
+        labels = np.where(self.df[signal_column].to_numpy(dtype=bool), label, "Neutral")
         try:
+            upsert_sentiments_by_title(self.session, self.df["title"].tolist(), labels.tolist())
             self.session.commit()
         except Exception as e:
-            logger.error(f"Error saving analysis for article_id {article_id}: {e}")
+            logger.error(f"Error saving {signal_column} for {len(labels)} articles: {e}")
             self.session.rollback()
 
 class BullishAgent(AnalyticalAgent):
     """Detects bullish trends based on sentiment and key phrases."""
-    
-    def analyze(self):
-        self.preprocess_articles()
-        if self.df.empty or "clean_content" not in self.df.columns:
-            logger.info("No articles to analyze for bullish sentiment.")
-            return self.df
-        self.df["sentiment_score"] = self.df["clean_content"].apply(lambda x: TextBlob(x).sentiment.polarity)
-        self.df["bullish_signal"] = self.df["sentiment_score"].apply(lambda x: x > 0.1)
-        
-        for _, row in self.df.iterrows():
-            article = self.session.query(Article).filter_by(title=row["title"]).first()
-            if article:
-                self.save_analysis(
-                    article.id,
-                    "Bullish" if row["bullish_signal"] else "Neutral",
-                    key_points=[], 
-                    credibility_issues=None
-                )
-        return self.df
+
+    signal_column = "bullish_signal"
+    label = "Bullish"
+
+    @classmethod
+    def compute_signal(cls, scored):
+        return scored["sentiment_score"] > SENTIMENT_THRESHOLD
 
 class BearishAgent(AnalyticalAgent):
     """Detects bearish trends based on sentiment and key phrases."""
-    
-    def analyze(self):
-        self.preprocess_articles()
-        if self.df.empty or "clean_content" not in self.df.columns:
-            logger.info("No articles to analyze for bearish sentiment.")
-            return self.df
-        self.df["sentiment_score"] = self.df["clean_content"].apply(lambda x: TextBlob(x).sentiment.polarity)
-        self.df["bearish_signal"] = self.df["sentiment_score"].apply(lambda x: x < -0.1)
-        
-        for _, row in self.df.iterrows():
-            article = self.session.query(Article).filter_by(title=row["title"]).first()
-            if article:
-                self.save_analysis(
-                    article.id,
-                    "Bearish" if row["bearish_signal"] else "Neutral",
-                    key_points=[], 
-                    credibility_issues=None
-                )
-        return self.df
+
+    signal_column = "bearish_signal"
+    label = "Bearish"
+
+    @classmethod
+    def compute_signal(cls, scored):
+        return scored["sentiment_score"] < -SENTIMENT_THRESHOLD
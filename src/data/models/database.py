@@ -1,25 +1,30 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-import yaml, os
+from src.config import Lazy, get_config
 from .base import Base
 
 def get_db_config():
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
-    config_path = os.path.join(base_dir, 'src', 'config', 'config.yml')
+    return get_config()['database']
 
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    return config['database']
+def get_database_url():
+    db_conf = get_db_config()
+    return (
+        f"postgresql://{db_conf['user']}:{db_conf['password']}@"
+        f"{db_conf['host']}:{db_conf['port']}/{db_conf['dbname']}"
+    )
 
-db_conf = get_db_config()
+_engine = Lazy(lambda: create_engine(get_database_url()))
+_session_factory = Lazy(lambda: sessionmaker(bind=get_engine()))
 
-DATABASE_URL = (
-    f"postgresql://{db_conf['user']}:{db_conf['password']}@"
-    f"{db_conf['host']}:{db_conf['port']}/{db_conf['dbname']}"
-)
+def get_engine():
+    """Returns the shared engine, created on first use."""
+    return _engine.get()
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+def set_engine(engine):
+    """Injects the engine to use (e.g. an in-memory SQLite engine); None recreates it from config."""
+    _engine.set(engine)
+    _session_factory.reset()
 
 def get_session():
-    return SessionLocal()
+    """Opens a session on the shared engine; the sessionmaker is bound on first use."""
+    return _session_factory.get()()
@@ -1,10 +1,27 @@
 import pandas as pd
+from src.processing.indicators import default_store
 
 class TradingStrategy:
     """Defines the buy/sell decision-making process using sentiment analysis."""
 
-    def __init__(self, bullish_ma_window=10):
+    def __init__(self, bullish_ma_window=10, indicator_store=None):
         self.bullish_ma_window = bullish_ma_window
+        self.indicators = indicator_store if indicator_store is not None else default_store
+
+    def moving_average(self, df):
+        """Cached moving average of the close price over the bullish window."""
+        return self.indicators.get(df, "sma", window=self.bullish_ma_window)
+
+    def buy_signals(self, df):
+        """Whole-array should_buy: bullish sentiment and price above the moving average."""
+        bullish = df["bullish_signal"].fillna(False).to_numpy(dtype=bool)
+        buy = bullish & (df["close"].to_numpy() > self.moving_average(df))
+        buy[:self.bullish_ma_window] = False  # not enough data for moving average yet
+        return pd.Series(buy, index=df.index, name="buy_signal")
+
+    def sell_signals(self, df):
+        """Whole-array should_sell: bearish sentiment."""
+        return df["bearish_signal"].fillna(False).astype(bool).rename("sell_signal")
 
     def should_buy(self, df, current_date):
         """Buy when sentiment is bullish and price is above moving average."""
@@ -12,10 +29,11 @@ class TradingStrategy:
             return False
         row = df.loc[current_date]
 
-        if df.index.get_loc(current_date) < self.bullish_ma_window:
+        position = df.index.get_loc(current_date)
+        if position < self.bullish_ma_window:
             return False  # not enough data for moving average yet
 
-        moving_average = df["close"].rolling(self.bullish_ma_window).mean().loc[current_date]
+        moving_average = self.moving_average(df)[position]
         return row["bullish_signal"] and row["close"] > moving_average
 
     def should_sell(self, df, current_date):
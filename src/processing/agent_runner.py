@@ -0,0 +1,139 @@
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from src.data.bulk import upsert_sentiments_by_title
+from src.data.models.agent import BearishAgent, BullishAgent
+from src.data.models.database import get_session
+from src.processing.sentiment import score_articles
+
+logger = logging.getLogger(__name__)
+
+AGENTS = {}
+
+
+def register_agent(name, agent_cls=None):
+    """
+    Registers an AnalyticalAgent subclass under ``name`` for AgentRunner.
+
+    Usable as a call, register_agent("bullish", BullishAgent), or as a class decorator.
+    """
+    def register(cls):
+        if cls.signal_column is None or cls.label is None:
+            raise ValueError(f"Agent {cls.__name__} does not declare a signal_column and label.")
+        AGENTS[name] = cls
+        return cls
+    return register(agent_cls) if agent_cls is not None else register
+
+
+register_agent("bullish", BullishAgent)
+register_agent("bearish", BearishAgent)
+
+
+def _run_agent(agent_cls, scored):
+    start = time.perf_counter()
+    signal = agent_cls.compute_signal(scored)
+    return signal, time.perf_counter() - start
+
+
+def combine_labels(signals, agents):
+    """
+    One sentiment label per article from several agents' signals.
+
+    An article gets an agent's label when that agent's signal is the only one
+    set; articles with no signal, or with conflicting ones, are "Neutral".
+
+    Args:
+        signals (pd.DataFrame): Frame with each agent's signal column.
+        agents (list): Agent classes whose signals are combined.
+
+    Returns:
+        np.ndarray: Label per row of ``signals``.
+    """
+    fired = np.column_stack([signals[agent.signal_column].to_numpy(dtype=bool) for agent in agents])
+    labels = np.array([agent.label for agent in agents], dtype=object)
+    return np.where(fired.sum(axis=1) == 1, labels[fired.argmax(axis=1)], "Neutral")
+
+
+class AgentRunner:
+    """
+    Runs registered agents concurrently over one preprocessed article frame.
+
+    Articles are cleaned and scored once. Every agent computes its signal from
+    that same read-only frame in a thread or a process. The signals are merged
+    onto the frame together with one combined sentiment_label per article, which
+    is stored in a single upsert. The time each step took is recorded.
+    """
+
+    def __init__(self, agents=None, executor="thread", max_workers=None, persist=False):
+        """
+        Args:
+            agents (list): Registered agent names; defaults to all of them.
+            executor (str): "thread", or "process" for CPU-heavy agents.
+            max_workers (int): Pool size; defaults to one worker per agent.
+            persist (bool): Store the combined labels as the articles' AnalysisSummary sentiment;
+                off by default so backtests never touch the database.
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.agents = list(agents or AGENTS)
+        unknown = [name for name in self.agents if name not in AGENTS]
+        if unknown:
+            raise KeyError(f"Unknown agents: {unknown}")
+        self.executor = executor
+        self.max_workers = max_workers
+        self.persist = persist
+        self.timings = {}
+
+    def _pool(self):
+        workers = self.max_workers or len(self.agents)
+        if self.executor == "process":
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def run(self, articles):
+        """
+        Preprocesses the articles once and runs every agent on them.
+
+        Args:
+            articles (list | pd.DataFrame): Articles with title, content and published_at.
+
+        Returns:
+            pd.DataFrame: The scored articles with one signal column per agent
+            and the combined sentiment_label.
+        """
+        start = time.perf_counter()
+        scored = score_articles(articles)
+        self.timings = {"preprocess": time.perf_counter() - start}
+        if scored.empty or not self.agents:
+            return scored
+
+        with self._pool() as pool:
+            futures = {name: pool.submit(_run_agent, AGENTS[name], scored) for name in self.agents}
+            results = {name: future.result() for name, future in futures.items()}
+
+        merged = scored.copy()
+        for name, (signal, elapsed) in results.items():
+            self.timings[name] = elapsed
+            merged[AGENTS[name].signal_column] = signal
+        merged["sentiment_label"] = combine_labels(merged, [AGENTS[name] for name in self.agents])
+
+        if self.persist:
+            persist_start = time.perf_counter()
+            self.save(merged)
+            self.timings["persist"] = time.perf_counter() - persist_start
+        self.timings["total"] = time.perf_counter() - start
+        logger.info(f"Agent run timings (s): {self.timings}")
+        return merged
+
+    def save(self, merged):
+        """Stores the combined labels with one lookup, one upsert and one commit."""
+        # Opening the session is inside the handler too, so a missing database only logs.
+        try:
+            with get_session() as session:
+                upsert_sentiments_by_title(session, merged["title"].tolist(), merged["sentiment_label"].tolist())
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error saving agent sentiments for {len(merged)} articles: {e}")
@@ -3,7 +3,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import logging
 from src.scraping.scrape_data import fetch_binance_historical_data
-from src.data.models.agent import BullishAgent, BearishAgent
+from src.scraping.kline_cache import KlineCache
+from src.scraping.kline_ingest import load_market_data
+from src.processing.agent_runner import AgentRunner
+from src.processing.execution_engine import simulate_long_flat
+from src.processing.signal_join import join_signal
+from src.processing.metrics import compute_metrics, equity_from_trades, periods_per_year
+from src.processing.rendering import downsample_series, render_price_chart
 
 # Configure logging if not already configured elsewhere.
 logging.basicConfig(level=logging.INFO, 
@@ -11,7 +17,8 @@ logging.basicConfig(level=logging.INFO,
 logger = logging.getLogger(__name__)
 
 class Backtester:
-    def __init__(self, trading_strategy, start_date, end_date, initial_balance=10000, trading_fee=0.001):
+    def __init__(self, trading_strategy, start_date, end_date, initial_balance=10000, trading_fee=0.001,
+                 kline_cache=None):
         self.strategy = trading_strategy
         self.start_date = start_date
         self.end_date = end_date
@@ -19,52 +26,105 @@ class Backtester:
         self.trading_fee = trading_fee
         self.df = None
         self.trades = []
-
-    def load_data(self, symbol="BTCUSDT", interval="1d"):
+        self.equity_curve = None
+        self.position = None
+        self.kline_cache = kline_cache if kline_cache is not None else KlineCache()
+
+    def load_data(self, symbol="BTCUSDT", interval="1d", offline=False, session=None):
+        """
+        Loads the price bars, from Binance (through the kline cache) or from market_data.
+
+        Args:
+            session (Session): Read the start_date..end_date bars ingested into the
+                market_data table instead of calling Binance; ``interval`` is then
+                whatever the symbol was ingested at.
+        """
         try:
-            self.df = fetch_binance_historical_data(symbol=symbol, interval=interval, lookback="365 days ago UTC")
+            if session is not None:
+                self.df = load_market_data(session, symbol, self.start_date, self.end_date)
+            else:
+                self.df = fetch_binance_historical_data(
+                    symbol=symbol, interval=interval, lookback="365 days ago UTC",
+                    cache=self.kline_cache, offline=offline
+                )
             self.df.set_index("date", inplace=True)
             logger.info("Binance market data loaded successfully.")
         except Exception as e:
             logger.error(f"Error loading market data: {e}")
             raise
 
-    def apply_sentiment_analysis(self, articles):
-        # Instantiate analysis agents for the provided articles.
-        bullish_agent = BullishAgent(articles)
-        bearish_agent = BearishAgent(articles)
-
-        # Run analysis. For empty article list, these agents should return empty DataFrames.
-        bull_df = bullish_agent.analyze()
-        bear_df = bearish_agent.analyze()
-
-        # Debug prints for verification.
-        logger.info("Bullish analysis result:")
-        logger.info(bull_df.head())
-        logger.info("Bearish analysis result:")
-        logger.info(bear_df.head())
-
-        # If bull_df is empty or does not contain expected columns, assign default signals.
-        if bull_df.empty or "date_parsed" not in bull_df.columns or "bullish_signal" not in bull_df.columns:
-            logger.info("No bullish analysis data available; assigning default False to bullish_signal.")
-            self.df["bullish_signal"] = False
-        else:
-            self.df["bullish_signal"] = self.df.index.map(
-                lambda d: bull_df.loc[bull_df["date_parsed"] == d, "bullish_signal"].any()
-                if d in bull_df["date_parsed"].values else False
-            )
-
-        # Similarly, if bear_df is empty or missing expected columns, assign default signals.
-        if bear_df.empty or "date_parsed" not in bear_df.columns or "bearish_signal" not in bear_df.columns:
-            logger.info("No bearish analysis data available; assigning default False to bearish_signal.")
-            self.df["bearish_signal"] = False
+    def apply_sentiment_analysis(self, articles, alignment="asof"):
+        """
+        Runs the sentiment agents and joins their signals onto the price bars.
+
+        Args:
+            articles (list): Article dicts with title, content and published_at.
+            alignment (str): "asof" maps each article to the latest bar opened at or
+                before it, "floor" buckets articles by their timestamp floored to the bar width.
+        """
+        # Score the articles once and run both agents on that frame concurrently.
+        # For an empty article list the merged frame is empty.
+        signals = AgentRunner(["bullish", "bearish"]).run(articles)
+        logger.info("Agent signals:")
+        logger.info(signals.head())
+
+        for column in ("bullish_signal", "bearish_signal"):
+            if signals.empty or "date_parsed" not in signals.columns or column not in signals.columns:
+                logger.info(f"No analysis data available; assigning default False to {column}.")
+                self.df[column] = False
+            else:
+                self.df[column] = join_signal(self.df.index, signals, column, how=alignment)
+
+    def execute_strategy(self, engine="vectorized", use_strategy=False):
+        """
+        Runs the strategy over the loaded signal frame.
+
+        Args:
+            engine (str): "vectorized" for the NumPy engine, "loop" for the bar-by-bar
+                reference implementation. Both return the same trades and final value.
+            use_strategy (bool): Trade on the TradingStrategy buy/sell rules instead of
+                the raw sentiment signals.
+
+        Returns:
+            float: Final portfolio value.
+        """
+        # Each run starts from a clean book, so metrics never mix two engines' results.
+        self.trades = []
+        self.equity_curve = None
+        self.position = None
+        if engine == "vectorized":
+            return self._execute_vectorized(use_strategy)
+        if engine == "loop":
+            return self._execute_loop(use_strategy)
+        raise ValueError(f"Unknown execution engine: {engine}")
+
+    def _execute_vectorized(self, use_strategy=False):
+        if use_strategy:
+            buy = self.strategy.buy_signals(self.df)
+            sell = self.strategy.sell_signals(self.df)
         else:
-            self.df["bearish_signal"] = self.df.index.map(
-                lambda d: bear_df.loc[bear_df["date_parsed"] == d, "bearish_signal"].any()
-                if d in bear_df["date_parsed"].values else False
-            )
+            buy = self.df["bullish_signal"].fillna(False)
+            sell = self.df["bearish_signal"].fillna(False)
+        result = simulate_long_flat(
+            self.df["close"].to_numpy(dtype=float),
+            buy.to_numpy(dtype=bool),
+            sell.to_numpy(dtype=bool),
+            initial_balance=self.initial_balance,
+            trading_fee=self.trading_fee,
+        )
+        dates = self.df.index[result["trade_idx"]]
+        for date, is_buy, price, amount in zip(dates, result["is_buy"], result["prices"], result["amounts"]):
+            self.trades.append({
+                "date": date, "action": "BUY" if is_buy else "SELL", "price": float(price), "amount": float(amount)
+            })
+        self.equity_curve = pd.Series(result["equity"], index=self.df.index, name="equity")
+        self.position = pd.Series(result["state"], index=self.df.index, name="position")
+
+        final_value = result["final_value"]
+        logger.info(f"Executed {len(dates)} trades; final portfolio value: ${final_value:.2f}")
+        return final_value
 
-    def execute_strategy(self):
+    def _execute_loop(self, use_strategy=False):
         balance = self.initial_balance
         position = 0  # BTC holdings
 
@@ -73,7 +133,14 @@ class Backtester:
             date = self.df.index[i]
 
             try:
-                if self.df.iloc[i]["bullish_signal"] and balance > 0:
+                if use_strategy:
+                    buy_signal = self.strategy.should_buy(self.df, date)
+                    sell_signal = self.strategy.should_sell(self.df, date)
+                else:
+                    buy_signal = self.df.iloc[i]["bullish_signal"]
+                    sell_signal = self.df.iloc[i]["bearish_signal"]
+
+                if buy_signal and balance > 0:
                     amount = (balance * (1 - self.trading_fee)) / current_price
                     position += amount
                     balance = 0
@@ -81,7 +148,7 @@ class Backtester:
                         "date": date, "action": "BUY", "price": current_price, "amount": amount
                     })
                     logger.info(f"Executed BUY on {date} for {amount:.4f} BTC")
-                elif self.df.iloc[i]["bearish_signal"] and position > 0:
+                elif sell_signal and position > 0:
                     balance += position * current_price * (1 - self.trading_fee)
                     self.trades.append({
                         "date": date, "action": "SELL", "price": current_price, "amount": position
@@ -92,28 +159,62 @@ class Backtester:
                 logger.error(f"Error during strategy execution on {date}: {e}")
 
         final_value = balance + (position * self.df.iloc[-1]["close"])
+        equity, state = equity_from_trades(
+            self.df["close"], self.df.index, self.trades, self.initial_balance, self.trading_fee
+        )
+        self.equity_curve = pd.Series(equity, index=self.df.index, name="equity")
+        self.position = pd.Series(state, index=self.df.index, name="position")
         logger.info(f"Final portfolio value: ${final_value:.2f}")
         return final_value
 
-    def plot_results(self):
+    def performance_metrics(self):
+        """
+        Computes Sharpe, Sortino, drawdown, exposure, turnover and trade statistics.
+
+        Uses the equity curve of the last run, or rebuilds it from the trades list.
+        """
+        if self.equity_curve is not None:
+            equity, position = self.equity_curve.to_numpy(), self.position.to_numpy()
+        else:
+            equity, position = equity_from_trades(
+                self.df["close"], self.df.index, self.trades, self.initial_balance, self.trading_fee
+            )
+        return compute_metrics(equity, position, periods_per_year=periods_per_year(self.df.index))
+
+    def plot_results(self, path=None, max_points=2000, executor=None):
+        """
+        Plots the price series with buy/sell markers.
+
+        The price line is reduced to ``max_points`` points with LTTB; trade bars are
+        always kept so markers stay on the line.
+
+        Args:
+            path (str): Write the chart to this file (PNG, SVG, ...) instead of showing it.
+            max_points (int): Point budget for the price line.
+            executor (concurrent.futures.Executor): Render ``path`` in this worker pool.
+
+        Returns:
+            str | Future | None: The written path, or a Future when an executor is given.
+        """
         buy_signals = [trade for trade in self.trades if trade["action"] == "BUY"]
         sell_signals = [trade for trade in self.trades if trade["action"] == "SELL"]
+        trade_idx = self.df.index.get_indexer([trade["date"] for trade in self.trades])
+        dates, close = downsample_series(self.df.index, self.df["close"], max_points, keep=trade_idx[trade_idx >= 0])
+        buys = ([trade["date"] for trade in buy_signals], [trade["price"] for trade in buy_signals])
+        sells = ([trade["date"] for trade in sell_signals], [trade["price"] for trade in sell_signals])
+
+        if path is not None:
+            if executor is not None:
+                return executor.submit(render_price_chart, path, dates, close, buys, sells)
+            return render_price_chart(path, dates, close, buys, sells)
 
         plt.figure(figsize=(12, 6))
-        plt.plot(self.df.index, self.df["close"], label="BTC Price", linewidth=1, alpha=0.7)
+        plt.plot(dates, close, label="BTC Price", linewidth=1, alpha=0.7)
 
         if buy_signals:
-            plt.scatter(
-                [trade["date"] for trade in buy_signals],
-                [trade["price"] for trade in buy_signals],
-                marker="^", color="g", label="Buy", alpha=0.8
-            )
+            plt.scatter(*buys, marker="^", color="g", label="Buy", alpha=0.8)
         if sell_signals:
-            plt.scatter(
-                [trade["date"] for trade in sell_signals],
-                [trade["price"] for trade in sell_signals],
-                marker="v", color="r", label="Sell", alpha=0.8
-            )
+            plt.scatter(*sells, marker="v", color="r", label="Sell", alpha=0.8)
 
         plt.title("Backtesting Results")
         plt.xlabel("Date")
@@ -1,33 +1,40 @@
 import pandas as pd
 import numpy as np
-import re
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from textblob import TextBlob
+import scipy.sparse as sp
+from src.processing.sentiment import get_sentiment_scorer, sentiment_labels
+from src.processing.features import TfidfFeatures
+from src.processing.text import clean_text, text_features
 import logging
 
 logger = logging.getLogger(__name__)
 
 class DataProcessor:
-    def __init__(self, articles):
-        """Initialize with a list of articles (from DB or Scrapy)."""
+    def __init__(self, articles, workers=None, features=None):
+        """
+        Initialize with a list of articles (from DB or Scrapy).
+
+        Args:
+            articles (list): Article dicts with title, content and published_at.
+            workers (int): Processes used to clean large corpora; defaults to the CPU count.
+            features (TfidfFeatures): TF-IDF model to update and apply, e.g. one with a
+                persisted vocabulary; defaults to a fresh 100-term model.
+        """
         self.df = pd.DataFrame(articles)
+        self.workers = workers
+        self.features = features
         logger.info(f"DataProcessor initialized with {len(self.df)} articles.")
 
     def clean_text(self, text):
         """Clean article text: remove HTML, symbols, and lowercasing."""
-        cleaned = re.sub(r'<[^>]*>', '', text)  # Remove HTML tags
-        cleaned = re.sub(r'[^a-zA-Z0-9\s]', '', cleaned)  # Remove special characters
-        cleaned = cleaned.lower().strip()
-        return cleaned
+        return clean_text(text)
 
     def preprocess_articles(self):
         """Applies preprocessing steps to all articles."""
         try:
-            self.df["clean_content"] = self.df["content"].apply(self.clean_text)
-            self.df["title_length"] = self.df["title"].apply(lambda x: len(str(x)))
-            self.df["content_length"] = self.df["clean_content"].apply(lambda x: len(str(x)))
-            self.df["word_count"] = self.df["clean_content"].apply(lambda x: len(x.split()))
+            features = text_features(self.df["content"], self.df["title"], workers=self.workers)
+            for column in ("clean_content", "title_length", "content_length", "word_count"):
+                self.df[column] = features[column]
             self.df["date_parsed"] = pd.to_datetime(self.df["published_at"], errors='coerce')
             logger.info("Article preprocessing completed.")
         except Exception as e:
@@ -35,25 +42,54 @@ class DataProcessor:
             raise
 
     def analyze_sentiment(self):
-        """Apply sentiment analysis using TextBlob."""
+        """Apply TextBlob sentiment analysis through the shared, memoized scorer."""
         try:
-            self.df["sentiment_score"] = self.df["clean_content"].apply(lambda x: TextBlob(x).sentiment.polarity)
-            self.df["sentiment_label"] = self.df["sentiment_score"].apply(
-                lambda x: "Bullish" if x > 0.1 else ("Bearish" if x < -0.1 else "Neutral")
-            )
+            self.df["sentiment_score"] = get_sentiment_scorer().score(self.df["clean_content"].tolist())
+            self.df["sentiment_label"] = sentiment_labels(self.df["sentiment_score"])
             logger.info("Sentiment analysis completed.")
         except Exception as e:
             logger.error(f"Error during sentiment analysis: {e}")
             raise
 
-    def feature_engineering(self):
-        """Apply TF-IDF for keyword extraction."""
+    def feature_engineering(self, chunk_size=10000):
+        """
+        Apply TF-IDF for keyword extraction, streaming the corpus in chunks.
+
+        The matrix stays sparse: it is kept as self.tfidf_matrix (CSR), and
+        self.df_tfidf is a sparse-backed DataFrame over it. In hashing mode
+        df_tfidf only has the hash columns used by these articles.
+        """
         try:
-            vectorizer = TfidfVectorizer(stop_words="english", max_features=100)
-            tfidf_matrix = vectorizer.fit_transform(self.df["clean_content"])
-            feature_names = vectorizer.get_feature_names_out()
-            self.df_tfidf = pd.DataFrame(tfidf_matrix.toarray(), columns=feature_names)
-            logger.info("TF-IDF feature engineering completed.")
+            features = self.features or TfidfFeatures(max_features=100)
+            texts = self.df["clean_content"]
+
+            def chunks(texts):
+                for start in range(0, len(texts), chunk_size):
+                    yield texts.iloc[start:start + chunk_size].tolist()
+
+            # Only articles published after the model's watermark update it; all are transformed.
+            dates = self.df["date_parsed"]
+            if features.watermark is not None:
+                fresh = texts[dates > features.watermark]
+            else:
+                fresh = texts
+            if not fresh.empty or not features.fitted:
+                features.fit(chunks(fresh))
+                latest = dates.max()
+                if pd.notna(latest) and (features.watermark is None or latest > features.watermark):
+                    features.watermark = latest
+                if features.path is not None:
+                    features.save()
+            self.tfidf_matrix = sp.vstack(list(features.transform_chunks(chunks(texts))), format="csr")
+
+            names = features.feature_names()
+            if names is None:
+                used = np.flatnonzero(self.tfidf_matrix.getnnz(axis=0))
+                matrix, names = self.tfidf_matrix[:, used], [f"hash_{i}" for i in used]
+            else:
+                matrix = self.tfidf_matrix
+            self.df_tfidf = pd.DataFrame.sparse.from_spmatrix(matrix, index=self.df.index, columns=names)
+            logger.info(f"TF-IDF feature engineering completed: {self.tfidf_matrix.nnz} non-zero entries.")
         except Exception as e:
             logger.error(f"Error during feature engineering: {e}")
             raise
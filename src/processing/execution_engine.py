@@ -0,0 +1,103 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def position_states(bullish, bearish, initial_state=False, skip_first=True):
+    """
+    Computes the long/flat position state after every bar.
+
+    Mirrors the loop engine: a flat book buys on a bullish bar, a long book sells
+    on a bearish bar, and the first bar never trades. Bars that are both bullish
+    and bearish always trade, so they toggle the state.
+
+    Args:
+        bullish (array-like): Boolean bullish signal per bar, shape (bars,) or (bars, assets).
+        bearish (array-like): Boolean bearish signal per bar, same shape.
+        initial_state (bool | array-like): Whether the book is long before the first bar.
+        skip_first (bool): Never trade on the first bar; disable when continuing a run.
+
+    Returns:
+        np.ndarray: Boolean array, True where the book is long after the bar.
+    """
+    bull = np.array(bullish, dtype=bool)
+    bear = np.array(bearish, dtype=bool)
+    if len(bull) == 0:
+        return np.zeros(bull.shape, dtype=bool)
+    if skip_first:
+        bull[0] = bear[0] = False
+
+    # A virtual leading bar anchors the state the book starts in.
+    start = np.broadcast_to(np.asarray(initial_state, dtype=bool), bull.shape[1:])
+    bull = np.concatenate((start[None], bull))
+    bear = np.concatenate((~start[None], bear))
+
+    # Bull-only bars set the state, bear-only bars reset it, both-bars flip it.
+    anchor = bull ^ bear
+    toggles = np.cumsum(bull & bear, axis=0)
+    rows = np.arange(len(bull)).reshape((-1,) + (1,) * (bull.ndim - 1))
+    anchor_idx = np.maximum.accumulate(np.where(anchor, rows, 0), axis=0)
+    flips = (toggles - np.take_along_axis(toggles, anchor_idx, axis=0)) % 2
+    return (np.take_along_axis(bull, anchor_idx, axis=0) ^ flips.astype(bool))[1:]
+
+
+def simulate_long_flat(close, bullish, bearish, initial_balance=10000, trading_fee=0.001,
+                       initial_state=False, skip_first=True):
+    """
+    Simulates the all-in long/flat strategy over whole arrays.
+
+    Two-dimensional inputs (bars x assets) simulate one independent sleeve per
+    asset in the same pass; ``initial_balance`` may then be a per-asset array.
+
+    Args:
+        close (array-like): Close price per bar.
+        bullish (array-like): Boolean bullish signal per bar.
+        bearish (array-like): Boolean bearish signal per bar.
+        initial_balance (float | array-like): Starting cash, or units held when
+            ``initial_state`` is long.
+        trading_fee (float): Proportional fee charged on every fill.
+        initial_state (bool | array-like): Whether the book is long before the first bar.
+        skip_first (bool): Never trade on the first bar; disable when continuing a run.
+
+    Returns:
+        dict: position state, trade bar indices (and assets for 2-D inputs), trade
+        sides (True for BUY), trade amounts, trade prices, the cash-or-units
+        holding and equity per bar, and the final value.
+    """
+    close = np.asarray(close, dtype=float)
+    initial_balance = np.asarray(initial_balance, dtype=float)
+    initial_state = np.asarray(initial_state, dtype=bool)
+    bullish = np.asarray(bullish, dtype=bool) & (initial_balance > 0)
+    state = position_states(bullish, bearish, initial_state=initial_state, skip_first=skip_first)
+
+    start = np.broadcast_to(initial_state, state.shape[1:])[None]
+    changed = state != np.concatenate((start, state))[:-1]
+    buys = changed & state
+    sells = changed & ~state
+
+    # Cash converts to units on a BUY and back to cash on a SELL; other bars hold.
+    factors = np.ones(state.shape)
+    factors[buys] = (1 - trading_fee) / close[buys]
+    factors[sells] = close[sells] * (1 - trading_fee)
+    holding = initial_balance * np.cumprod(factors, axis=0)
+    equity = np.where(state, holding * close, holding)
+
+    trade = np.nonzero(changed)
+    held_before = np.concatenate((initial_balance * np.ones((1,) + state.shape[1:]), holding[:-1]))
+    is_buy = state[trade]
+    result = {
+        "state": state,
+        "trade_idx": trade[0],
+        "is_buy": is_buy,
+        "amounts": np.where(is_buy, holding[trade], held_before[trade]),
+        "prices": close[trade],
+        "holding": holding,
+        "equity": equity,
+        "final_value": equity[-1] if len(equity) else initial_balance * np.ones(state.shape[1:]),
+    }
+    if state.ndim == 2:
+        result["trade_asset"] = trade[1]
+    else:
+        result["final_value"] = float(result["final_value"])
+    return result
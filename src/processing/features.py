@@ -0,0 +1,152 @@
+import logging
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+
+class TfidfFeatures:
+    """
+    Incremental, sparse TF-IDF matching TfidfVectorizer's defaults.
+
+    Two modes:
+    - "vocabulary" keeps the ``max_features`` most frequent terms of the first
+      fit, then reuses that vocabulary;
+    - "hashing" hashes terms into ``n_features`` columns and needs no vocabulary.
+
+    In both modes document frequencies are running counts. New articles update
+    them and are transformed without refitting, so daily work grows with the new
+    articles rather than with the whole history. ``watermark`` is the latest
+    publication date counted so far; callers only fit articles published after
+    it, so fitting a corpus again leaves the model unchanged. With a ``path``
+    the state is loaded from and saved to a NumPy .npz file.
+    """
+
+    def __init__(self, mode="vocabulary", max_features=100, n_features=2**18, path=None):
+        """
+        Args:
+            mode (str): "vocabulary" or "hashing".
+            max_features (int): Vocabulary size in vocabulary mode.
+            n_features (int): Hash space in hashing mode.
+            path (str): Optional .npz state file.
+        """
+        if mode not in ("vocabulary", "hashing"):
+            raise ValueError(f"Unknown TF-IDF mode: {mode}")
+        self.mode = mode
+        self.max_features = max_features
+        self.n_features = n_features
+        self.path = path
+        self.vocabulary = None
+        self.doc_freq = np.zeros(n_features if mode == "hashing" else 0, dtype=np.int64)
+        self.n_docs = 0
+        self.watermark = None
+        if path is not None and os.path.exists(path):
+            with np.load(path) as state:
+                self.mode = str(state["mode"])
+                if self.mode == "vocabulary":
+                    self.vocabulary = {str(term): i for i, term in enumerate(state["terms"])}
+                self.doc_freq = state["doc_freq"].astype(np.int64)
+                self.n_docs = int(state["n_docs"])
+                self.watermark = pd.Timestamp(str(state["watermark"])) if str(state["watermark"]) else None
+        self._vectorizer = None
+
+    def save(self):
+        """Atomically writes the vocabulary, document frequencies and watermark."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f"{self.path}.tmp", 'wb') as f:
+            np.savez(
+                f,
+                mode=np.str_(self.mode),
+                terms=np.array(self.feature_names() or [], dtype=str),
+                doc_freq=self.doc_freq,
+                n_docs=np.int64(self.n_docs),
+                watermark=np.str_(self.watermark.isoformat() if self.watermark is not None else ""),
+            )
+        os.replace(f"{self.path}.tmp", self.path)
+
+    @property
+    def fitted(self):
+        return self.mode == "hashing" or self.vocabulary is not None
+
+    def vectorizer(self):
+        if self._vectorizer is None:
+            if self.mode == "hashing":
+                self._vectorizer = HashingVectorizer(
+                    n_features=len(self.doc_freq), stop_words="english", alternate_sign=False, norm=None
+                )
+            else:
+                self._vectorizer = CountVectorizer(stop_words="english", vocabulary=self.vocabulary)
+        return self._vectorizer
+
+    def feature_names(self):
+        """Term per column in vocabulary mode; None in hashing mode."""
+        if self.mode == "hashing":
+            return None
+        return sorted(self.vocabulary, key=self.vocabulary.get)
+
+    def _fit_vocabulary(self, chunks):
+        # One streaming pass collects term totals and document frequencies together.
+        totals, doc_freq = Counter(), Counter()
+        for chunk in chunks:
+            self.n_docs += len(chunk)
+            if not chunk:
+                continue
+            vectorizer = CountVectorizer(stop_words="english")
+            try:
+                counts = vectorizer.fit_transform(chunk)
+            except ValueError:  # only stop words in this chunk
+                continue
+            terms = vectorizer.get_feature_names_out()
+            totals.update(dict(zip(terms, counts.sum(axis=0).A1.tolist())))
+            doc_freq.update(dict(zip(terms, counts.getnnz(axis=0).tolist())))
+        if not totals:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+        kept = sorted(sorted(totals, key=lambda term: (-totals[term], term))[:self.max_features])
+        self.vocabulary = {term: i for i, term in enumerate(kept)}
+        self.doc_freq = np.array([doc_freq[term] for term in kept], dtype=np.int64)
+
+    def fit(self, chunks):
+        """
+        Updates the model with a stream of text chunks.
+
+        The first fit in vocabulary mode also chooses the vocabulary; later fits
+        only add document frequencies. Skipping texts counted before is up to
+        the caller, e.g. by fitting only articles newer than ``watermark``.
+
+        Args:
+            chunks (iterable): Lists of cleaned texts.
+        """
+        if not self.fitted:
+            self._fit_vocabulary(chunks)
+            return self
+        for chunk in chunks:
+            if not chunk:
+                continue
+            counts = self.vectorizer().transform(chunk)
+            self.doc_freq += counts.getnnz(axis=0)
+            self.n_docs += counts.shape[0]
+        return self
+
+    def partial_fit(self, texts):
+        return self.fit([texts])
+
+    def transform(self, texts):
+        """
+        TF-IDF of texts as an L2-normalized CSR matrix.
+
+        Uses the smoothed idf of TfidfVectorizer, ln((1 + n) / (1 + df)) + 1.
+        """
+        counts = self.vectorizer().transform(texts).astype(np.float64)
+        idf = np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+        return normalize(sp.csr_matrix(counts @ sp.diags(idf)), norm="l2", copy=False)
+
+    def transform_chunks(self, chunks):
+        """Transforms a stream of text chunks one at a time."""
+        for chunk in chunks:
+            yield self.transform(chunk)
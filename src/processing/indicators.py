@@ -0,0 +1,83 @@
+import hashlib
+import logging
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def sma(values, window):
+    """Simple moving average; NaN until the window is full."""
+    return pd.Series(values).rolling(window).mean().to_numpy()
+
+
+def ema(values, span):
+    """Exponential moving average."""
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+INDICATORS = {
+    "sma": sma,
+    "ema": ema,
+}
+
+
+class IndicatorStore:
+    """
+    Memoizes indicator columns by a hash of the input data and the parameters.
+
+    Each (indicator, parameters) column is computed once per dataset. The input
+    column is hashed on every lookup, so a frame mutated in place, or a new frame
+    reusing a freed one's id, never gets a stale column.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(df, column):
+        """Hashes a column's values together with the frame index."""
+        row_hashes = pd.util.hash_pandas_object(df[column], index=True).to_numpy()
+        return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+
+    def get(self, df, name, column="close", **params):
+        """
+        Returns the indicator column for a frame, computing it on first use.
+
+        Args:
+            df (pd.DataFrame): Price frame.
+            name (str): Indicator name, a key of INDICATORS.
+            column (str): Input column.
+            **params: Indicator parameters, e.g. window=10.
+
+        Returns:
+            np.ndarray: Read-only indicator values aligned to ``df``.
+        """
+        if name not in INDICATORS:
+            raise KeyError(f"Unknown indicator: {name}")
+        key = (self.fingerprint(df, column), name, column, tuple(sorted(params.items())))
+        values = self._cache.get(key)
+        if values is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return values
+
+        self.misses += 1
+        values = INDICATORS[name](df[column].to_numpy(dtype=np.float64), **params)
+        values.setflags(write=False)
+        self._cache[key] = values
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return values
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+
+default_store = IndicatorStore()
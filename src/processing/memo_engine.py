@@ -1,8 +1,7 @@
 import pandas as pd
 import json
 from datetime import datetime, timedelta
-from sqlalchemy.orm import sessionmaker
-from src.data.models.database import engine
+from src.data.models.database import get_session
 from src.data.models.analysis_summary import AnalysisSummary
 import logging
 
@@ -11,7 +10,7 @@ logger = logging.getLogger(__name__)
 class MemoEngine:
     def __init__(self, period="daily", data=None):
         self.period = period
-        self.session = sessionmaker(bind=engine)()
+        self.session = get_session()
         if data is not None:
             self.df = pd.DataFrame(data)
         else:
@@ -0,0 +1,139 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def periods_per_year(index):
+    """Bars per year implied by the median bar width of a DatetimeIndex."""
+    if len(index) < 2:
+        return 365
+    return pd.Timedelta(days=365) / pd.Series(index).diff().median()
+
+
+def equity_from_trades(close, dates, trades, initial_balance=10000, trading_fee=0.001):
+    """
+    Rebuilds the per-bar equity curve and position state from a trades list.
+
+    Args:
+        close (array-like): Close price per bar.
+        dates (pd.DatetimeIndex): Bar dates matching ``close``.
+        trades (list): Backtester.trades dicts with date, action and amount.
+
+    Returns:
+        tuple: (equity, position) arrays aligned to ``dates``.
+    """
+    close = np.asarray(close, dtype=float)
+    if not trades:
+        return np.full(len(close), float(initial_balance)), np.zeros(len(close), dtype=bool)
+    trade_idx = dates.get_indexer(pd.DatetimeIndex([t["date"] for t in trades]))
+    is_buy = np.array([t["action"] == "BUY" for t in trades])
+    amounts = np.array([t["amount"] for t in trades], dtype=float)
+
+    # After a BUY the book holds units; after a SELL it holds the sale proceeds.
+    held = np.where(is_buy, amounts, amounts * close[trade_idx] * (1 - trading_fee))
+    held = np.concatenate(([float(initial_balance)], held))
+    last = np.searchsorted(trade_idx, np.arange(len(close)), side="right")
+    position = np.concatenate(([False], is_buy))[last]
+    equity = np.where(position, held[last] * close, held[last])
+    return equity, position
+
+
+def compute_metrics(equity, position=None, periods_per_year=365):
+    """
+    Computes performance metrics for one equity curve or a stacked batch.
+
+    Args:
+        equity (array-like): Equity per bar, shape (bars,) or (runs, bars).
+        position (array-like): Optional long/flat state per bar, same shape; enables
+            exposure, turnover and trade statistics.
+        periods_per_year (float): Bars per year used to annualize Sharpe and Sortino.
+
+    Returns:
+        dict | pd.DataFrame: A dict of floats for one curve, one row per run for a batch.
+    """
+    equity = np.asarray(equity, dtype=float)
+    single = equity.ndim == 1
+    eq = np.atleast_2d(equity)
+    n_bars = eq.shape[1]
+
+    returns = eq[:, 1:] / eq[:, :-1] - 1 if n_bars > 1 else np.zeros((len(eq), 1))
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.zeros(len(eq))
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2, axis=1))
+    scale = np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * scale, 0.0)
+        sortino = np.where(downside > 0, mean / downside * scale, 0.0)
+
+    peak = np.maximum.accumulate(eq, axis=1)
+    drawdown = eq / peak - 1
+    bars = np.arange(n_bars)
+    last_peak = np.maximum.accumulate(np.where(drawdown < 0, 0, bars), axis=1)
+
+    metrics = {
+        "final_value": eq[:, -1],
+        "total_return_pct": (eq[:, -1] / eq[:, 0] - 1) * 100,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown_pct": drawdown.min(axis=1) * 100,
+        "max_drawdown_duration": (bars - last_peak).max(axis=1),
+    }
+
+    if position is not None:
+        pos = np.atleast_2d(np.asarray(position, dtype=bool))
+        changed = np.zeros(pos.shape, dtype=bool)
+        changed[:, 1:] = pos[:, 1:] != pos[:, :-1]
+        pnl = trade_pnl(equity, position)
+        runs = pnl["run"].to_numpy()
+        n_trades = np.bincount(runs, minlength=len(eq))
+        wins = np.bincount(runs, weights=pnl["pnl"].to_numpy() > 0, minlength=len(eq))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics.update({
+                "exposure": pos.mean(axis=1),
+                "turnover": (eq * changed).sum(axis=1) / eq.mean(axis=1),
+                "n_trades": n_trades,
+                "win_rate": np.where(n_trades > 0, wins / n_trades, 0.0),
+                "avg_trade_pnl": np.where(
+                    n_trades > 0, np.bincount(runs, weights=pnl["pnl"].to_numpy(), minlength=len(eq)) / n_trades, 0.0
+                ),
+            })
+
+    if single:
+        return {name: float(values[0]) for name, values in metrics.items()}
+    return pd.DataFrame(metrics)
+
+
+def trade_pnl(equity, position):
+    """
+    Per-trade P&L of long/flat runs; a position still open at the end is marked to market.
+
+    Args:
+        equity (array-like): Equity per bar, shape (bars,) or (runs, bars).
+        position (array-like): Long/flat state per bar, same shape.
+
+    Returns:
+        pd.DataFrame: One row per round trip with run, entry and exit bar, pnl and return_pct.
+    """
+    eq = np.atleast_2d(np.asarray(equity, dtype=float))
+    pos = np.atleast_2d(np.asarray(position, dtype=bool))
+    prev = np.zeros(pos.shape, dtype=bool)
+    prev[:, 1:] = pos[:, :-1]
+    entries = pos & ~prev
+    exits = ~pos & prev
+    exits[:, -1] |= pos[:, -1]
+
+    # Round trips alternate within a run, so row-major order pairs each entry with its exit.
+    entry_run, entry_bar = np.nonzero(entries)
+    _, exit_bar = np.nonzero(exits)
+    before = eq[entry_run, np.maximum(entry_bar - 1, 0)]
+    after = eq[entry_run, exit_bar]
+    return pd.DataFrame({
+        "run": entry_run,
+        "entry": entry_bar,
+        "exit": exit_bar,
+        "pnl": after - before,
+        "return_pct": (after / before - 1) * 100,
+    })
@@ -0,0 +1,210 @@
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src.processing.execution_engine import simulate_long_flat
+from src.processing.indicators import sma
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_COLUMNS = ("close", "bullish_signal", "bearish_signal")
+
+# Per-worker views onto the shared signal buffer, set by _attach_shared_block.
+_shared = {}
+
+
+def grid_search_space(**params):
+    """
+    Builds the cartesian product of parameter values.
+
+    Example:
+        grid_search_space(bullish_ma_window=[5, 10, 20], trading_fee=[0.001, 0.0005])
+    """
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def random_search_space(n_samples, seed=None, **params):
+    """
+    Samples parameter points at random.
+
+    A list of values is sampled as a choice, a (low, high) tuple of ints as an
+    integer range (inclusive) and a (low, high) tuple of floats as a uniform range.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, spec in params.items():
+        if isinstance(spec, tuple):
+            low, high = spec
+            if isinstance(low, int) and isinstance(high, int):
+                columns[name] = rng.integers(low, high + 1, size=n_samples).tolist()
+            else:
+                columns[name] = rng.uniform(low, high, size=n_samples).tolist()
+        else:
+            columns[name] = [spec[i] for i in rng.integers(0, len(spec), size=n_samples)]
+    return [{name: columns[name][i] for name in columns} for i in range(n_samples)]
+
+
+def buy_signal(close, bullish, window, ma_cache=None):
+    """Same rule as TradingStrategy.buy_signals: bullish and above the moving average."""
+    if ma_cache is not None and window in ma_cache:
+        ma = ma_cache[window]
+    else:
+        ma = sma(close, window)
+        if ma_cache is not None:
+            ma_cache[window] = ma
+    buy = bullish & (close > ma)
+    buy[:window] = False
+    return buy
+
+
+def simulate_point(close, bullish, bearish, params, ma_cache=None, bars=None):
+    """
+    Simulates a single sweep point over the signal arrays.
+
+    Indicators are computed over the whole arrays, so when ``bars`` selects a window
+    its first bars already see the moving average warmed up by the history before it.
+    """
+    window = int(params.get("bullish_ma_window", 10))
+    buy = buy_signal(close, bullish, window, ma_cache)
+    bars = bars if bars is not None else slice(None)
+    return simulate_long_flat(
+        close[bars], buy[bars], bearish[bars],
+        initial_balance=params.get("initial_balance", 10000),
+        trading_fee=params.get("trading_fee", 0.001),
+    )
+
+
+def evaluate_point(close, bullish, bearish, params, ma_cache=None, bars=None):
+    """Runs a single sweep point and summarizes its result."""
+    initial_balance = params.get("initial_balance", 10000)
+    result = simulate_point(close, bullish, bearish, params, ma_cache, bars)
+    return {
+        **params,
+        "final_value": result["final_value"],
+        "return_pct": (result["final_value"] / initial_balance - 1) * 100,
+        "n_trades": len(result["trade_idx"]),
+    }
+
+
+def _signal_views(buf, n):
+    """Lays close (float64) followed by the two boolean signal arrays over one buffer."""
+    close = np.ndarray(n, dtype=np.float64, buffer=buf)
+    bullish = np.ndarray(n, dtype=np.bool_, buffer=buf, offset=8 * n)
+    bearish = np.ndarray(n, dtype=np.bool_, buffer=buf, offset=9 * n)
+    return close, bullish, bearish
+
+
+def _attach_shared_block(name, n):
+    shm = shared_memory.SharedMemory(name=name)
+    close, bullish, bearish = _signal_views(shm.buf, n)
+    _shared.update(shm=shm, close=close, bullish=bullish, bearish=bearish, ma_cache={})
+
+
+def shared_signals():
+    """Returns the worker's views onto the shared signal buffer (inside shared_signal_pool tasks)."""
+    return _shared
+
+
+@contextmanager
+def shared_signal_pool(close, bullish, bearish, max_workers):
+    """
+    Starts a process pool whose workers attach to one shared copy of the signal arrays.
+
+    Tasks read the arrays through shared_signals() instead of receiving pickled copies.
+    """
+    n = len(close)
+    shm = shared_memory.SharedMemory(create=True, size=max(10 * n, 1))
+    try:
+        views = _signal_views(shm.buf, n)
+        views[0][:], views[1][:], views[2][:] = close, bullish, bearish
+        del views
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_shared_block,
+            initargs=(shm.name, n),
+        ) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _evaluate_shared(params):
+    return evaluate_point(_shared["close"], _shared["bullish"], _shared["bearish"], params, _shared["ma_cache"])
+
+
+class ParameterSweep:
+    """Evaluates many strategy parameter points against one loaded signal frame."""
+
+    def __init__(self, signal_df, max_workers=None):
+        """
+        Args:
+            signal_df (pd.DataFrame): Frame with close, bullish_signal and bearish_signal
+                columns, e.g. Backtester.df after apply_sentiment_analysis.
+            max_workers (int): Process count; defaults to the CPU count, 1 runs in-process.
+        """
+        missing = [col for col in SIGNAL_COLUMNS if col not in signal_df.columns]
+        if missing:
+            raise KeyError(f"Missing columns for parameter sweep: {missing}")
+        self.close = signal_df["close"].to_numpy(dtype=np.float64)
+        self.bullish = signal_df["bullish_signal"].fillna(False).to_numpy(dtype=bool)
+        self.bearish = signal_df["bearish_signal"].fillna(False).to_numpy(dtype=bool)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, search_space, rank_by="return_pct", ascending=False):
+        """
+        Evaluates every point of the search space and ranks the results.
+
+        Args:
+            search_space (list): Parameter points to evaluate.
+            rank_by (str): Result column to rank by; return_pct by default, so points
+                with different initial_balance values compare fairly.
+            ascending (bool): Rank the smallest value first.
+
+        Returns:
+            pd.DataFrame: One row per parameter point, best first, with a rank column.
+        """
+        points = list(search_space)
+        if not points:
+            return pd.DataFrame()
+
+        if self.max_workers == 1 or len(points) == 1:
+            ma_cache = {}
+            results = [
+                evaluate_point(self.close, self.bullish, self.bearish, params, ma_cache)
+                for params in points
+            ]
+        else:
+            results = self._run_pool(points)
+
+        table = pd.DataFrame(results).sort_values(rank_by, ascending=ascending, kind="stable")
+        table.insert(0, "rank", np.arange(1, len(table) + 1))
+        logger.info(f"Parameter sweep evaluated {len(table)} points.")
+        return table.reset_index(drop=True)
+
+    def equity_curves(self, points):
+        """
+        Replays parameter points in-process and stacks their curves for batch scoring.
+
+        Example:
+            equity, position = sweep.equity_curves(table.head(20).to_dict("records"))
+            scores = compute_metrics(equity, position)
+
+        Returns:
+            tuple: (equity, position) arrays of shape (points, bars).
+        """
+        ma_cache = {}
+        results = [simulate_point(self.close, self.bullish, self.bearish, params, ma_cache) for params in points]
+        return np.stack([r["equity"] for r in results]), np.stack([r["state"] for r in results])
+
+    def _run_pool(self, points):
+        chunksize = max(1, len(points) // (self.max_workers * 4))
+        with shared_signal_pool(self.close, self.bullish, self.bearish, self.max_workers) as pool:
+            return list(pool.map(_evaluate_shared, points, chunksize=chunksize))
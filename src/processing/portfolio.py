@@ -0,0 +1,136 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.processing.agent_runner import AgentRunner
+from src.processing.execution_engine import simulate_long_flat
+from src.processing.signal_join import join_signal
+from src.scraping.kline_cache import KlineCache
+from src.scraping.scrape_data import fetch_binance_historical_data
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioBacktester:
+    """
+    Backtests the sentiment strategy over several symbols at once.
+
+    Prices live in one aligned (time x asset) array sliced to the requested date
+    window, and every asset runs as its own long/flat sleeve in a single batched
+    simulation.
+    """
+
+    def __init__(self, trading_strategy, symbols, start_date, end_date, initial_balance=10000,
+                 trading_fee=0.001, kline_cache=None):
+        self.strategy = trading_strategy
+        self.symbols = list(symbols)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.initial_balance = initial_balance
+        self.trading_fee = trading_fee
+        self.kline_cache = kline_cache if kline_cache is not None else KlineCache()
+        self.dates = None
+        self.close = None
+        self.bullish = None
+        self.bearish = None
+        self.trades = []
+        self.equity_curve = None
+        self.asset_equity = None
+
+    def load_data(self, interval="1d", offline=False):
+        try:
+            frames = {
+                symbol: fetch_binance_historical_data(
+                    symbol=symbol, interval=interval, lookback=str(self.start_date),
+                    cache=self.kline_cache, offline=offline
+                )
+                for symbol in self.symbols
+            }
+            self.set_prices(frames)
+            logger.info(f"Loaded {len(self.dates)} bars for {len(self.symbols)} symbols.")
+        except Exception as e:
+            logger.error(f"Error loading portfolio market data: {e}")
+            raise
+
+    def set_prices(self, frames):
+        """
+        Aligns per-symbol kline frames into the (time x asset) close array.
+
+        Bars missing for one symbol are forward-filled; bars before a symbol's first
+        price stay NaN and are never traded.
+
+        Args:
+            frames (dict): Symbol -> DataFrame with "date" and "close" columns.
+        """
+        closes = pd.concat(
+            {symbol: frames[symbol].set_index("date")["close"] for symbol in self.symbols}, axis=1
+        ).sort_index()
+        start, end = pd.Timestamp(self.start_date), pd.Timestamp(self.end_date)
+        if end == end.normalize():
+            # A bare end date covers that whole day, including its intraday bars.
+            in_range = (closes.index >= start) & (closes.index < end + pd.Timedelta(days=1))
+        else:
+            in_range = (closes.index >= start) & (closes.index <= end)
+        closes = closes[in_range].ffill()
+        self.dates = closes.index
+        self.close = closes.to_numpy(dtype=float)
+        self.bullish = np.zeros(self.close.shape, dtype=bool)
+        self.bearish = np.zeros(self.close.shape, dtype=bool)
+
+    def apply_sentiment_analysis(self, articles, alignment="asof"):
+        """
+        Runs the sentiment agents per asset and joins their signals onto the bars.
+
+        Args:
+            articles (dict | list): Symbol -> article list, or one list shared by all symbols.
+            alignment (str): "asof" or "floor", see Backtester.apply_sentiment_analysis.
+        """
+        runner = AgentRunner(["bullish", "bearish"])
+        for symbol in self.symbols:
+            symbol_articles = articles.get(symbol, []) if isinstance(articles, dict) else articles
+            signals = runner.run(symbol_articles)
+            self.join_signals(symbol, signals, signals, alignment=alignment)
+
+    def join_signals(self, symbol, bull_df, bear_df, alignment="asof"):
+        """Joins one asset's agent outputs onto its signal columns."""
+        col = self.symbols.index(symbol)
+        if not bull_df.empty and {"date_parsed", "bullish_signal"} <= set(bull_df.columns):
+            self.bullish[:, col] = join_signal(self.dates, bull_df, "bullish_signal", how=alignment)
+        if not bear_df.empty and {"date_parsed", "bearish_signal"} <= set(bear_df.columns):
+            self.bearish[:, col] = join_signal(self.dates, bear_df, "bearish_signal", how=alignment)
+
+    def execute_strategy(self, weights=None):
+        """
+        Simulates every asset sleeve in one batched pass.
+
+        Args:
+            weights (array-like): Share of the initial balance per symbol; equal by default.
+
+        Returns:
+            float: Final portfolio value.
+        """
+        n_assets = len(self.symbols)
+        weights = np.full(n_assets, 1 / n_assets) if weights is None else np.asarray(weights, dtype=float)
+        priced = np.isfinite(self.close)
+        result = simulate_long_flat(
+            self.close,
+            self.bullish & priced,
+            self.bearish & priced,
+            initial_balance=self.initial_balance * weights,
+            trading_fee=self.trading_fee,
+        )
+
+        for t, col, is_buy, price, amount in zip(result["trade_idx"], result["trade_asset"], result["is_buy"],
+                                                 result["prices"], result["amounts"]):
+            self.trades.append({
+                "date": self.dates[t], "symbol": self.symbols[col], "action": "BUY" if is_buy else "SELL",
+                "price": float(price), "amount": float(amount)
+            })
+        self.asset_equity = pd.DataFrame(result["equity"], index=self.dates, columns=self.symbols)
+        self.equity_curve = self.asset_equity.sum(axis=1).rename("equity")
+
+        final_value = float(np.sum(result["final_value"]))
+        logger.info(f"Executed {len(result['trade_idx'])} trades across {n_assets} symbols; "
+                    f"final portfolio value: ${final_value:.2f}")
+        return final_value
@@ -0,0 +1,95 @@
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def lttb_indices(y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last point and, from each of ``n_out - 2`` equal buckets,
+    the point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, which preserves the visual shape of the series.
+
+    Args:
+        y (array-like): Series values, evenly spaced on the x axis.
+        n_out (int): Point budget.
+
+    Returns:
+        np.ndarray: Sorted indices of the points to keep.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Mean point of every bucket, used as the third triangle vertex for the bucket before it.
+    csum = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    mean_x = (edges[:-1] + edges[1:] - 1) / 2
+    mean_y = (csum[edges[1:]] - csum[edges[:-1]]) / counts
+    mean_x = np.append(mean_x, n - 1)
+    mean_y = np.append(mean_y, y[-1])
+
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs(
+            (x[prev] - mean_x[b + 1]) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (mean_y[b + 1] - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        kept[b + 1] = prev
+    return kept
+
+
+def downsample_series(dates, close, max_points, keep=None):
+    """
+    Reduces a price series to about ``max_points`` points with LTTB.
+
+    Args:
+        keep (array-like): Extra positions that must survive, e.g. trade bars, so
+            markers stay on the drawn line.
+
+    Returns:
+        tuple: (dates, close) of the kept points.
+    """
+    idx = lttb_indices(close, max_points)
+    if keep is not None and len(keep):
+        idx = np.union1d(idx, np.asarray(keep, dtype=int))
+    return np.asarray(dates)[idx], np.asarray(close)[idx]
+
+
+def render_price_chart(path, dates, close, buys=None, sells=None, title="Backtesting Results", label="BTC Price"):
+    """
+    Draws the price line with buy/sell markers and writes it to ``path`` (PNG, SVG, ...).
+
+    Uses a standalone Agg figure instead of pyplot, so it never opens a window and
+    can run in worker threads or processes.
+
+    Args:
+        buys, sells (tuple): (dates, prices) of the trade markers.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    ax.plot(dates, close, label=label, linewidth=1, alpha=0.7)
+    if buys is not None and len(buys[0]):
+        ax.scatter(buys[0], buys[1], marker="^", color="g", label="Buy", alpha=0.8)
+    if sells is not None and len(sells[0]):
+        ax.scatter(sells[0], sells[1], marker="v", color="r", label="Sell", alpha=0.8)
+    ax.set_title(title)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price (USDT)")
+    ax.legend()
+    ax.grid()
+    fig.savefig(path)
+    logger.info(f"Chart written to {path}")
+    return path
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+from src.config import Lazy
+from src.processing.text import text_features
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_THRESHOLD = 0.1
+
+
+def sentiment_key(text):
+    """Content hash of a cleaned article text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def polarity(text):
+    return TextBlob(text).sentiment.polarity
+
+
+class SentimentScorer:
+    """
+    TextBlob polarity scorer that computes each distinct text once.
+
+    Scores are memoized by content hash in an in-memory LRU of ``max_entries``
+    entries. With a ``path`` they are also kept in a SQLite file, so later runs
+    start warm. ``hits`` and ``misses`` count lookups.
+    """
+
+    def __init__(self, max_entries=100000, path=None):
+        """
+        Args:
+            max_entries (int): Size bound of the in-memory LRU.
+            path (str): Optional SQLite file persisting every computed score.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sentiment (key TEXT PRIMARY KEY, score REAL NOT NULL)")
+            self.conn.commit()
+
+    def _remember(self, key, score):
+        self.memory[key] = score
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _load(self, keys):
+        stored = {}
+        keys = list(keys)
+        # Stay below SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            stored.update(self.conn.execute(
+                f"SELECT key, score FROM sentiment WHERE key IN ({placeholders})", batch
+            ).fetchall())
+        return stored
+
+    def score(self, texts):
+        """
+        Scores cleaned texts, computing polarity only for texts not seen before.
+
+        Args:
+            texts (iterable): Cleaned article texts.
+
+        Returns:
+            np.ndarray: Polarity in [-1, 1] per text, in input order.
+        """
+        texts = list(texts)
+        keys = [sentiment_key(text) for text in texts]
+        unique = dict(zip(keys, texts))
+        with self.lock:
+            scores = {}
+            for key in unique:
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    scores[key] = self.memory[key]
+            missing = [key for key in unique if key not in scores]
+            if self.conn is not None and missing:
+                scores.update(self._load(missing))
+            computed = {key: polarity(unique[key]) for key in unique if key not in scores}
+            scores.update(computed)
+            for key in unique:
+                self._remember(key, scores[key])
+            if self.conn is not None and computed:
+                self.conn.executemany("INSERT OR REPLACE INTO sentiment (key, score) VALUES (?, ?)", computed.items())
+                self.conn.commit()
+            self.hits += len(keys) - len(computed)
+            self.misses += len(computed)
+        return np.fromiter((scores[key] for key in keys), dtype=float, count=len(keys))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.memory),
+        }
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+_scorer = Lazy(SentimentScorer)
+
+def get_sentiment_scorer():
+    """Returns the process-wide sentiment scorer, created on first use."""
+    return _scorer.get()
+
+def set_sentiment_scorer(scorer):
+    """Injects the sentiment scorer to use (e.g. a persisted one); None restores the default."""
+    _scorer.set(scorer)
+
+
+def sentiment_labels(scores, threshold=SENTIMENT_THRESHOLD):
+    """Maps polarity scores to Bullish, Bearish or Neutral."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select([scores > threshold, scores < -threshold], ["Bullish", "Bearish"], "Neutral")
+
+
+def score_articles(articles, scorer=None):
+    """
+    Cleans and scores articles once, for every agent that reads them.
+
+    Args:
+        articles (list | pd.DataFrame): Articles with content and published_at.
+        scorer (SentimentScorer): Defaults to the shared scorer.
+
+    Returns:
+        pd.DataFrame: The articles with clean_content, date_parsed and sentiment_score.
+    """
+    df = articles.copy() if isinstance(articles, pd.DataFrame) else pd.DataFrame(articles)
+    if df.empty:
+        return df
+    if "clean_content" not in df.columns:
+        df["clean_content"] = text_features(df["content"])["clean_content"]
+    if "date_parsed" not in df.columns:
+        df["date_parsed"] = pd.to_datetime(df["published_at"], errors='coerce')
+    if "sentiment_score" not in df.columns:
+        df["sentiment_score"] = (scorer or get_sentiment_scorer()).score(df["clean_content"].tolist())
+    return df
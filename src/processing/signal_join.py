@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def bar_width(index):
+    """Infers the bar width of a price index as the median spacing between bars."""
+    if len(index) < 2:
+        return None
+    return pd.Series(index).diff().median()
+
+
+def _as_naive_utc(timestamps):
+    timestamps = pd.DatetimeIndex(pd.to_datetime(timestamps, errors="coerce"))
+    if timestamps.tz is not None:
+        timestamps = timestamps.tz_convert("UTC").tz_localize(None)
+    return timestamps
+
+
+def align_events(index, timestamps, how="asof", freq=None, tolerance=None):
+    """
+    Maps event timestamps onto the bars of a sorted price index in one pass.
+
+    Args:
+        index (pd.DatetimeIndex): Bar open times, sorted ascending.
+        timestamps (array-like): Event (article) timestamps.
+        how (str): "asof" assigns each event to the latest bar opened at or before it;
+            "floor" buckets events by their timestamp floored to ``freq``.
+        freq (str | pd.Timedelta): Bucket size for "floor"; defaults to the bar width.
+        tolerance (pd.Timedelta): For "asof", events further than this from the bar
+            open are dropped; defaults to the bar width.
+
+    Returns:
+        np.ndarray: Bar position per event, -1 where the event falls outside the index.
+    """
+    index = _as_naive_utc(index)
+    if not index.is_monotonic_increasing:
+        raise ValueError("Price index must be sorted to align events.")
+    timestamps = _as_naive_utc(timestamps)
+    valid = ~timestamps.isna()
+
+    if how == "floor":
+        freq = freq if freq is not None else bar_width(index)
+        if freq is not None:
+            timestamps = timestamps.floor(freq)
+        pos = index.get_indexer(timestamps)
+    elif how == "asof":
+        tolerance = tolerance if tolerance is not None else bar_width(index)
+        pos = index.searchsorted(timestamps, side="right") - 1
+        valid &= pos >= 0
+        if tolerance is not None:
+            valid &= (timestamps - index[np.maximum(pos, 0)]) < tolerance
+    else:
+        raise ValueError(f"Unknown alignment: {how}")
+
+    return np.where(valid, pos, -1)
+
+
+def join_signal(index, events, column, how="asof", freq=None, tolerance=None):
+    """
+    Aggregates a boolean event column per bar with any().
+
+    Args:
+        index (pd.DatetimeIndex): Bar open times of the price frame.
+        events (pd.DataFrame): Frame with a ``date_parsed`` column and ``column``.
+        column (str): Boolean column to aggregate.
+
+    Returns:
+        np.ndarray: Boolean array aligned to ``index``.
+    """
+    signal = np.zeros(len(index), dtype=bool)
+    if events.empty:
+        return signal
+    pos = align_events(index, events["date_parsed"], how=how, freq=freq, tolerance=tolerance)
+    hits = (pos >= 0) & events[column].fillna(False).to_numpy(dtype=bool)
+    signal[pos[hits]] = True
+    return signal
@@ -0,0 +1,200 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.data.models.market_data import MarketData
+from src.processing.execution_engine import simulate_long_flat
+from src.processing.indicators import sma
+from src.processing.signal_join import align_events, bar_width
+
+logger = logging.getLogger(__name__)
+
+
+def iter_dataframe_chunks(df, chunk_size=10000):
+    """Yields an in-memory kline or event frame in fixed-size chunks."""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def iter_cached_klines(cache, symbol, interval, start=None, end=None, chunk_size=100000):
+    """
+    Yields klines from the on-disk KlineCache without loading the whole file.
+
+    The cache file is memory-mapped, so only the pages of the current chunk are read.
+    """
+    klines, _ = cache.load(symbol, interval)
+    if klines is None:
+        return
+    open_times = klines["open_time"]
+    lo = 0 if start is None else int(np.searchsorted(open_times, pd.Timestamp(start).value // 10**6))
+    hi = len(klines) if end is None else int(np.searchsorted(open_times, pd.Timestamp(end).value // 10**6, side="right"))
+    for chunk_start in range(lo, hi, chunk_size):
+        chunk = np.array(klines[chunk_start:min(chunk_start + chunk_size, hi)])
+        yield pd.DataFrame(
+            {"close": chunk["close"]},
+            index=pd.DatetimeIndex(pd.to_datetime(chunk["open_time"], unit="ms"), name="date"),
+        )
+
+
+def iter_market_data(session, symbol, start=None, end=None, chunk_size=100000):
+    """Yields klines from the market_data table with keyset pagination on open_time."""
+    last = None
+    while True:
+        query = session.query(MarketData.open_time, MarketData.close_price).filter(MarketData.symbol == symbol)
+        if last is not None:
+            query = query.filter(MarketData.open_time > last)
+        elif start is not None:
+            query = query.filter(MarketData.open_time >= start)
+        if end is not None:
+            query = query.filter(MarketData.open_time <= end)
+        rows = query.order_by(MarketData.open_time).limit(chunk_size).all()
+        if not rows:
+            return
+        yield pd.DataFrame(
+            {"close": [row.close_price for row in rows]},
+            index=pd.DatetimeIndex([row.open_time for row in rows], name="date"),
+        )
+        last = rows[-1].open_time
+        if len(rows) < chunk_size:
+            return
+
+
+class _EventCursor:
+    """Pulls time-sorted sentiment event chunks on demand."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = pd.DataFrame(columns=["date_parsed", "bullish_signal", "bearish_signal"])
+        self.exhausted = False
+
+    def take_until(self, until):
+        """Removes and returns the buffered events published before ``until`` (all when None)."""
+        while not self.exhausted and (until is None or self._last_time() < until):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.exhausted = True
+            elif not chunk.empty:
+                chunk = chunk.assign(date_parsed=pd.to_datetime(chunk["date_parsed"], errors="coerce"))
+                self.buffer = pd.concat([self.buffer, chunk], ignore_index=True) if len(self.buffer) else chunk
+        if until is None:
+            taken, self.buffer = self.buffer, self.buffer.iloc[0:0]
+            return taken
+        before = (self.buffer["date_parsed"] < until).to_numpy()
+        taken, self.buffer = self.buffer[before], self.buffer[~before]
+        return taken
+
+    def _last_time(self):
+        return self.buffer["date_parsed"].max() if len(self.buffer) else pd.Timestamp.min
+
+
+class StreamingBacktester:
+    """
+    Event-driven backtest over chunked klines and sentiment events in bounded memory.
+
+    Only the position, cash/units, the moving-average tail and one held-back bar are
+    kept between chunks, so results match Backtester.execute_strategy on the same
+    data while memory stays constant in the length of the history.
+    """
+
+    def __init__(self, trading_strategy=None, initial_balance=10000, trading_fee=0.001, use_strategy=False,
+                 tolerance=None):
+        """
+        Args:
+            trading_strategy (TradingStrategy): Needed with ``use_strategy`` for its moving-average window.
+            use_strategy (bool): Trade on the TradingStrategy rules instead of the raw signals.
+            tolerance (pd.Timedelta): As-of window for events; defaults to the bar width of the first chunk.
+        """
+        self.strategy = trading_strategy
+        self.initial_balance = initial_balance
+        self.trading_fee = trading_fee
+        self.use_strategy = use_strategy
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self):
+        self.trades = []
+        self.state = False
+        self.holding = float(self.initial_balance)
+        self.bars_seen = 0
+        self.last_close = None
+        self._close_tail = np.zeros(0)
+        self._tolerance = self.tolerance
+
+    @property
+    def final_value(self):
+        return self.holding * self.last_close if self.state else self.holding
+
+    def run(self, kline_chunks, sentiment_events=()):
+        """
+        Streams the backtest.
+
+        Args:
+            kline_chunks (iterable): DataFrames with a "close" column and a DatetimeIndex
+                (or a "date" column), in time order.
+            sentiment_events (iterable): DataFrames with "date_parsed" and "bullish_signal"
+                and/or "bearish_signal" columns, in time order.
+
+        Returns:
+            float: Final portfolio value.
+        """
+        self.reset()
+        events = _EventCursor(sentiment_events)
+        pending = None
+        for chunk in kline_chunks:
+            if "date" in chunk.columns:
+                chunk = chunk.set_index("date")
+            if chunk.empty:
+                continue
+            bars = chunk[["close"]] if pending is None else pd.concat([pending, chunk[["close"]]])
+            if self._tolerance is None and len(bars) > 1:
+                self._tolerance = bar_width(bars.index)
+
+            # The last bar waits for the next chunk, which tells where its as-of window ends.
+            self._process(bars.iloc[:-1], events.take_until(bars.index[-1]))
+            pending = bars.iloc[-1:]
+        if pending is not None:
+            self._process(pending, events.take_until(None))
+
+        logger.info(f"Streamed {self.bars_seen} bars with {len(self.trades)} trades; "
+                    f"final portfolio value: ${self.final_value:.2f}")
+        return self.final_value
+
+    def _signal(self, bars, events, column):
+        signal = np.zeros(len(bars), dtype=bool)
+        if events.empty or column not in events.columns:
+            return signal
+        pos = align_events(bars.index, events["date_parsed"], how="asof", tolerance=self._tolerance)
+        hits = (pos >= 0) & events[column].fillna(False).to_numpy(dtype=bool)
+        signal[pos[hits]] = True
+        return signal
+
+    def _process(self, bars, events):
+        if bars.empty:
+            return
+        close = bars["close"].to_numpy(dtype=float)
+        buy = self._signal(bars, events, "bullish_signal")
+        sell = self._signal(bars, events, "bearish_signal")
+
+        if self.use_strategy:
+            window = self.strategy.bullish_ma_window
+            ma = sma(np.concatenate((self._close_tail, close)), window)[len(self._close_tail):]
+            buy &= close > ma
+            buy &= self.bars_seen + np.arange(len(close)) >= window
+            self._close_tail = np.concatenate((self._close_tail, close))[-(window - 1):] if window > 1 else np.zeros(0)
+
+        result = simulate_long_flat(
+            close, buy, sell,
+            initial_balance=self.holding,
+            trading_fee=self.trading_fee,
+            initial_state=self.state,
+            skip_first=self.bars_seen == 0,
+        )
+        for i, is_buy, price, amount in zip(result["trade_idx"], result["is_buy"], result["prices"], result["amounts"]):
+            self.trades.append({
+                "date": bars.index[i], "action": "BUY" if is_buy else "SELL", "price": float(price), "amount": float(amount)
+            })
+        self.state = bool(result["state"][-1])
+        self.holding = float(result["holding"][-1])
+        self.last_close = float(close[-1])
+        self.bars_seen += len(close)
@@ -0,0 +1,85 @@
+import logging
+import os
+import re
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_TAGS = re.compile(rb'<[^>]*>')
+_TAGS_OR_SYMBOLS = re.compile(r'<[^>]*>|[^a-zA-Z0-9\s]')
+
+# The ASCII characters str.split() and \s treat as whitespace.
+_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+_KEEP = frozenset((string.ascii_letters + string.digits).encode() + _WHITESPACE)
+_SYMBOLS = bytes(c for c in range(128) if c not in _KEEP)
+_LOWER = bytes.maketrans(string.ascii_uppercase.encode(), string.ascii_lowercase.encode())
+
+CHUNK_SIZE = 50000
+
+
+def clean_text(text):
+    """
+    Removes HTML tags and special characters, then lowercases and strips the text.
+
+    ASCII text, the common case, is cleaned on bytes with one tag regex and one
+    translate call that lowercases and drops symbols together; other text goes
+    through the equivalent single-pass unicode regex.
+    """
+    try:
+        raw = text.encode("ascii")
+    except UnicodeEncodeError:
+        return _TAGS_OR_SYMBOLS.sub('', text).lower().strip()
+    if b'<' in raw:
+        raw = _TAGS.sub(b'', raw)
+    return raw.translate(_LOWER, _SYMBOLS).strip(_WHITESPACE).decode("ascii")
+
+
+def _text_columns(contents):
+    cleaned = [clean_text(text) for text in contents]
+    return cleaned, [len(text.split()) for text in cleaned]
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def text_features(content, title=None, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Cleans article texts and computes their length features.
+
+    Corpora larger than one chunk are split into chunks that a process pool
+    cleans in parallel; results are reassembled in the original order.
+
+    Args:
+        content (pd.Series): Raw article contents; missing values count as empty.
+        title (pd.Series): Article titles, for title_length.
+        workers (int): Worker processes; defaults to the CPU count for multi-chunk input.
+        chunk_size (int): Articles per chunk.
+
+    Returns:
+        pd.DataFrame: clean_content, content_length, word_count and, with titles,
+        title_length, on the index of ``content``.
+    """
+    contents = content.fillna("").astype(str).tolist()
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(contents) > chunk_size:
+        logger.info(f"Cleaning {len(contents)} articles in {workers} processes.")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map yields results in submission order, whatever order the chunks finish in.
+            parts = list(pool.map(_text_columns, _chunks(contents, chunk_size)))
+        cleaned = [text for part in parts for text in part[0]]
+        word_count = [count for part in parts for count in part[1]]
+    else:
+        cleaned, word_count = _text_columns(contents)
+
+    features = pd.DataFrame({"clean_content": cleaned}, index=content.index)
+    features["content_length"] = features["clean_content"].str.len()
+    features["word_count"] = np.asarray(word_count, dtype=np.int64)
+    if title is not None:
+        features["title_length"] = title.astype(str).str.len()
+    return features
@@ -0,0 +1,184 @@
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from src.processing.execution_engine import simulate_long_flat
+from src.processing.parameter_sweep import (
+    SIGNAL_COLUMNS, buy_signal, evaluate_point, shared_signal_pool, shared_signals
+)
+
+logger = logging.getLogger(__name__)
+
+
+def walk_forward_splits(index, train_size, test_size, step=None, anchored=False):
+    """
+    Splits a sorted bar index into walk-forward train/test folds.
+
+    Sizes are either bar counts (ints) or time spans ("365D", pd.Timedelta, DateOffset).
+
+    Args:
+        index (pd.DatetimeIndex): Bar open times.
+        train_size: Length of each training window.
+        test_size: Length of each test window.
+        step: Distance between consecutive folds; defaults to test_size.
+        anchored (bool): Grow every training window from the first bar instead of rolling it.
+
+    Returns:
+        list: (train_start, test_start, test_end) bar positions; train is
+        [train_start, test_start) and test is [test_start, test_end).
+    """
+    step = step if step is not None else test_size
+    n = len(index)
+    folds = []
+    if all(isinstance(size, (int, np.integer)) for size in (train_size, test_size, step)):
+        test_start = train_size
+        while test_start < n:
+            folds.append((0 if anchored else test_start - train_size, test_start, min(test_start + test_size, n)))
+            test_start += step
+        return folds
+
+    train_size, test_size, step = to_offset(train_size), to_offset(test_size), to_offset(step)
+    train_t, test_t = index[0], index[0] + train_size
+    while test_t <= index[-1]:
+        train_from = index[0] if anchored else train_t
+        train_start, test_start, test_end = index.searchsorted([train_from, test_t, test_t + test_size])
+        if test_end > test_start:
+            folds.append((int(train_start), int(test_start), int(test_end)))
+        train_t, test_t = train_t + step, test_t + step
+    return folds
+
+
+def run_fold(close, bullish, bearish, split, search_space, params, rank_by="return_pct", ascending=False,
+             ma_cache=None):
+    """
+    Picks the best parameter point on a fold's training window and evaluates it on the test window.
+
+    Returns:
+        dict: Chosen parameters with the train and test results.
+    """
+    train_start, test_start, test_end = split
+    train, test = slice(train_start, test_start), slice(test_start, test_end)
+    candidates = [
+        evaluate_point(close, bullish, bearish, {**params, **point}, ma_cache, bars=train)
+        for point in (search_space or [{}])
+    ]
+    order = sorted(range(len(candidates)), key=lambda i: candidates[i][rank_by], reverse=not ascending)
+    best = candidates[order[0]]
+    chosen = {**params, **(search_space[order[0]] if search_space else {})}
+    return {
+        "chosen": chosen,
+        "train": best,
+        "test": evaluate_point(close, bullish, bearish, chosen, ma_cache, bars=test),
+    }
+
+
+def _run_shared_fold(task):
+    signals = shared_signals()
+    return run_fold(signals["close"], signals["bullish"], signals["bearish"], *task, ma_cache=signals["ma_cache"])
+
+
+class WalkForward:
+    """Walk-forward and rolling-window evaluation of the sentiment strategy."""
+
+    def __init__(self, signal_df, train_size, test_size, step=None, anchored=False, max_workers=None):
+        """
+        Args:
+            signal_df (pd.DataFrame): Frame with close, bullish_signal and bearish_signal
+                columns indexed by date, e.g. Backtester.df after apply_sentiment_analysis.
+            train_size, test_size, step, anchored: See walk_forward_splits.
+            max_workers (int): Process count for the fold evaluations; 1 runs in-process.
+        """
+        missing = [col for col in SIGNAL_COLUMNS if col not in signal_df.columns]
+        if missing:
+            raise KeyError(f"Missing columns for walk-forward evaluation: {missing}")
+        self.index = signal_df.index
+        self.close = signal_df["close"].to_numpy(dtype=np.float64)
+        self.bullish = signal_df["bullish_signal"].fillna(False).to_numpy(dtype=bool)
+        self.bearish = signal_df["bearish_signal"].fillna(False).to_numpy(dtype=bool)
+        self.splits = walk_forward_splits(self.index, train_size, test_size, step=step, anchored=anchored)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.equity_curve = None
+
+    def run(self, search_space=None, params=None, rank_by="return_pct", ascending=False, chained=True):
+        """
+        Evaluates every fold.
+
+        Folds are independent while training, so they run concurrently. With
+        ``chained`` the test windows are then replayed as one continuous run:
+        cash and the open position carry from one window into the next, and the
+        moving averages keep the history of earlier windows.
+
+        Args:
+            search_space (list): Parameter points tried on each training window;
+                None evaluates ``params`` as-is.
+            params (dict): Base parameters (bullish_ma_window, trading_fee, initial_balance).
+            rank_by (str): Result column used to pick the best training point; return_pct
+                by default, so points with different initial_balance values compare fairly.
+            chained (bool): Carry cash/position across test windows (needs back-to-back windows).
+
+        Returns:
+            pd.DataFrame: One row per fold with the chosen parameters and test results.
+        """
+        params = dict(params or {})
+        search_space = list(search_space) if search_space else None
+        if not self.splits:
+            return pd.DataFrame()
+        if chained and any(nxt[1] != cur[2] for cur, nxt in zip(self.splits, self.splits[1:])):
+            raise ValueError("Chained walk-forward needs back-to-back test windows (step == test_size).")
+
+        tasks = [(split, search_space, params, rank_by, ascending) for split in self.splits]
+        if self.max_workers == 1 or len(tasks) == 1:
+            ma_cache = {}
+            folds = [run_fold(self.close, self.bullish, self.bearish, *task, ma_cache=ma_cache) for task in tasks]
+        else:
+            with shared_signal_pool(self.close, self.bullish, self.bearish, self.max_workers) as pool:
+                folds = list(pool.map(_run_shared_fold, tasks))
+
+        rows = []
+        for i, ((train_start, test_start, test_end), fold) in enumerate(zip(self.splits, folds)):
+            rows.append({
+                "fold": i,
+                "train_start": self.index[train_start],
+                "test_start": self.index[test_start],
+                "test_end": self.index[test_end - 1],
+                **fold["chosen"],
+                f"train_{rank_by}": fold["train"][rank_by],
+                "test_final_value": fold["test"]["final_value"],
+                "test_return_pct": fold["test"]["return_pct"],
+                "test_n_trades": fold["test"]["n_trades"],
+            })
+        table = pd.DataFrame(rows)
+        if chained:
+            table["chained_return_pct"] = self._run_chained(folds, params)
+        logger.info(f"Walk-forward evaluated {len(table)} folds.")
+        return table
+
+    def _run_chained(self, folds, params):
+        # Each test window trades with its fold's chosen parameters, starting
+        # from the cash or units and the position the previous window ended with.
+        holding, state = params.get("initial_balance", 10000), False
+        value = holding
+        equities, returns = [], []
+        ma_cache = {}
+        for i, ((_, test_start, test_end), fold) in enumerate(zip(self.splits, folds)):
+            chosen = fold["chosen"]
+            window = int(chosen.get("bullish_ma_window", 10))
+            buy = buy_signal(self.close, self.bullish, window, ma_cache)
+            result = simulate_long_flat(
+                self.close[test_start:test_end], buy[test_start:test_end], self.bearish[test_start:test_end],
+                initial_balance=holding,
+                trading_fee=chosen.get("trading_fee", 0.001),
+                initial_state=state,
+                skip_first=i == 0,
+            )
+            holding, state = result["holding"][-1], result["state"][-1]
+            equities.append(result["equity"])
+            returns.append((result["equity"][-1] / value - 1) * 100)
+            value = result["equity"][-1]
+
+        first, last = self.splits[0][1], self.splits[-1][2]
+        self.equity_curve = pd.Series(np.concatenate(equities), index=self.index[first:last], name="equity")
+        return np.array(returns)
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import logging
+import random
+
+import openai
+
+from src.config import Lazy, get_config
+from src.scraping.llm_cache import analysis_key
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_MODEL = "gpt-4-turbo"
+# Bump whenever build_prompt changes, so cached analyses of the old prompt are not reused.
+PROMPT_VERSION = 1
+DEFAULT_ANALYSIS = {"sentiment": "Neutral", "key_points": [], "potential_impact": "N/A", "credibility_issues": None}
+
+
+def _create_async_client():
+    conf = get_config()["openai"]
+    # base_url lets benchmarks and tests point the client at a local stub server;
+    # retries are left to AsyncArticleAnalyzer so backoff is not applied twice.
+    return openai.AsyncOpenAI(api_key=conf["api_key"], base_url=conf.get("base_url"), max_retries=0)
+
+_async_client = Lazy(_create_async_client)
+
+def get_async_openai_client():
+    """Returns the shared asynchronous OpenAI client, created on first use."""
+    return _async_client.get()
+
+def set_async_openai_client(client):
+    """Injects the asynchronous OpenAI client to use; None recreates it from config."""
+    _async_client.set(client)
+
+
+def build_prompt(title, content):
+    return (
+        f"Analyze this Bitcoin (BTC) article. Respond only in JSON:\n\n"
+        f"Title: {title}\nContent: {content}\n\n"
+        f"Keys: sentiment, key_points (max 5), potential_impact, credibility_issues."
+    )
+
+
+def parse_analysis(raw_text):
+    """
+    Parses a JSON analysis reply and normalizes its sentiment.
+
+    Raises:
+        ValueError: If the reply is not valid JSON.
+        KeyError: If the reply has no sentiment.
+    """
+    return normalize_analysis(json.loads(_strip_fences(raw_text)))
+
+
+def normalize_analysis(analysis_json):
+    """Capitalizes the sentiment and maps unknown values to Neutral."""
+    sentiment = analysis_json["sentiment"].capitalize()
+    if sentiment not in ["Neutral", "Bullish", "Bearish"]:
+        sentiment = "Neutral"
+    analysis_json["sentiment"] = sentiment
+    return analysis_json
+
+
+def _strip_fences(raw_text):
+    return raw_text.strip().replace("```json", "").replace("```", "").strip()
+
+
+class AsyncArticleAnalyzer:
+    """
+    Analyzes articles through the asynchronous OpenAI client.
+
+    A semaphore bounds the requests in flight, and retries back off
+    exponentially with ``asyncio.sleep``, so waiting never blocks the event loop
+    the crawler runs on.
+    """
+
+    def __init__(self, client=None, max_concurrency=8, max_retries=3, base_delay=1.0, max_delay=30.0,
+                 model=ANALYSIS_MODEL, cache=None):
+        """
+        Args:
+            client (openai.AsyncOpenAI): Client to use; defaults to the shared one.
+            cache (AnalysisCache): Serve repeated articles from this cache before calling the API.
+            max_concurrency (int): Requests allowed in flight at once.
+            max_retries (int): Attempts per article before falling back to a neutral analysis.
+            base_delay (float): Backoff before the first retry, doubled on every attempt.
+            max_delay (float): Upper bound on a single backoff.
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.model = model
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    def backoff(self, attempt):
+        """Exponential backoff with full jitter, so failed requests do not retry in lockstep."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def analyze(self, title, content):
+        key = analysis_key(title, content, self.model, PROMPT_VERSION)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        return await self._analyze_uncached(title, content, key)
+
+    async def _analyze_uncached(self, title, content, key):
+        """Requests one article's analysis and caches it, without looking the cache up first."""
+        analysis = await self._complete(build_prompt(title, content), parse_analysis, 500, title)
+        if analysis is None:
+            logger.warning(f"Using default analysis for article: {title} after {self.max_retries} attempts")
+            return dict(DEFAULT_ANALYSIS)
+        if self.cache is not None:
+            self.cache.set(key, analysis)
+        return analysis
+
+    async def _complete(self, prompt, parse, max_tokens, label):
+        """Sends one prompt with retries and returns ``parse(reply)``, or None when every attempt failed."""
+        client = self.client or get_async_openai_client()
+        for attempt in range(self.max_retries):
+            try:
+                # The slot is held for the request only, not while backing off.
+                async with self.semaphore:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens,
+                        temperature=0.2,
+                    )
+                if response.choices:
+                    result = parse(response.choices[0].message.content)
+                    logger.info(f"GPT analysis successful for {label}")
+                    return result
+            except Exception as e:
+                logger.error(f"Error during GPT analysis (attempt {attempt+1}): {e}")
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(self.backoff(attempt))
+        return None
+
+
+class BatchingArticleAnalyzer(AsyncArticleAnalyzer):
+    """
+    Analyzes articles in batches of up to ``batch_size`` with one request per batch.
+
+    Articles arriving within ``batch_window`` seconds are sent together and the
+    reply is a JSON array mapped back to them by id, which saves the per-request
+    prompt overhead. Entries missing from or invalid in the reply fall back to a
+    single-article request.
+    """
+
+    def __init__(self, *args, batch_size=10, batch_window=0.5, **kwargs):
+        """
+        Args:
+            batch_size (int): Articles per request; a full batch is sent at once.
+            batch_window (float): Seconds a partial batch waits for more articles.
+        """
+        super().__init__(*args, **kwargs)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.pending = []
+        self.timer = None
+        self.tasks = set()
+
+    async def analyze(self, title, content):
+        key = analysis_key(title, content, self.model, PROMPT_VERSION)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((title, content, key, future))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.batch_window, self.flush)
+        return await future
+
+    def flush(self):
+        """Sends the pending articles as one batch."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            results = {}
+            if len(batch) > 1:
+                articles = [(title, content) for title, content, _, _ in batch]
+                results = await self._complete(
+                    build_batch_prompt(articles), parse_batch_analysis, min(4096, 400 * len(batch)),
+                    f"batch of {len(batch)} articles",
+                ) or {}
+            # Parsed articles resolve now, without waiting for the fallback requests.
+            for i, (title, content, key, future) in enumerate(batch):
+                if i in results:
+                    if self.cache is not None:
+                        self.cache.set(key, results[i])
+                    future.set_result(results[i])
+            fallbacks = [item for i, item in enumerate(batch) if i not in results]
+            if fallbacks and len(batch) > 1:
+                logger.warning(f"Falling back to single requests for {len(fallbacks)} of {len(batch)} articles.")
+            # analyze() already missed the cache for these, so they go straight to the API.
+            singles = await asyncio.gather(*(
+                self._analyze_uncached(title, content, key) for title, content, key, _ in fallbacks
+            ))
+            for (_, _, _, future), analysis in zip(fallbacks, singles):
+                future.set_result(analysis)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+def build_batch_prompt(articles):
+    body = "\n\n".join(
+        f"Article {i}:\nTitle: {title}\nContent: {content}" for i, (title, content) in enumerate(articles)
+    )
+    return (
+        f"Analyze each of these Bitcoin (BTC) articles. Respond only with a JSON array holding one object "
+        f"per article.\n\n{body}\n\n"
+        f"Keys: id (the article number), sentiment, key_points (max 5), potential_impact, credibility_issues."
+    )
+
+
+def parse_batch_analysis(raw_text):
+    """
+    Parses a JSON array of analyses into {article id: analysis}.
+
+    Entries without a valid id or sentiment are left out, so their articles are
+    retried on their own.
+
+    Raises:
+        ValueError: If the reply is not a JSON array.
+    """
+    entries = json.loads(_strip_fences(raw_text))
+    if not isinstance(entries, list):
+        raise ValueError("Batch analysis reply is not a JSON array.")
+    results = {}
+    for entry in entries:
+        try:
+            article_id = int(entry.pop("id"))
+            results[article_id] = normalize_analysis(entry)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            continue
+    return results
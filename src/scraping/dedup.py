@@ -0,0 +1,61 @@
+import logging
+import threading
+from urllib.parse import urldefrag
+
+from sqlalchemy import select
+
+from src.data.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_url(url):
+    """Strips surrounding whitespace and the #fragment, which never changes the article."""
+    return urldefrag(url.strip())[0] if url else url
+
+
+class UrlIndex:
+    """
+    In-memory index of article URLs that are stored or already being fetched.
+
+    Loaded once from articles.url, it lets the crawler drop known URLs before
+    any request is made. A plain set is exact and stays in the tens of MB even
+    for millions of URLs, so no Bloom filter false positives are needed.
+    """
+
+    def __init__(self, urls=()):
+        self.urls = {normalize_url(url) for url in urls}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, session, batch_size=10000):
+        """Builds the index by streaming articles.url in batches."""
+        index = cls()
+        for url in session.execute(select(Article.url).execution_options(yield_per=batch_size)).scalars():
+            index.urls.add(normalize_url(url))
+        logger.info(f"Loaded {len(index)} known article URLs.")
+        return index
+
+    def __contains__(self, url):
+        return normalize_url(url) in self.urls
+
+    def __len__(self):
+        return len(self.urls)
+
+    def add(self, url):
+        with self.lock:
+            self.urls.add(normalize_url(url))
+
+    def claim(self, url):
+        """Adds ``url`` and returns True if it was new, so each URL is fetched once."""
+        url = normalize_url(url)
+        with self.lock:
+            if url in self.urls:
+                return False
+            self.urls.add(url)
+            return True
+
+    def release(self, url):
+        """Forgets a claimed URL whose article was not stored, so a later poll retries it."""
+        with self.lock:
+            self.urls.discard(normalize_url(url))
@@ -0,0 +1,77 @@
+import html
+import logging
+import re
+import xml.etree.ElementTree as ET
+
+from src.scraping.feed_state import parse_feed_date
+
+logger = logging.getLogger(__name__)
+
+_SCRIPTS = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r"<[^>]*>")
+_WHITESPACE = re.compile(r"\s+")
+
+_ITEM_TAGS = {"item", "entry"}
+_DATE_TAGS = ("pubDate", "published", "updated", "date")
+
+
+def strip_html(text):
+    """Drops tags, scripts and styles, unescapes entities and collapses whitespace."""
+    if not text:
+        return ""
+    text = _TAGS.sub(" ", _SCRIPTS.sub(" ", text))
+    return _WHITESPACE.sub(" ", html.unescape(text)).strip()
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_item(element):
+    fields = {}
+    for child in element:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom links carry the URL in href; prefer the alternate (article) link.
+            href = child.get("href")
+            if href is None:
+                fields.setdefault("link", (child.text or "").strip())
+            elif child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href.strip())
+        elif name not in fields:
+            fields[name] = "".join(child.itertext())
+    published = next((fields[tag] for tag in _DATE_TAGS if fields.get(tag)), None)
+    link = fields.get("link")
+    return {
+        "title": strip_html(fields.get("title")),
+        "link": link,
+        "guid": (fields.get("guid") or fields.get("id") or link or "").strip() or None,
+        "published": parse_feed_date(published),
+        "content": strip_html(
+            fields.get("encoded") or fields.get("content") or fields.get("description") or fields.get("summary")
+        ),
+    }
+
+
+def iter_feed_items(body, chunk_size=65536):
+    """
+    Incrementally parses an RSS or Atom document and yields its items as they are read.
+
+    The document is fed to a pull parser in chunks and every item is cleared
+    once yielded, so a consumer that stops early leaves the rest unparsed and
+    memory stays bounded by one item.
+
+    Args:
+        body (bytes): Feed document.
+
+    Yields:
+        dict: title, link, guid, published (naive UTC datetime or None) and plain-text content.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    for start in range(0, len(body), chunk_size):
+        parser.feed(body[start:start + chunk_size])
+        for _, element in parser.read_events():
+            if _local(element.tag) in _ITEM_TAGS:
+                yield _parse_item(element)
+                element.clear()
+    parser.close()
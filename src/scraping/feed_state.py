@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.cache/feeds/state.json'))
+
+MIN_INTERVAL = 60
+MAX_INTERVAL = 3600
+
+
+def parse_feed_date(value):
+    """Parses an RSS (RFC 822) or Atom (ISO 8601) date into a naive UTC datetime, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class FeedStateStore:
+    """
+    Persistent per-feed polling state, kept as one JSON file.
+
+    For every feed URL it records the validators for conditional GETs (ETag,
+    Last-Modified), the watermark of the newest item seen (publish date and
+    GUID), the adaptive polling interval with the time of the next poll, and
+    the articles behind the watermark that still have to be retried.
+    """
+
+    def __init__(self, path=None, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        """
+        Args:
+            path (str): State file; defaults to FINANCEML_FEED_STATE or .cache/feeds/state.json.
+            min_interval (float): Shortest polling interval in seconds, for busy feeds.
+            max_interval (float): Longest polling interval in seconds, for quiet feeds.
+        """
+        self.path = path or os.environ.get("FINANCEML_FEED_STATE", DEFAULT_STATE_PATH)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.lock = threading.Lock()
+        self.feeds = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                self.feeds = json.load(f)
+
+    def get(self, url):
+        return self.feeds.setdefault(url, {})
+
+    def save(self):
+        """Atomically writes the state file."""
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.tmp", 'w') as f:
+                json.dump(self.feeds, f)
+            os.replace(f"{self.path}.tmp", self.path)
+
+    def conditional_headers(self, url):
+        """Request headers that let the server answer 304 Not Modified."""
+        state = self.get(url)
+        headers = {}
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            headers["If-Modified-Since"] = state["last_modified"]
+        return headers
+
+    def record_validators(self, url, etag=None, last_modified=None):
+        state = self.get(url)
+        if etag:
+            state["etag"] = etag
+        if last_modified:
+            state["last_modified"] = last_modified
+
+    def has_watermark(self, url):
+        """Whether the feed has been polled before, so its new items are known."""
+        state = self.get(url)
+        return bool(state.get("last_published") or state.get("last_guid"))
+
+    def is_new(self, url, published=None, guid=None):
+        """
+        Whether an item is newer than the feed's watermark.
+
+        Items with a publish date compare against the newest date seen; items
+        without one are new until the last-seen GUID comes up again.
+        """
+        state = self.get(url)
+        if published is not None and state.get("last_published"):
+            return published > datetime.fromisoformat(state["last_published"])
+        return guid is None or guid != state.get("last_guid")
+
+    def advance(self, url, published=None, guid=None):
+        """Moves the watermark to the newest item of a poll."""
+        state = self.get(url)
+        if published is not None and (
+            not state.get("last_published") or published > datetime.fromisoformat(state["last_published"])
+        ):
+            state["last_published"] = published.isoformat()
+        if guid is not None:
+            state["last_guid"] = guid
+
+    def add_retry(self, url, article):
+        """Queues an article of the feed that was not stored, so the next poll requests it again."""
+        retries = self.get(url).setdefault("retries", [])
+        if all(queued["url"] != article["url"] for queued in retries):
+            retries.append(article)
+
+    def take_retries(self, url):
+        """Removes and returns the articles queued for retry on the feed."""
+        return self.get(url).pop("retries", [])
+
+    def record_poll(self, url, new_items, now=None):
+        """
+        Adapts the feed's polling interval to how often it publishes.
+
+        A poll that finds new items halves the interval; an empty or unchanged
+        poll stretches it by half, both within [min_interval, max_interval].
+
+        Returns:
+            float: Seconds until the feed is due again.
+        """
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        state = self.get(url)
+        interval = state.get("interval", self.min_interval)
+        interval = interval / 2 if new_items else interval * 1.5
+        state["interval"] = min(self.max_interval, max(self.min_interval, interval))
+        state["next_poll"] = now + state["interval"]
+        return state["interval"]
+
+    def due(self, feeds, now=None):
+        """Returns the feeds whose next poll time has passed."""
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        return [feed for feed in feeds if self.get(feed["url"]).get("next_poll", 0) <= now]
@@ -0,0 +1,23 @@
+from src.config import get_config
+
+# Default news feeds; max_items caps the items taken from a feed on its first poll.
+FEEDS = [
+    {"url": "https://www.coindesk.com/arc/outboundfeeds/rss/", "name": "CoinDesk", "max_items": 20},
+    {"url": "https://cointelegraph.com/rss", "name": "CoinTelegraph", "max_items": 20},
+    {"url": "https://bitcoinmagazine.com/.rss/full/", "name": "Bitcoin Magazine", "max_items": 10},
+    {"url": "https://cryptoslate.com/feed/", "name": "CryptoSlate", "max_items": 20},
+    {"url": "https://www.newsbtc.com/feed/", "name": "NewsBTC", "max_items": 20},
+]
+
+DEFAULT_MAX_ITEMS = 20
+
+
+def load_feeds(config=None):
+    """
+    Returns the feed registry: the ``feeds`` section of config.yml when present, else FEEDS.
+
+    Each feed has a url, a name and max_items.
+    """
+    config = config if config is not None else get_config()
+    feeds = config.get("feeds") or FEEDS
+    return [{"max_items": DEFAULT_MAX_ITEMS, **feed} for feed in feeds]
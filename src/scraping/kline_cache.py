@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KLINE_DTYPE = np.dtype([
+    ("open_time", "i8"), ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"),
+    ("volume", "f8"), ("close_time", "i8"), ("quote_asset_volume", "f8"),
+    ("number_of_trades", "i8"), ("taker_buy_volume", "f8"), ("taker_buy_quote_volume", "f8"),
+])
+
+DEFAULT_CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.cache/klines'))
+
+
+def klines_to_array(klines):
+    """Converts raw Binance kline rows into a structured array (the trailing 'ignore' field is dropped)."""
+    if isinstance(klines, np.ndarray) and klines.dtype == KLINE_DTYPE:
+        return klines
+    out = np.empty(len(klines), dtype=KLINE_DTYPE)
+    if len(klines) == 0:
+        return out
+    # One object table, then one C-level cast per column; no per-row Python calls.
+    raw = np.asarray(klines, dtype=object)
+    for i, name in enumerate(KLINE_DTYPE.names):
+        out[name] = raw[:, i].astype(KLINE_DTYPE[name])
+    return out
+
+
+def merge_klines(*arrays):
+    """Concatenates kline arrays, sorted by open_time; later arrays win on duplicate open_time."""
+    merged = np.concatenate(arrays)[::-1]
+    _, first = np.unique(merged["open_time"], return_index=True)
+    return merged[first]
+
+
+class KlineCache:
+    """
+    On-disk kline store, one memory-mapped .npy file per symbol and interval.
+
+    A JSON sidecar records the time range already covered, so only the missing
+    head or tail of a request is fetched from Binance.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.environ.get("FINANCEML_KLINE_CACHE", DEFAULT_CACHE_DIR)
+
+    def _paths(self, symbol, interval):
+        base = os.path.join(self.cache_dir, f"{symbol}_{interval}")
+        return f"{base}.npy", f"{base}.json"
+
+    def load(self, symbol, interval):
+        """Returns the cached klines (memory-mapped) and their coverage, or (None, None)."""
+        data_path, meta_path = self._paths(symbol, interval)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None, None
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        return np.load(data_path, mmap_mode="r"), meta
+
+    def store(self, symbol, interval, klines, meta):
+        """Atomically replaces the cached klines and coverage for a symbol and interval."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, meta_path = self._paths(symbol, interval)
+        with open(f"{data_path}.tmp", 'wb') as f:
+            np.save(f, np.ascontiguousarray(klines, dtype=KLINE_DTYPE))
+        with open(f"{meta_path}.tmp", 'w') as f:
+            json.dump(meta, f)
+        os.replace(f"{data_path}.tmp", data_path)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def get_range(self, symbol, interval, start_ms, end_ms, fetch, offline=False):
+        """
+        Returns klines opened within [start_ms, end_ms], fetching only uncovered ranges.
+
+        Args:
+            fetch (callable): fetch(start_ms, end_ms) -> raw kline rows or a kline array.
+            offline (bool): Serve whatever is cached without touching the network.
+
+        Returns:
+            np.ndarray: Structured kline array sorted by open_time.
+        """
+        cached, meta = self.load(symbol, interval)
+        if meta is None:
+            missing = [(start_ms, end_ms)]
+        else:
+            missing = []
+            if start_ms < meta["start"]:
+                missing.append((start_ms, meta["start"] - 1))
+            if end_ms > meta["end"]:
+                missing.append((meta["end"] + 1, end_ms))
+
+        if missing and offline:
+            logger.warning(f"Offline mode: serving cached {symbol} {interval} klines without fetching {missing}.")
+            missing = []
+
+        klines = cached if cached is not None else np.empty(0, dtype=KLINE_DTYPE)
+        if missing:
+            fetched = [klines_to_array(fetch(lo, hi)) for lo, hi in missing]
+            logger.info(f"Fetched {sum(len(a) for a in fetched)} {symbol} {interval} klines for ranges {missing}.")
+            klines = merge_klines(klines, *fetched)
+
+            # Only closed klines are cached; the candle still open is returned but refetched next time.
+            closed = klines[klines["close_time"] < int(time.time() * 1000)]
+            covered_start = start_ms if meta is None else min(start_ms, meta["start"])
+            covered_end = int(closed["close_time"].max()) if len(closed) else covered_start - 1
+            if meta is not None:
+                covered_end = max(covered_end, meta["end"])
+            self.store(symbol, interval, closed, {"start": covered_start, "end": covered_end})
+
+        in_range = (klines["open_time"] >= start_ms) & (klines["open_time"] <= end_ms)
+        return klines[in_range]
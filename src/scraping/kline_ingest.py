@@ -0,0 +1,138 @@
+import logging
+import time
+
+import pandas as pd
+from binance.helpers import interval_to_milliseconds
+from sqlalchemy import func, select
+
+from src.data.bulk import dialect_insert
+from src.data.models.market_data import MarketData
+from src.scraping.kline_cache import klines_to_array
+
+logger = logging.getLogger(__name__)
+
+
+def kline_rows(symbol, klines):
+    """
+    Maps a kline array onto market_data column dicts in one columnar pass.
+
+    Args:
+        symbol (str): Trading symbol pair.
+        klines (list | np.ndarray): Raw kline rows or a kline array.
+
+    Returns:
+        list: One dict per kline, ready for an executemany insert.
+    """
+    klines = klines_to_array(klines)
+    columns = {
+        "open_time": pd.to_datetime(klines["open_time"], unit="ms").to_pydatetime(),
+        "close_time": pd.to_datetime(klines["close_time"], unit="ms").to_pydatetime(),
+        "open_price": klines["open"].tolist(),
+        "high_price": klines["high"].tolist(),
+        "low_price": klines["low"].tolist(),
+        "close_price": klines["close"].tolist(),
+        "volume": klines["volume"].tolist(),
+        "trades_count": klines["number_of_trades"].tolist(),
+    }
+    names = list(columns)
+    return [dict(zip(names, values), symbol=symbol) for values in zip(*columns.values())]
+
+
+def upsert_klines(session, symbol, klines):
+    """
+    Inserts klines with one set-based INSERT ... ON CONFLICT DO NOTHING on (symbol, open_time).
+
+    The caller owns the transaction, so several batches can share one commit.
+
+    Returns:
+        int: Number of klines sent.
+    """
+    rows = kline_rows(symbol, klines)
+    if not rows:
+        return 0
+    stmt = dialect_insert(session, MarketData).on_conflict_do_nothing(index_elements=["symbol", "open_time"])
+    session.execute(stmt, rows)
+    return len(rows)
+
+
+def latest_open_time(session, symbol):
+    """Returns the newest stored open_time for a symbol, or None when it has no rows."""
+    return session.execute(select(func.max(MarketData.open_time)).where(MarketData.symbol == symbol)).scalar()
+
+
+def ingest_klines(session, symbol, interval, start, end=None, batch_size=50000, fetch=None):
+    """
+    Streams klines from Binance into market_data, resuming after the newest stored bar.
+
+    market_data has no interval column, so each symbol should be ingested at one interval.
+    Only closed klines are stored; the candle still open is picked up by the next run.
+
+    Args:
+        session (Session): Database session.
+        symbol (str): Trading symbol pair.
+        interval (str): Candlestick interval.
+        start (str | datetime): First bar to ingest when the symbol has no rows yet.
+        end (str | datetime): Last bar to ingest; defaults to now.
+        batch_size (int): Bars fetched and committed per transaction.
+        fetch (callable): fetch(symbol, interval, start_ms, end_ms) -> klines; defaults
+            to the parallel Binance fetcher.
+
+    Returns:
+        int: Number of klines sent to the database.
+    """
+    if fetch is None:
+        from src.scraping.scrape_data import fetch_klines as fetch
+    interval_ms = interval_to_milliseconds(interval)
+    now_ms = int(time.time() * 1000)
+    start_ms = pd.Timestamp(start).value // 10**6
+    end_ms = now_ms if end is None else min(pd.Timestamp(end).value // 10**6, now_ms)
+
+    latest = latest_open_time(session, symbol)
+    if latest is not None:
+        start_ms = max(start_ms, pd.Timestamp(latest).value // 10**6 + interval_ms)
+        logger.info(f"Resuming {symbol} ingestion after {latest}.")
+
+    sent = 0
+    for lo in range(start_ms, end_ms + 1, batch_size * interval_ms):
+        hi = min(lo + batch_size * interval_ms - 1, end_ms)
+        klines = klines_to_array(fetch(symbol, interval, lo, hi))
+        klines = klines[klines["close_time"] < now_ms]
+        try:
+            sent += upsert_klines(session, symbol, klines)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error ingesting {symbol} klines from {lo} to {hi}: {e}")
+            raise
+    logger.info(f"Ingested {sent} {symbol} {interval} klines into market_data.")
+    return sent
+
+
+def load_market_data(session, symbol, start=None, end=None):
+    """
+    Bulk-reads stored klines into the DataFrame layout of fetch_binance_historical_data.
+
+    Returns:
+        pd.DataFrame: open_time, open, high, low, close, volume, close_time,
+        number_of_trades and date, ordered by open_time.
+    """
+    query = select(
+        MarketData.open_time,
+        MarketData.open_price.label("open"),
+        MarketData.high_price.label("high"),
+        MarketData.low_price.label("low"),
+        MarketData.close_price.label("close"),
+        MarketData.volume,
+        MarketData.close_time,
+        MarketData.trades_count.label("number_of_trades"),
+    ).where(MarketData.symbol == symbol)
+    if start is not None:
+        query = query.where(MarketData.open_time >= pd.Timestamp(start).to_pydatetime())
+    if end is not None:
+        query = query.where(MarketData.open_time <= pd.Timestamp(end).to_pydatetime())
+
+    data = pd.read_sql(query.order_by(MarketData.open_time), session.connection())
+    data["open_time"] = pd.to_datetime(data["open_time"])
+    data["close_time"] = pd.to_datetime(data["close_time"])
+    data["date"] = data["open_time"]
+    return data
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from src.config import Lazy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../.cache/llm/analysis.sqlite'))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text):
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+def analysis_key(title, content, model, prompt_version):
+    """
+    Content hash identifying one analysis request.
+
+    Title and content are whitespace- and case-normalized, so syndicated copies
+    and re-scrapes of the same story share a key. The model and prompt version
+    are included, so changing either never serves stale analyses.
+    """
+    payload = "\x1f".join((_normalize(title), _normalize(content), model, str(prompt_version)))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Persistent LLM analysis cache in a local SQLite file.
+
+    Entries expire after ``ttl`` seconds. Past ``max_entries`` the least
+    recently used entries are evicted. ``hits`` and ``misses`` count lookups.
+
+    Lookups only read: the access times of hits are buffered and written in one
+    batch on the next ``set``, every ``TOUCH_BATCH`` hits, and on close. The
+    file runs in WAL mode with synchronous=NORMAL, so commits do not wait for
+    a disk sync.
+    """
+
+    TOUCH_BATCH = 1000
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=100000):
+        """
+        Args:
+            path (str): Database file; defaults to FINANCEML_LLM_CACHE or .cache/llm/analysis.sqlite.
+            ttl (float): Seconds an analysis stays valid.
+            max_entries (int): Size bound of the cache.
+        """
+        self.path = path or os.environ.get("FINANCEML_LLM_CACHE", DEFAULT_CACHE_PATH)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.touched = {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_analyses_last_access ON analyses (last_access)")
+        self.conn.commit()
+
+    def get(self, key):
+        """Returns the cached analysis for ``key``, or None when missing or expired."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT value, created_at FROM analyses WHERE key = ?", (key,)).fetchone()
+            # Expired rows are left for set() to replace or purge_expired() to delete.
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.touched[key] = now
+            self.hits += 1
+            if len(self.touched) >= self.TOUCH_BATCH:
+                self._write_touched()
+                self.conn.commit()
+        return json.loads(row[0])
+
+    def _write_touched(self):
+        # Callers hold the lock and commit.
+        if self.touched:
+            self.conn.executemany(
+                "UPDATE analyses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self.touched.items()],
+            )
+            self.touched = {}
+
+    def set(self, key, analysis):
+        now = time.time()
+        with self.lock:
+            self._write_touched()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(analysis), now, now),
+            )
+            self.conn.execute(
+                "DELETE FROM analyses WHERE key IN "
+                "(SELECT key FROM analyses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def purge_expired(self):
+        """Deletes all expired entries and returns how many were removed."""
+        with self.lock:
+            self._write_touched()
+            deleted = self.conn.execute("DELETE FROM analyses WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
+            self.conn.commit()
+        return deleted
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def close(self):
+        with self.lock:
+            self._write_touched()
+            self.conn.commit()
+            self.conn.close()
+
+
+_cache = Lazy(AnalysisCache)
+
+def get_analysis_cache():
+    """Returns the shared analysis cache, opened on first use."""
+    return _cache.get()
+
+def set_analysis_cache(cache):
+    """Injects the analysis cache to use (e.g. one in a temporary directory); None reopens the default."""
+    _cache.set(cache)
@@ -0,0 +1,172 @@
+import logging
+import time
+
+from scrapy import signals
+
+from src.data.bulk import SUMMARY_FIELDS, insert_new_articles, upsert_analysis_summaries
+from src.data.models.database import get_session
+from src.scraping.analysis import AsyncArticleAnalyzer, BatchingArticleAnalyzer
+from src.scraping.llm_cache import get_analysis_cache
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisPipeline:
+    """
+    Item pipeline stage that adds the LLM analysis to each scraped article.
+
+    process_item is a coroutine, so Scrapy keeps crawling and fetching while
+    analyses are in flight. Concurrency and backoff come from the
+    ANALYSIS_CONCURRENCY, ANALYSIS_MAX_RETRIES and ANALYSIS_BACKOFF settings;
+    ANALYSIS_CACHE turns the content-hash result cache on or off, and an
+    ANALYSIS_BATCH_SIZE above 1 sends articles in batches collected over
+    ANALYSIS_BATCH_WINDOW seconds.
+    """
+
+    def __init__(self, max_concurrency=8, max_retries=3, base_delay=1.0, use_cache=False, batch_size=1,
+                 batch_window=0.5, analyzer=None):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.use_cache = use_cache
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.analyzer = analyzer
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            max_concurrency=settings.getint("ANALYSIS_CONCURRENCY", 8),
+            max_retries=settings.getint("ANALYSIS_MAX_RETRIES", 3),
+            base_delay=settings.getfloat("ANALYSIS_BACKOFF", 1.0),
+            use_cache=settings.getbool("ANALYSIS_CACHE", True),
+            batch_size=settings.getint("ANALYSIS_BATCH_SIZE", 1),
+            batch_window=settings.getfloat("ANALYSIS_BATCH_WINDOW", 0.5),
+        )
+
+    def open_spider(self, spider=None):
+        if self.analyzer is None:
+            options = dict(
+                max_concurrency=self.max_concurrency, max_retries=self.max_retries, base_delay=self.base_delay,
+                cache=get_analysis_cache() if self.use_cache else None,
+            )
+            if self.batch_size > 1:
+                self.analyzer = BatchingArticleAnalyzer(
+                    batch_size=self.batch_size, batch_window=self.batch_window, **options
+                )
+            else:
+                self.analyzer = AsyncArticleAnalyzer(**options)
+
+    def close_spider(self, spider=None):
+        if self.analyzer is not None and self.analyzer.cache is not None:
+            logger.info(f"Analysis cache: {self.analyzer.cache.stats()}")
+
+    async def process_item(self, item, spider=None):
+        if self.analyzer is None:
+            self.open_spider(spider)
+        item["analysis"] = await self.analyzer.analyze(item["title"], item["content"])
+        return item
+
+
+class ArticlePersistencePipeline:
+    """
+    Item pipeline stage that stores analyzed articles and their AnalysisSummary rows in batches.
+
+    Items are buffered and written with one multi-row article insert and one
+    summary upsert per transaction, flushed every PERSIST_BATCH_SIZE items, after
+    PERSIST_FLUSH_INTERVAL seconds, when the crawl goes idle and at close. A
+    failed batch is retried item by item so one bad row does not lose the rest.
+
+    Stored URLs are added to the spider's url_index; articles that could not be
+    stored are handed back to the spider, which queues them for the next poll.
+    """
+
+    def __init__(self, crawler=None, batch_size=100, flush_interval=5.0):
+        self.crawler = crawler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.first_buffered = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        pipeline = cls(
+            crawler,
+            batch_size=crawler.settings.getint("PERSIST_BATCH_SIZE", 100),
+            flush_interval=crawler.settings.getfloat("PERSIST_FLUSH_INTERVAL", 5.0),
+        )
+        crawler.signals.connect(pipeline.flush, signal=signals.spider_idle)
+        return pipeline
+
+    def process_item(self, item, spider=None):
+        if not self.buffer:
+            self.first_buffered = time.monotonic()
+        self.buffer.append(item)
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self.first_buffered >= self.flush_interval:
+            self.flush()
+        return item
+
+    def close_spider(self, spider=None):
+        self.flush()
+
+    def flush(self):
+        """Writes the buffered items in one transaction."""
+        batch, self.buffer = self.buffer, []
+        if not batch:
+            return
+        try:
+            self.store(batch)
+        except Exception as e:
+            logger.error(f"Error storing batch of {len(batch)} articles, retrying one by one: {e}")
+            for item in batch:
+                try:
+                    self.store([item])
+                except Exception as e:
+                    logger.error(f"Error storing article {item['url']}: {e}")
+                    self.release(item)
+                else:
+                    self.mark_stored(item)
+            return
+        for item in batch:
+            self.mark_stored(item)
+
+    def store(self, batch):
+        with get_session() as session:
+            try:
+                # The first copy of a URL wins, as it would have when stored one by one.
+                items, seen = [], set()
+                for item in batch:
+                    if item["url"] not in seen:
+                        seen.add(item["url"])
+                        items.append(item)
+                ids = insert_new_articles(session, [
+                    {field: item[field] for field in ("source", "title", "url", "content", "published_at")}
+                    for item in items
+                ])
+                upsert_analysis_summaries(session, [
+                    {"article_id": ids[item["url"]], **{field: item["analysis"].get(field) for field in SUMMARY_FIELDS}}
+                    for item in items if item["url"] in ids
+                ])
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        logger.info(f"Stored {len(ids)} new articles ({len(items) - len(ids)} already known).")
+
+    def _spider(self):
+        # Newer Scrapy versions stop passing the spider; it stays reachable through the crawler.
+        return getattr(self.crawler, "spider", None)
+
+    def _url_index(self):
+        return getattr(self._spider(), "url_index", None)
+
+    def mark_stored(self, item):
+        if self._url_index() is not None:
+            self._url_index().add(item["url"])
+
+    def release(self, item):
+        if hasattr(self._spider(), "requeue_article"):
+            self._spider().requeue_article(item)
+        elif self._url_index() is not None:
+            self._url_index().release(item["url"])
@@ -1,25 +1,146 @@
 from binance.client import Client
+from binance.exceptions import BinanceAPIException
+from binance.helpers import date_to_milliseconds, interval_to_milliseconds
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import numpy as np
 import pandas as pd
-import yaml
-import os
 import time
+from src.config import Lazy, get_config
+from src.scraping.kline_cache import KLINE_DTYPE, klines_to_array, merge_klines
 
-def get_config():
-    current_dir = os.path.dirname(__file__)
-    config_path = os.path.abspath(os.path.join(current_dir, '../config/config.yml'))
+logger = logging.getLogger(__name__)
 
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    return config
-# Securely load Binance API credentials from config
-config = get_config()
-api_key = config["binance"]["api_key"]
-api_secret = config["binance"]["api_secret"]
+# Binance returns at most 1000 klines per request, at a request weight of 2.
+KLINES_LIMIT = 1000
+KLINES_WEIGHT = 2
 
-# Binance client initialization
-client = Client(api_key, api_secret)
+def _create_client():
+    # Securely load Binance API credentials from config
+    config = get_config()
+    return Client(config["binance"]["api_key"], config["binance"]["api_secret"])
 
-def fetch_binance_historical_data(symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1DAY, lookback="365 days ago UTC"):
+_client = Lazy(_create_client)
+
+def get_client():
+    """Returns the shared Binance client, created on first use."""
+    return _client.get()
+
+def set_client(client):
+    """Injects the Binance client to use (e.g. a test stand-in); None recreates it from config."""
+    _client.set(client)
+
+class WeightLimiter:
+    """
+    Thread-safe sliding-window budget of Binance request weight.
+
+    Binance bans clients that exceed the per-minute request weight of their IP,
+    so every request from the fetch pool reserves its weight here first.
+    """
+
+    def __init__(self, max_weight=5000, period=60.0):
+        """
+        Args:
+            max_weight (int): Weight allowed per window; kept below Binance's 6000/min limit.
+            period (float): Window length in seconds.
+        """
+        self.max_weight = max_weight
+        self.period = period
+        self.used = 0
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self, weight=1):
+        """Blocks until ``weight`` fits in the current window, then reserves it."""
+        if weight > self.max_weight:
+            # It would never fit, so waiting would block forever.
+            raise ValueError(f"Request weight {weight} exceeds the limiter's max_weight of {self.max_weight}.")
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.calls and self.calls[0][0] <= now - self.period:
+                    self.used -= self.calls.popleft()[1]
+                if self.used + weight <= self.max_weight:
+                    self.calls.append((now, weight))
+                    self.used += weight
+                    return
+                wait = self.calls[0][0] + self.period - now
+            time.sleep(wait)
+
+
+# Shared by all fetches in the process, since Binance counts weight per IP.
+weight_limiter = WeightLimiter()
+
+
+def split_time_range(start_ms, end_ms, interval_ms, limit=KLINES_LIMIT):
+    """Splits [start_ms, end_ms] into consecutive ranges of at most ``limit`` bars each."""
+    span = interval_ms * limit
+    return [(lo, min(lo + span - 1, end_ms)) for lo in range(start_ms, end_ms + 1, span)]
+
+
+def _get_klines_with_backoff(get_klines, limiter, retries=3, **params):
+    for attempt in range(retries + 1):
+        limiter.acquire(KLINES_WEIGHT)
+        try:
+            return get_klines(**params)
+        except BinanceAPIException as e:
+            # 429 asks to back off, 418 means the IP is already banned for a while.
+            if e.status_code not in (429, 418) or attempt == retries:
+                raise
+            retry_after = int(e.response.headers.get("Retry-After", 60)) if e.response is not None else 60
+            logger.warning(f"Binance rate limit hit ({e.status_code}); retrying in {retry_after}s.")
+            time.sleep(retry_after)
+
+
+def fetch_klines(symbol, interval, start_ms, end_ms=None, max_workers=4, limiter=None, get_klines=None):
+    """
+    Fetches klines for a time range with concurrent paginated requests.
+
+    The range is split into pages of KLINES_LIMIT bars, fetched from a bounded
+    thread pool under the shared weight budget, and each page is parsed
+    column-wise into a typed kline array as soon as it arrives.
+
+    Args:
+        symbol (str): Trading symbol pair.
+        interval (str): Candlestick interval.
+        start_ms (int): First open time in milliseconds.
+        end_ms (int): Last open time in milliseconds; defaults to now.
+        max_workers (int): Concurrent requests.
+        limiter (WeightLimiter): Weight budget; defaults to the process-wide one.
+        get_klines (callable): Binance klines endpoint; defaults to the shared client's.
+
+    Returns:
+        np.ndarray: Structured kline array sorted by open_time.
+    """
+    end_ms = int(time.time() * 1000) if end_ms is None else end_ms
+    interval_ms = interval_to_milliseconds(interval)
+    if interval_ms is None:
+        # Monthly bars have no fixed width to page on; there are few enough to fetch serially.
+        return klines_to_array(get_client().get_historical_klines(symbol, interval, start_ms, end_ms))
+
+    get_klines = get_klines or get_client().get_klines
+    limiter = limiter or weight_limiter
+    pages = split_time_range(start_ms, end_ms, interval_ms)
+
+    def fetch_page(page):
+        lo, hi = page
+        return klines_to_array(_get_klines_with_backoff(
+            get_klines, limiter, symbol=symbol, interval=interval, startTime=lo, endTime=hi, limit=KLINES_LIMIT
+        ))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pages)))) as executor:
+        parts = list(executor.map(fetch_page, pages))
+    if not parts:
+        return np.empty(0, dtype=KLINE_DTYPE)
+    klines = merge_klines(*parts)
+    logger.info(f"Fetched {len(klines)} {symbol} {interval} klines in {len(pages)} pages.")
+    return klines
+
+
+def fetch_binance_historical_data(symbol="BTCUSDT", interval=Client.KLINE_INTERVAL_1DAY, lookback="365 days ago UTC",
+                                  cache=None, offline=False, max_workers=4):
     """
     Fetches historical BTC trading data from Binance.
 
@@ -27,34 +148,39 @@ def fetch_binance_historical_data(symbol="BTCUSDT", interval=Client.KLINE_INTERV
         symbol (str): Trading symbol pair.
         interval (str): Candlestick interval.
         lookback (str): Period to look back from current time.
+        cache (KlineCache): Optional on-disk cache; only ranges it does not cover are downloaded.
+        offline (bool): With a cache, serve cached klines only and never call Binance.
+        max_workers (int): Concurrent page requests.
 
     Returns:
         pd.DataFrame: DataFrame with open, high, low, close, volume, and timestamps.
     """
-    klines = client.get_historical_klines(symbol, interval, lookback)
+    start_ms = date_to_milliseconds(lookback)
+    end_ms = int(time.time() * 1000)
+    if cache is None:
+        return klines_to_dataframe(fetch_klines(symbol, interval, start_ms, end_ms, max_workers=max_workers))
+
+    klines = cache.get_range(
+        symbol, interval, start_ms, end_ms,
+        fetch=lambda lo, hi: fetch_klines(symbol, interval, lo, hi, max_workers=max_workers),
+        offline=offline,
+    )
+    return klines_to_dataframe(klines)
 
-    # Convert to pandas DataFrame
-    data = pd.DataFrame(klines, columns=[
-        "open_time", "open", "high", "low", "close", "volume",
-        "close_time", "quote_asset_volume", "number_of_trades",
-        "taker_buy_volume", "taker_buy_quote_volume", "ignore"
-    ])
+def klines_to_dataframe(klines):
+    """
+    Builds the historical data DataFrame from raw kline rows or a cached kline array.
+
+    Returns:
+        pd.DataFrame: DataFrame with open, high, low, close, volume, and timestamps.
+    """
+    data = pd.DataFrame(klines_to_array(klines))
 
     # Convert timestamps to readable dates
     data["date"] = pd.to_datetime(data["open_time"], unit="ms")
     data["open_time"] = pd.to_datetime(data["open_time"], unit="ms")
     data["close_time"] = pd.to_datetime(data["close_time"], unit="ms")
 
-    # Convert numeric columns
-    numeric_cols = [
-        "open", "high", "low", "close", "volume",
-        "quote_asset_volume", "taker_buy_volume", "taker_buy_quote_volume"
-    ]
-    data[numeric_cols] = data[numeric_cols].apply(pd.to_numeric, axis=1)
-
-    # Drop unnecessary column
-    data.drop(columns=["ignore"], inplace=True)
-
     return data
 
 if __name__ == "__main__":
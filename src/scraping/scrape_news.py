@@ -1,135 +1,239 @@
 import scrapy
 import openai
-import json
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
 import time
-import yaml
-import os
 import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
 from datetime import datetime
+from src.config import Lazy, get_config
 from src.data.models.database import get_session
-from src.data.models.article import Article
-from src.data.models.analysis_summary import AnalysisSummary
-
-def get_config():
-    current_dir = os.path.dirname(__file__)
-    config_path = os.path.abspath(os.path.join(current_dir, '../config/config.yml'))
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    return config
-
-config = get_config()
-client = openai.OpenAI(api_key=config["openai"]["api_key"])
-
-rss_feeds = [
-    {"url": "https://www.coindesk.com/arc/outboundfeeds/rss/", "name": "CoinDesk"},
-    {"url": "https://cointelegraph.com/rss", "name": "CoinTelegraph"},
-    {"url": "https://bitcoinmagazine.com/.rss/full/", "name": "Bitcoin Magazine"},
-    {"url": "https://cryptoslate.com/feed/", "name": "CryptoSlate"},
-    {"url": "https://www.newsbtc.com/feed/", "name": "NewsBTC"}
-]
+from src.scraping.dedup import UrlIndex
+from src.scraping.feed_parser import iter_feed_items
+from src.scraping.feed_state import FeedStateStore
+from src.scraping.feeds import DEFAULT_MAX_ITEMS, load_feeds
+from src.scraping.analysis import ANALYSIS_MODEL, DEFAULT_ANALYSIS, PROMPT_VERSION, build_prompt, parse_analysis
+from src.scraping.llm_cache import analysis_key, get_analysis_cache
+
+_client = Lazy(lambda: openai.OpenAI(
+    api_key=get_config()["openai"]["api_key"], base_url=get_config()["openai"].get("base_url")
+))
+
+def get_openai_client():
+    """Returns the shared OpenAI client, created on first use."""
+    return _client.get()
+
+def set_openai_client(client):
+    """Injects the OpenAI client to use (e.g. a test stand-in); None recreates it from config."""
+    _client.set(client)
+
+# Fetch-and-store attempts per article before it is given up.
+MAX_ARTICLE_ATTEMPTS = 3
 
 class RSSSpider(scrapy.Spider):
     name = "rss_spider"
+    custom_settings = {
+        "ITEM_PIPELINES": {
+            "src.scraping.pipelines.AnalysisPipeline": 300,
+            "src.scraping.pipelines.ArticlePersistencePipeline": 800,
+        },
+    }
+
+    def __init__(self, *args, feeds=None, url_index=None, feed_state=None, continuous=False, **kwargs):
+        """
+        Args:
+            feeds (list): Feed registry entries; defaults to load_feeds().
+            url_index (UrlIndex): Known article URLs; loaded from the database when omitted.
+            feed_state (FeedStateStore): Per-feed validators, watermarks and polling intervals.
+            continuous (bool): Keep running and poll each feed again when it is due.
+        """
+        super().__init__(*args, **kwargs)
+        self.feeds = feeds
+        self.url_index = url_index
+        self.feed_state = feed_state if feed_state is not None else FeedStateStore()
+        self.continuous = continuous in (True, "1", "true", "True")
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        crawler.signals.connect(spider.schedule_due_feeds, signal=signals.spider_idle)
+        return spider
 
     def start_requests(self):
-        for feed in rss_feeds:
-            self.logger.info(f"Requesting RSS feed: {feed['url']} for source {feed['name']}")
-            yield scrapy.Request(feed["url"], callback=self.parse_rss, meta={"source_name": feed["name"]})
- 
+        if self.url_index is None:
+            with get_session() as session:
+                self.url_index = UrlIndex.load(session)
+        if self.feeds is None:
+            self.feeds = load_feeds()
+        for feed in self.feed_state.due(self.feeds):
+            yield self.feed_request(feed)
+
+    def schedule_due_feeds(self):
+        """On idle in continuous mode, re-polls the feeds that are due and keeps the spider open."""
+        if not self.continuous:
+            return
+        for feed in self.feed_state.due(self.feeds):
+            self.crawler.engine.crawl(self.feed_request(feed))
+        raise DontCloseSpider
+
+    def feed_request(self, feed):
+        self.logger.info(f"Requesting RSS feed: {feed['url']} for source {feed['name']}")
+        return scrapy.Request(
+            feed["url"], callback=self.parse_rss, errback=self.feed_failed, dont_filter=True,
+            headers=self.feed_state.conditional_headers(feed["url"]),
+            meta={"source_name": feed["name"], "feed_url": feed["url"], "max_items": feed.get("max_items"),
+                  "handle_httpstatus_list": [304]},
+        )
+
+    def feed_failed(self, failure):
+        """Records a failed poll as an empty one, so the feed backs off and is retried later."""
+        feed_url = failure.request.meta.get("feed_url", failure.request.url)
+        self.logger.error(f"Error fetching RSS feed {feed_url}: {failure.value}")
+        self.feed_state.record_poll(feed_url, 0)
+        self.feed_state.save()
+
     def parse_rss(self, response):
         source_name = response.meta["source_name"]
-        try:
-            root = ET.fromstring(response.body)
-        except Exception as e:
-            self.logger.error(f"Error parsing XML from {response.url}: {e}")
+        feed_url = response.meta.get("feed_url", response.url)
+        # Articles behind the watermark whose fetch or store failed are requested again first.
+        for article in self.feed_state.take_retries(feed_url):
+            if self.url_index.claim(article["url"]):
+                published = article["published_at"]
+                yield self.article_request(
+                    dict(article, published_at=datetime.fromisoformat(published) if published else None),
+                    source_name, feed_url,
+                )
+        if response.status == 304:
+            self.logger.info(f"Feed not modified: {feed_url}")
+            self.feed_state.record_poll(feed_url, 0)
+            self.feed_state.save()
             return
-        for item in root.findall(".//item")[:5]:
-            title = item.findtext("title")
-            link = item.findtext("link")
-            content_encoded = item.find("{http://purl.org/rss/1.0/modules/content/}encoded")
-            description = item.findtext("description")
-            content = BeautifulSoup(content_encoded.text, "html.parser").get_text(strip=True) if content_encoded else description or ""
-            self.logger.info(f"Found article: {title} from {source_name}")
-            yield scrapy.Request(link, callback=self.parse_article, meta={
-                "source_name": source_name,
-                "title": title,
-                "url": link,
-                "content": content
-            })
+        self.feed_state.record_validators(
+            feed_url,
+            etag=response.headers.get("ETag", b"").decode() or None,
+            last_modified=response.headers.get("Last-Modified", b"").decode() or None,
+        )
+        # max_items only caps the first poll; after that every item above the
+        # watermark is taken, since the watermark moves past all of them.
+        if self.feed_state.has_watermark(feed_url):
+            max_items = float("inf")
+        else:
+            max_items = response.meta.get("max_items") or DEFAULT_MAX_ITEMS
 
-    def parse_article(self, response):
-        title = response.meta["title"]
-        url = response.meta["url"]
-        content = response.meta["content"]
-        source_name = response.meta["source_name"]
+        new_items = 0
+        newest_published, newest_guid = None, None
+        items = iter_feed_items(response.body)
+        while new_items < max_items:
+            try:
+                item = next(items)
+            except StopIteration:
+                break
+            except ET.ParseError as e:
+                self.logger.error(f"Error parsing XML from {response.url}: {e}")
+                break
+            link = item["link"]
+            # Feeds list newest items first, so parsing stops at the watermark.
+            if not self.feed_state.is_new(feed_url, item["published"], item["guid"]):
+                break
+            new_items += 1
+            if newest_guid is None:
+                newest_guid = item["guid"]
+            if item["published"] is not None and (newest_published is None or item["published"] > newest_published):
+                newest_published = item["published"]
 
-        with get_session() as session:
-            existing_article = session.query(Article).filter_by(url=url).first()
-            if existing_article:
-                self.logger.info(f"Skipping duplicate article: {title} ({url})")
-                return
-
-            article = Article(
-                source=source_name,
-                title=title,
-                url=url,
-                content=content,
-                published_at=datetime.utcnow()
-            )
-            session.add(article)
-            session.flush()
-            self.logger.info(f"Article saved: {title}")
-
-            analysis = self.analyze_article_with_gpt(title, content)
-
-            analysis_summary = AnalysisSummary(
-                article_id=article.id,
-                sentiment=analysis["sentiment"],
-                key_points=analysis["key_points"],
-                potential_impact=analysis["potential_impact"],
-                credibility_issues=analysis["credibility_issues"]
+            title = item["title"]
+            if not link or not self.url_index.claim(link):
+                self.logger.debug(f"Skipping known article: {title} ({link})")
+                continue
+            self.logger.info(f"Found article: {title} from {source_name}")
+            yield self.article_request(
+                {"title": title, "url": link, "content": item["content"], "published_at": item["published"]},
+                source_name, feed_url,
             )
-            session.add(analysis_summary)
-            session.commit()
-            self.logger.info(f"Analysis summary saved for article: {title}")
 
+        self.feed_state.advance(feed_url, newest_published, newest_guid)
+        self.feed_state.record_poll(feed_url, new_items)
+        self.feed_state.save()
+
+    def article_request(self, article, source_name, feed_url):
+        return scrapy.Request(article["url"], callback=self.parse_article, errback=self.release_article, meta={
+            "source_name": source_name,
+            "feed_url": feed_url,
+            "title": article["title"],
+            "url": article["url"],
+            "content": article["content"],
+            "published_at": article["published_at"],
+            "attempts": article.get("attempts", 1),
+        })
+
+    def release_article(self, failure):
+        self.logger.error(f"Error fetching article {failure.request.url}: {failure.value}")
+        self.requeue_article(failure.request.meta)
+
+    def requeue_article(self, article):
+        """
+        Forgets an article that was not stored and queues it for the next poll of its feed.
+
+        The feed watermark has already moved past the article, so without the
+        queue the feed would never yield it again.
+
+        Args:
+            article (dict): Request meta or scraped item with url, feed_url, title,
+                content, published_at and attempts.
+        """
+        self.url_index.release(article["url"])
+        attempts = article.get("attempts", 1)
+        if not article.get("feed_url"):
+            return
+        if attempts >= MAX_ARTICLE_ATTEMPTS:
+            self.logger.warning(f"Giving up on article {article['url']} after {attempts} attempts.")
+            return
+        published = article.get("published_at")
+        self.feed_state.add_retry(article["feed_url"], {
+            "title": article["title"],
+            "url": article["url"],
+            "content": article["content"],
+            "published_at": published.isoformat() if published else None,
+            "attempts": attempts + 1,
+        })
+        self.feed_state.save()
+
+    def parse_article(self, response):
+        # Analysis and persistence run in the item pipelines, off the crawl path.
         yield {
-            "source": source_name,
-            "title": title,
-            "url": url,
-            "analysis": analysis
+            "source": response.meta["source_name"],
+            "title": response.meta["title"],
+            "url": response.meta["url"],
+            "content": response.meta["content"],
+            "published_at": response.meta.get("published_at") or datetime.utcnow(),
+            "feed_url": response.meta.get("feed_url"),
+            "attempts": response.meta.get("attempts", 1),
         }
 
     def analyze_article_with_gpt(self, title, content):
+        """Blocking single-article analysis; the crawl itself uses AnalysisPipeline."""
+        cache = get_analysis_cache()
+        key = analysis_key(title, content, ANALYSIS_MODEL, PROMPT_VERSION)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
         max_retries = 3
         retry_delay = 5  # seconds
         for attempt in range(max_retries):
             try:
-                prompt = (
-                    f"Analyze this Bitcoin (BTC) article. Respond only in JSON:\n\n"
-                    f"Title: {title}\nContent: {content}\n\n"
-                    f"Keys: sentiment, key_points (max 5), potential_impact, credibility_issues."
-                )
-                response = client.chat.completions.create(
-                    model="gpt-4-turbo",
-                    messages=[{"role": "user", "content": prompt}],
+                response = get_openai_client().chat.completions.create(
+                    model=ANALYSIS_MODEL,
+                    messages=[{"role": "user", "content": build_prompt(title, content)}],
                     max_tokens=500,
                     temperature=0.2,
                 )
                 if response.choices:
-                    raw_text = response.choices[0].message.content.strip()
-                    raw_text = raw_text.replace("```json", "").replace("```", "").strip()
-                    analysis_json = json.loads(raw_text)
-                    sentiment = analysis_json["sentiment"].capitalize()
-                    if sentiment not in ["Neutral", "Bullish", "Bearish"]:
-                        sentiment = "Neutral"
-                    analysis_json["sentiment"] = sentiment
+                    analysis_json = parse_analysis(response.choices[0].message.content)
                     self.logger.info(f"GPT analysis successful for article: {title}")
+                    cache.set(key, analysis_json)
                     return analysis_json
             except Exception as e:
                 self.logger.error(f"Error during GPT analysis (attempt {attempt+1}): {e}")
             if attempt < max_retries - 1:
                 time.sleep(retry_delay)
         self.logger.warning(f"Using default analysis for article: {title} after {max_retries} attempts")
-        return {"sentiment": "Neutral", "key_points": [], "potential_impact": "N/A", "credibility_issues": None}
+        return dict(DEFAULT_ANALYSIS)
@@ -4,3 +4,16 @@ SPIDER_MODULES = ["src.scraping.spiders"]
 NEWSPIDER_MODULE = "src.scraping.spiders"
 
 ROBOTSTXT_OBEY = True
+
+# LLM analysis pipeline: requests in flight, attempts per article, first backoff in seconds.
+ANALYSIS_CONCURRENCY = 8
+ANALYSIS_MAX_RETRIES = 3
+ANALYSIS_BACKOFF = 1.0
+# Serve re-scraped and syndicated articles from the content-hash analysis cache.
+ANALYSIS_CACHE = True
+# Articles per LLM request (1 disables batching) and seconds a partial batch waits.
+ANALYSIS_BATCH_SIZE = 1
+ANALYSIS_BATCH_WINDOW = 0.5
+# Articles written per database transaction, and the longest a partial batch waits in seconds.
+PERSIST_BATCH_SIZE = 100
+PERSIST_FLUSH_INTERVAL = 5.0
@@ -0,0 +1,65 @@
+"""
+Wall-clock benchmarks for the concurrent analysis paths.
+
+The unit tests prove that work overlaps with barriers and count requests; the
+timings live here, where a slow machine cannot make them flaky. Run with:
+
+    python -m src.tests.benchmarks
+"""
+import asyncio
+import time
+
+import openai
+import pandas as pd
+
+from src.data.models.agent import AnalyticalAgent
+from src.processing.agent_runner import AgentRunner, register_agent
+from src.scraping.analysis import AsyncArticleAnalyzer, BatchingArticleAnalyzer
+from src.tests.openai_stub import OpenAIStub
+from src.tests.test_batch_analysis import batch_reply
+
+
+def analyze_all(stub, analyzer_cls, n, **kwargs):
+    async def main():
+        client = openai.AsyncOpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+        analyzer = analyzer_cls(client=client, base_delay=0.01, **kwargs)
+        return await asyncio.gather(*(analyzer.analyze(f"Title {i}", f"Content {i}") for i in range(n)))
+    started = time.monotonic()
+    asyncio.run(main())
+    return time.monotonic() - started
+
+
+def bench_llm(n=20, delay=0.05):
+    with OpenAIStub(reply=batch_reply(), delay=delay) as stub:
+        serial = analyze_all(stub, AsyncArticleAnalyzer, n, max_concurrency=1)
+        concurrent = analyze_all(stub, AsyncArticleAnalyzer, n, max_concurrency=5)
+        batched = analyze_all(stub, BatchingArticleAnalyzer, n, max_concurrency=1, batch_size=10)
+    print(f"LLM analysis of {n} articles at {delay}s per request:")
+    print(f"  one at a time   {serial:.2f}s")
+    print(f"  5 in flight     {concurrent:.2f}s")
+    print(f"  batches of 10   {batched:.2f}s")
+
+
+class SleepingAgent(AnalyticalAgent):
+    signal_column = "sleeping_signal"
+    label = "Sleeping"
+
+    @classmethod
+    def compute_signal(cls, scored):
+        time.sleep(0.3)
+        return scored["sentiment_score"] > 0
+
+
+def bench_agents():
+    register_agent("sleeping_a", SleepingAgent)
+    register_agent("sleeping_b", type("OtherSleepingAgent", (SleepingAgent,), {"signal_column": "other_signal"}))
+    articles = pd.DataFrame({"title": ["t"], "content": ["Bitcoin rallies."], "published_at": ["2025-03-15"]})
+    runner = AgentRunner(["sleeping_a", "sleeping_b"])
+    runner.run(articles)
+    print("Two agents sleeping 0.3s each:")
+    print(f"  total {runner.timings['total']:.2f}s")
+
+
+if __name__ == "__main__":
+    bench_llm()
+    bench_agents()
@@ -1,8 +1,8 @@
 from sqlalchemy import text
-from data.models.database import SessionLocal
+from data.models.database import get_session
 
 try:
-    session = SessionLocal()
+    session = get_session()
     session.execute(text('SELECT 1'))  # simple test query
     print("Database connection successful!")
 except Exception as e:
@@ -0,0 +1,10 @@
+HOUR_MS = 3600 * 1000
+
+
+def fake_klines(start_ms, end_ms):
+    """Hourly Binance kline rows covering [start_ms, end_ms]; each bar closes at its hour number."""
+    first = -(-start_ms // HOUR_MS) * HOUR_MS
+    return [
+        [t, "1.0", "2.0", "0.5", str(t / HOUR_MS), "10.0", t + HOUR_MS - 1, "10.0", 5, "4.0", "4.0", "0"]
+        for t in range(first, end_ms + 1, HOUR_MS)
+    ]
@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BULLISH_REPLY = json.dumps({
+    "sentiment": "Bullish",
+    "key_points": ["Institutional interest increasing"],
+    "potential_impact": "Positive",
+    "credibility_issues": None,
+})
+
+
+class OpenAIStub:
+    """
+    Local stand-in for the OpenAI chat completions endpoint, for tests and throughput benchmarks.
+
+    Args:
+        reply (callable): reply(prompt) -> assistant message content.
+        delay (float): Seconds each request takes, to model API latency.
+        fail_first (int): Number of initial requests answered with HTTP 500.
+    """
+
+    def __init__(self, reply=lambda prompt: BULLISH_REPLY, delay=0.0, fail_first=0):
+        self.reply = reply
+        self.delay = delay
+        self.fail_first = fail_first
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with stub.lock:
+                    stub.requests.append(prompt)
+                    failed = len(stub.requests) <= stub.fail_first
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delay)
+                content = None if failed else stub.reply(prompt)
+                with stub.lock:
+                    stub.in_flight -= 1
+                if failed:
+                    payload, status = {"error": {"message": "stub failure", "type": "server_error"}}, 500
+                else:
+                    payload, status = {
+                        "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": content}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    }, 200
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.data.models.agent import BearishAgent, BullishAgent
+from src.data.models.analysis_summary import AnalysisSummary
+from src.data.models.article import Article
+from src.data.models.base import Base
+from src.data.models.database import set_engine
+
+
+class TestAgentPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        set_engine(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        contents = ["Bitcoin rallies strongly with great gains.", "Terrible crash and awful losses."] * 100
+        self.articles = [
+            {"title": f"Article {i}", "content": content, "published_at": "2025-03-15"}
+            for i, content in enumerate(contents)
+        ]
+        self.session.add_all([
+            Article(source="Test", title=a["title"], url=f"https://example.com/{i}", content=a["content"],
+                    published_at=datetime(2025, 3, 15))
+            for i, a in enumerate(self.articles[:150])
+        ])
+        self.session.commit()
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self.record_statement)
+
+    def tearDown(self):
+        self.session.close()
+        set_engine(None)
+
+    def record_statement(self, conn, cursor, statement, *args):
+        self.statements.append(statement.split()[0])
+
+    def sentiments(self):
+        self.session.expire_all()
+        return {s.article_id: s.sentiment for s in self.session.query(AnalysisSummary)}
+
+    def test_bulk_save_and_update(self):
+        BullishAgent(self.articles).analyze()
+        self.assertEqual(self.statements.count("SELECT"), 1)
+        self.assertEqual(self.statements.count("INSERT"), 1)
+        sentiments = self.sentiments()
+        # Articles missing from the database are skipped.
+        self.assertEqual(len(sentiments), 150)
+        self.assertEqual(sentiments[1], "Bullish")
+        self.assertEqual(sentiments[2], "Neutral")
+
+        BearishAgent(self.articles).analyze()
+        sentiments = self.sentiments()
+        self.assertEqual(len(sentiments), 150)
+        self.assertEqual(sentiments[1], "Neutral")
+        self.assertEqual(sentiments[2], "Bearish")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.data.models.agent import AnalyticalAgent
+from src.data.models.analysis_summary import AnalysisSummary
+from src.data.models.article import Article
+from src.data.models.base import Base
+from src.data.models.database import set_engine
+from src.processing.agent_runner import AGENTS, AgentRunner, register_agent
+
+
+class SlowAgent(AnalyticalAgent):
+    """Waits for a second agent at a barrier, so it only finishes if both run at once."""
+    signal_column = "slow_signal"
+    label = "Slow"
+    barrier = threading.Barrier(2, timeout=5)
+
+    @classmethod
+    def compute_signal(cls, scored):
+        cls.barrier.wait()
+        return scored["sentiment_score"] > 0
+
+
+class TestAgentRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # A file database, since each thread would get its own in-memory one.
+        engine = create_engine(f"sqlite:///{os.path.join(self.tmp.name, 'test.db')}")
+        Base.metadata.create_all(engine)
+        set_engine(engine)
+        self.session = sessionmaker(bind=engine)()
+        self.articles = [
+            {"title": "Up", "content": "Bitcoin rallies strongly with great gains.", "published_at": "2025-03-15"},
+            {"title": "Down", "content": "Terrible crash and awful losses.", "published_at": "2025-03-16"},
+            {"title": "Flat", "content": "Bitcoin traded at a price.", "published_at": "2025-03-17"},
+        ]
+        self.session.add_all([
+            Article(source="Test", title=a["title"], url=f"https://example.com/{a['title']}", content=a["content"],
+                    published_at=datetime(2025, 3, 15))
+            for a in self.articles
+        ])
+        self.session.commit()
+        self.registered = dict(AGENTS)
+
+    def tearDown(self):
+        AGENTS.clear()
+        AGENTS.update(self.registered)
+        self.session.close()
+        set_engine(None)
+        self.tmp.cleanup()
+
+    def stored_sentiments(self):
+        self.session.expire_all()
+        titles = dict(self.session.query(Article.id, Article.title).all())
+        return {titles[s.article_id]: s.sentiment for s in self.session.query(AnalysisSummary)}
+
+    def test_merges_signals_and_stores_one_label(self):
+        runner = AgentRunner(["bullish", "bearish"], persist=True)
+        for _ in range(3):
+            merged = runner.run(self.articles)
+            self.assertEqual(merged["bullish_signal"].tolist(), [True, False, False])
+            self.assertEqual(merged["bearish_signal"].tolist(), [False, True, False])
+            self.assertEqual(merged["sentiment_label"].tolist(), ["Bullish", "Bearish", "Neutral"])
+            self.assertEqual(self.stored_sentiments(), {"Up": "Bullish", "Down": "Bearish", "Flat": "Neutral"})
+        self.assertEqual(set(runner.timings), {"preprocess", "bullish", "bearish", "persist", "total"})
+
+    def test_does_not_persist_by_default(self):
+        AgentRunner(["bullish", "bearish"]).run(self.articles)
+        self.assertEqual(self.stored_sentiments(), {})
+
+    def test_unreachable_database_only_logs(self):
+        with mock.patch("src.processing.agent_runner.get_session", side_effect=RuntimeError("no database")):
+            with self.assertLogs("src.processing.agent_runner", level="ERROR"):
+                merged = AgentRunner(["bullish", "bearish"], persist=True).run(self.articles)
+        self.assertEqual(merged["sentiment_label"].tolist(), ["Bullish", "Bearish", "Neutral"])
+
+    def test_agents_run_concurrently(self):
+        SlowAgent.barrier.reset()
+        register_agent("slow_a", SlowAgent)
+        register_agent("slow_b", type("OtherSlowAgent", (SlowAgent,), {"signal_column": "other_signal"}))
+        runner = AgentRunner(["slow_a", "slow_b"])
+        merged = runner.run(self.articles)
+        self.assertEqual(merged["slow_signal"].tolist(), merged["other_signal"].tolist())
+        # Both agents fire together, which is a conflict.
+        self.assertEqual(merged["sentiment_label"].iloc[0], "Neutral")
+        self.assertEqual(self.stored_sentiments(), {})
+
+    def test_process_executor(self):
+        merged = AgentRunner(["bullish"], executor="process").run(self.articles)
+        self.assertEqual(merged["bullish_signal"].tolist(), [True, False, False])
+        self.assertEqual(merged["sentiment_label"].tolist(), ["Bullish", "Neutral", "Neutral"])
+
+    def test_empty_and_invalid(self):
+        self.assertTrue(AgentRunner().run([]).empty)
+        with self.assertRaises(KeyError):
+            AgentRunner(["missing"])
+        with self.assertRaises(ValueError):
+            register_agent("bad", type("NoSignal", (SlowAgent,), {"signal_column": None}))
+
+if __name__ == "__main__":
+    unittest.main()
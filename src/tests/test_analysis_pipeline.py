@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import unittest
+import openai
+from src.scraping.analysis import AsyncArticleAnalyzer
+from src.scraping.pipelines import AnalysisPipeline
+from src.tests.openai_stub import BULLISH_REPLY, OpenAIStub
+
+
+def make_items(n):
+    return [{"title": f"Article {i}", "content": f"Bitcoin story {i}", "url": f"https://example.com/{i}"}
+            for i in range(n)]
+
+
+class TestAnalysisPipeline(unittest.TestCase):
+
+    def run_pipeline(self, stub, items, **kwargs):
+        async def main():
+            client = openai.AsyncOpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+            pipeline = AnalysisPipeline(analyzer=AsyncArticleAnalyzer(client=client, **kwargs))
+            return await asyncio.gather(*(pipeline.process_item(item) for item in items))
+        return asyncio.run(main())
+
+    def test_requests_overlap_within_limit(self):
+        # Each reply waits until five requests are in flight, so fewer would time out.
+        barrier = threading.Barrier(5, timeout=5)
+
+        def reply(prompt):
+            barrier.wait()
+            return BULLISH_REPLY
+
+        with OpenAIStub(reply=reply) as stub:
+            items = self.run_pipeline(stub, make_items(20), max_concurrency=5, max_retries=1)
+        self.assertTrue(all(item["analysis"]["sentiment"] == "Bullish" for item in items))
+        self.assertEqual(stub.max_in_flight, 5)
+
+    def test_retries_with_backoff(self):
+        with OpenAIStub(fail_first=2) as stub:
+            items = self.run_pipeline(stub, make_items(1), max_retries=3, base_delay=0.01)
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(items[0]["analysis"]["sentiment"], "Bullish")
+
+    def test_falls_back_to_neutral(self):
+        with OpenAIStub(reply=lambda prompt: "not json") as stub:
+            items = self.run_pipeline(stub, make_items(1), max_retries=2, base_delay=0.01)
+        self.assertEqual(len(stub.requests), 2)
+        self.assertEqual(items[0]["analysis"]["sentiment"], "Neutral")
+
+if __name__ == "__main__":
+    unittest.main()
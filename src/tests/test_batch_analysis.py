@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import unittest
+import openai
+from src.scraping.analysis import AsyncArticleAnalyzer, BatchingArticleAnalyzer, parse_batch_analysis
+from src.scraping.llm_cache import AnalysisCache
+from src.tests.openai_stub import OpenAIStub, BULLISH_REPLY
+
+
+def batch_reply(skip=()):
+    def reply(prompt):
+        if not prompt.startswith("Analyze each"):
+            return BULLISH_REPLY
+        ids = [int(i) for i in re.findall(r"Article (\d+):", prompt)]
+        return json.dumps([
+            {"id": i, "sentiment": "bearish", "key_points": [], "potential_impact": "", "credibility_issues": None}
+            for i in ids if i not in skip
+        ])
+    return reply
+
+
+class TestBatchAnalysis(unittest.TestCase):
+
+    def analyze_all(self, stub, analyzer_cls, n, **kwargs):
+        async def main():
+            client = openai.AsyncOpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+            analyzer = analyzer_cls(client=client, base_delay=0.01, **kwargs)
+            return await asyncio.gather(*(analyzer.analyze(f"Title {i}", f"Content {i}") for i in range(n)))
+        return asyncio.run(main())
+
+    def test_parse_batch_analysis(self):
+        results = parse_batch_analysis('```json\n[{"id": 1, "sentiment": "BULLISH"}, {"sentiment": "x"}, 3]\n```')
+        self.assertEqual(results, {1: {"sentiment": "Bullish"}})
+
+    def test_batches_map_back_to_articles(self):
+        with OpenAIStub(reply=batch_reply()) as stub:
+            results = self.analyze_all(stub, BatchingArticleAnalyzer, 10, batch_size=4, batch_window=0.05)
+        self.assertEqual(len(stub.requests), 3)
+        self.assertTrue(all(r["sentiment"] == "Bearish" for r in results))
+
+    def test_failed_entries_fall_back_to_single_requests(self):
+        with OpenAIStub(reply=batch_reply(skip={1})) as stub:
+            results = self.analyze_all(stub, BatchingArticleAnalyzer, 3, batch_size=3)
+        self.assertEqual([r["sentiment"] for r in results], ["Bearish", "Bullish", "Bearish"])
+        self.assertEqual(len(stub.requests), 2)
+        self.assertIn("Title 1", stub.requests[1])
+
+    def test_fallbacks_count_one_cache_miss(self):
+        with tempfile.TemporaryDirectory() as tmp, OpenAIStub(reply=batch_reply(skip={1})) as stub:
+            cache = AnalysisCache(os.path.join(tmp, "analysis.sqlite"))
+            self.analyze_all(stub, BatchingArticleAnalyzer, 3, batch_size=3, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (0, 3))
+            self.assertEqual(len(cache), 3)
+            self.analyze_all(stub, BatchingArticleAnalyzer, 3, batch_size=3, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (3, 3))
+            cache.close()
+
+    def test_parsed_entries_resolve_before_fallbacks(self):
+        release = threading.Event()
+        reply = batch_reply(skip={1})
+
+        def gated(prompt):
+            if not prompt.startswith("Analyze each"):
+                release.wait(5)
+            return reply(prompt)
+
+        async def main(stub):
+            client = openai.AsyncOpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+            analyzer = BatchingArticleAnalyzer(client=client, base_delay=0.01, batch_size=3)
+            tasks = [asyncio.create_task(analyzer.analyze(f"Title {i}", f"Content {i}")) for i in range(3)]
+            try:
+                first = await asyncio.wait_for(tasks[0], 2)
+                self.assertFalse(tasks[1].done())
+            finally:
+                release.set()
+            return [first] + list(await asyncio.gather(*tasks[1:]))
+
+        with OpenAIStub(reply=gated) as stub:
+            results = asyncio.run(main(stub))
+        self.assertEqual([r["sentiment"] for r in results], ["Bearish", "Bullish", "Bearish"])
+
+    def test_batching_cuts_requests_by_batch_size(self):
+        with OpenAIStub(reply=batch_reply()) as stub:
+            self.analyze_all(stub, AsyncArticleAnalyzer, 20, max_concurrency=1)
+            self.assertEqual(len(stub.requests), 20)
+            self.analyze_all(stub, BatchingArticleAnalyzer, 20, max_concurrency=1, batch_size=10)
+        self.assertEqual(len(stub.requests), 22)
+
+if __name__ == "__main__":
+    unittest.main()
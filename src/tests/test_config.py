@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import MagicMock
+from src.config import Lazy, get_config, set_config
+from src.scraping.scrape_data import fetch_klines, get_client, set_client
+from src.tests.kline_fixtures import HOUR_MS, fake_klines
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+
+class TestLazyConfig(unittest.TestCase):
+
+    def tearDown(self):
+        set_config(None)
+        set_client(None)
+
+    def test_imports_have_no_side_effects(self):
+        """Importing the app modules must not read config.yml or build clients."""
+        code = (
+            "import src.processing.backtester, src.scraping.scrape_news, src.api_clients.analysis_report\n"
+            "from src.config import _config\n"
+            "assert _config.value is None"
+        )
+        env = dict(os.environ, FINANCEML_CONFIG="/nonexistent/config.yml")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_lazy_creates_once(self):
+        factory = MagicMock(side_effect=lambda: object())
+        lazy = Lazy(factory)
+        self.assertIs(lazy.get(), lazy.get())
+        lazy.reset()
+        lazy.get()
+        self.assertEqual(factory.call_count, 2)
+
+    def test_injected_overrides(self):
+        set_config({"binance": {"api_key": "k", "api_secret": "s"}})
+        self.assertEqual(get_config()["binance"]["api_key"], "k")
+
+        client = MagicMock()
+        client.get_klines.side_effect = lambda symbol, interval, startTime, endTime, limit: fake_klines(startTime, endTime)
+        set_client(client)
+        self.assertIs(get_client(), client)
+        klines = fetch_klines("BTCUSDT", "1h", 0, 9 * HOUR_MS)
+        self.assertEqual(len(klines), 10)
+        client.get_klines.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
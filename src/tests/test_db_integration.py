@@ -2,10 +2,10 @@ import pytest
 from datetime import datetime
 
 from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 from src.data.models.article import Article
 from src.data.models.analysis_summary import AnalysisSummary
 from src.data.models.base import Base
-from src.data.models.database import SessionLocal as sessionmaker
 
 def db_session():
     engine = create_engine("sqlite:///:memory:")
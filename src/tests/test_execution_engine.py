@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.backtester import Backtester
+from src.processing.execution_engine import position_states
+from src.data.models.trading_strategy import TradingStrategy
+
+
+def make_signal_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n, freq="D")
+    return pd.DataFrame({
+        "close": 100 + rng.normal(0, 1, n).cumsum(),
+        "bullish_signal": rng.random(n) < 0.2,
+        "bearish_signal": rng.random(n) < 0.2,
+    }, index=index)
+
+
+class TestExecutionEngine(unittest.TestCase):
+
+    def run_engine(self, df, engine, use_strategy=False):
+        backtester = Backtester(TradingStrategy(bullish_ma_window=5), "2024-01-01", "2024-12-31")
+        backtester.df = df
+        final_value = backtester.execute_strategy(engine=engine, use_strategy=use_strategy)
+        return final_value, backtester
+
+    def test_vectorized_matches_loop(self):
+        """Ensure the vectorized engine reproduces the loop engine's trades and final value."""
+        for seed in range(20):
+            df = make_signal_frame(300, seed)
+            loop_value, loop_bt = self.run_engine(df, "loop")
+            vec_value, vec_bt = self.run_engine(df, "vectorized")
+
+            self.assertAlmostEqual(loop_value, vec_value, places=6)
+            self.assertEqual(len(loop_bt.trades), len(vec_bt.trades))
+            for expected, actual in zip(loop_bt.trades, vec_bt.trades):
+                self.assertEqual(expected["date"], actual["date"])
+                self.assertEqual(expected["action"], actual["action"])
+                self.assertAlmostEqual(expected["price"], actual["price"])
+                self.assertAlmostEqual(expected["amount"], actual["amount"], places=9)
+            self.assertAlmostEqual(vec_bt.equity_curve.iloc[-1], vec_value)
+
+    def test_strategy_signals_match_loop(self):
+        """Ensure both engines agree when trading on the TradingStrategy rules."""
+        df = make_signal_frame(200, 11)
+        loop_value, loop_bt = self.run_engine(df, "loop", use_strategy=True)
+        vec_value, vec_bt = self.run_engine(df, "vectorized", use_strategy=True)
+        self.assertAlmostEqual(loop_value, vec_value, places=6)
+        self.assertEqual([t["date"] for t in loop_bt.trades], [t["date"] for t in vec_bt.trades])
+
+    def test_performance_metrics_match_across_engines(self):
+        """Ensure metrics rebuilt from the loop engine's trades match the vectorized equity curve."""
+        df = make_signal_frame(300, 4)
+        _, loop_bt = self.run_engine(df, "loop")
+        _, vec_bt = self.run_engine(df, "vectorized")
+        loop_metrics = loop_bt.performance_metrics()
+        for name, value in vec_bt.performance_metrics().items():
+            self.assertAlmostEqual(loop_metrics[name], value, places=6)
+
+    def test_loop_after_vectorized_reports_its_own_run(self):
+        """Ensure metrics after a loop run reflect it, even on a backtester the vectorized engine ran first."""
+        df = make_signal_frame(300, 4)
+        _, reference = self.run_engine(df.assign(bullish_signal=False), "loop")
+        _, backtester = self.run_engine(df, "vectorized")
+        backtester.df = df.assign(bullish_signal=False)
+        backtester.execute_strategy(engine="loop")
+        self.assertEqual(backtester.trades, [])
+        self.assertFalse(backtester.position.any())
+        self.assertEqual(backtester.performance_metrics(), reference.performance_metrics())
+
+    def test_no_signals(self):
+        """Ensure a frame without signals keeps the initial balance."""
+        df = make_signal_frame(50, 0)
+        df["bullish_signal"] = False
+        df["bearish_signal"] = False
+        final_value, backtester = self.run_engine(df, "vectorized")
+        self.assertEqual(final_value, 10000)
+        self.assertEqual(backtester.trades, [])
+
+    def test_position_states_toggle(self):
+        """Ensure bars with both signals flip the position."""
+        bullish = [True, True, False, True, True, False]
+        bearish = [False, False, True, True, True, False]
+        states = position_states(bullish, bearish)
+        self.assertEqual(states.tolist(), [False, True, False, True, False, False])
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            self.run_engine(make_signal_frame(10, 0), "gpu")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.processing.data_processor import DataProcessor
+from src.processing.features import TfidfFeatures
+
+
+def corpus(n, seed=0):
+    rng = random.Random(seed)
+    words = "bitcoin market rally crash price stable gain loss fear etf halving the and".split()
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(1, 12))) for _ in range(n)]
+
+
+class TestTfidfFeatures(unittest.TestCase):
+
+    def test_matches_tfidf_vectorizer(self):
+        docs = corpus(300)
+        reference = TfidfVectorizer(stop_words="english", max_features=3).fit(docs)
+        features = TfidfFeatures(max_features=3).fit([docs[:120], docs[120:]])
+        self.assertEqual(features.feature_names(), list(reference.get_feature_names_out()))
+        matrix = features.transform(docs)
+        self.assertTrue(sp.issparse(matrix))
+        self.assertAlmostEqual(abs(matrix - reference.transform(docs)).max(), 0)
+
+    def test_persisted_vocabulary_is_updated_incrementally(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tfidf.npz")
+            first = TfidfFeatures(path=path).fit([corpus(100)])
+            first.save()
+            later = TfidfFeatures(path=path)
+            self.assertEqual(later.vocabulary, first.vocabulary)
+            later.partial_fit(corpus(50, seed=1) + ["unseen words only"])
+            self.assertEqual(later.n_docs, 151)
+            self.assertEqual(later.vocabulary, first.vocabulary)
+            self.assertEqual(later.transform(["unseen words only"]).nnz, 0)
+
+    def test_rerunning_over_counted_articles_leaves_model_unchanged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tfidf.npz")
+            articles = [{"title": "t", "content": text, "published_at": "2025-03-15"} for text in corpus(40)]
+            for _ in range(3):
+                processor = DataProcessor(articles, features=TfidfFeatures(path=path))
+                processor.preprocess_articles()
+                processor.feature_engineering(chunk_size=7)
+                state = TfidfFeatures(path=path)
+                self.assertEqual(state.n_docs, 40)
+                if _ == 0:
+                    doc_freq = state.doc_freq.copy()
+                np.testing.assert_array_equal(state.doc_freq, doc_freq)
+
+            # Only the new articles are counted on the next day.
+            new = [{"title": "t", "content": text, "published_at": "2025-03-16"} for text in corpus(5, seed=3)]
+            processor = DataProcessor(articles + new, features=TfidfFeatures(path=path))
+            processor.preprocess_articles()
+            processor.feature_engineering()
+            self.assertEqual(TfidfFeatures(path=path).n_docs, 45)
+
+    def test_hashing_mode(self):
+        features = TfidfFeatures(mode="hashing", n_features=2**10).fit([corpus(50)])
+        matrix = features.transform(corpus(10, seed=2))
+        self.assertEqual(matrix.shape, (10, 2**10))
+        np.testing.assert_allclose(sp.linalg.norm(matrix, axis=1), 1.0)
+
+    def test_hashing_state_round_trips(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tfidf.npz")
+            features = TfidfFeatures(mode="hashing", n_features=2**10, path=path).fit([corpus(50)])
+            features.watermark = pd.Timestamp("2025-03-15")
+            features.save()
+            loaded = TfidfFeatures(path=path)
+            self.assertEqual(loaded.mode, "hashing")
+            self.assertEqual(loaded.watermark, features.watermark)
+            self.assertEqual(loaded.n_docs, 50)
+            np.testing.assert_array_equal(loaded.doc_freq, features.doc_freq)
+
+    def test_data_processor_stays_sparse(self):
+        articles = [{"title": "t", "content": text, "published_at": "2025-03-15"} for text in corpus(40)]
+        processor = DataProcessor(articles, features=TfidfFeatures(mode="hashing", n_features=2**12))
+        processor.preprocess_articles()
+        processor.feature_engineering(chunk_size=7)
+        self.assertEqual(processor.tfidf_matrix.shape, (40, 2**12))
+        self.assertTrue(all(str(dtype).startswith("Sparse") for dtype in processor.df_tfidf.dtypes))
+        self.assertLess(processor.df_tfidf.shape[1], 100)
+
+if __name__ == "__main__":
+    unittest.main()
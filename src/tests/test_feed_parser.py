@@ -0,0 +1,58 @@
+import unittest
+from datetime import datetime
+from src.scraping.feed_parser import iter_feed_items, strip_html
+from src.scraping.feeds import FEEDS, load_feeds
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>
+<title>Feed</title>
+<item><title>First &amp; best</title><link>https://example.com/1</link><guid>g1</guid>
+<pubDate>Tue, 02 Jan 2024 10:00:00 GMT</pubDate><description>short</description>
+<content:encoded><![CDATA[<p>Full <b>text</b></p><script>var x = 1;</script>]]></content:encoded></item>
+<item><title>Second</title><link>https://example.com/2</link><description>&lt;p&gt;Only description&lt;/p&gt;</description></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>
+<entry><title>Entry</title><id>urn:1</id><link rel="self" href="https://example.com/self"/>
+<link href="https://example.com/entry"/><updated>2024-01-02T09:00:00Z</updated>
+<content type="html">&lt;p&gt;Atom &amp;amp; body&lt;/p&gt;</content></entry>
+</feed>"""
+
+
+class TestFeedParser(unittest.TestCase):
+
+    def test_rss_items(self):
+        items = list(iter_feed_items(RSS))
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[0]["title"], "First & best")
+        self.assertEqual(items[0]["guid"], "g1")
+        self.assertEqual(items[0]["published"], datetime(2024, 1, 2, 10, 0))
+        self.assertEqual(items[0]["content"], "Full text")
+        self.assertEqual(items[1]["content"], "Only description")
+        self.assertEqual(items[1]["guid"], "https://example.com/2")
+
+    def test_atom_entries(self):
+        (item,) = iter_feed_items(ATOM)
+        self.assertEqual(item["link"], "https://example.com/entry")
+        self.assertEqual(item["guid"], "urn:1")
+        self.assertEqual(item["published"], datetime(2024, 1, 2, 9, 0))
+        self.assertEqual(item["content"], "Atom & body")
+
+    def test_yields_before_document_ends(self):
+        """Items are produced while the rest of the document is still unread."""
+        truncated = RSS[:RSS.index(b"<item><title>Second")]
+        items = iter_feed_items(truncated, chunk_size=64)
+        self.assertEqual(next(items)["guid"], "g1")
+
+    def test_strip_html(self):
+        self.assertEqual(strip_html("<div>a<br/>b &lt;c&gt;<style>p{}</style></div>"), "a b <c>")
+        self.assertEqual(strip_html(None), "")
+
+    def test_feed_registry(self):
+        self.assertEqual(load_feeds({}), FEEDS)
+        feeds = load_feeds({"feeds": [{"url": "https://example.com/rss", "name": "Example"}]})
+        self.assertEqual(feeds, [{"url": "https://example.com/rss", "name": "Example", "max_items": 20}])
+
+if __name__ == "__main__":
+    unittest.main()
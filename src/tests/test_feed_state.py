@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from scrapy.http import XmlResponse
+from src.scraping.dedup import UrlIndex
+from src.scraping.feed_state import FeedStateStore, parse_feed_date
+from src.scraping.scrape_news import RSSSpider
+
+FEED_URL = "https://example.com/feed"
+
+
+def rss(*items):
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{title}</link>"
+        f"<guid>{title}</guid><pubDate>{date}</pubDate><description>text</description></item>"
+        for title, date in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel>{body}</channel></rss>'.encode("utf-8")
+
+
+class TestFeedState(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "feeds", "state.json")
+        self.spider = RSSSpider(url_index=UrlIndex(), feed_state=FeedStateStore(self.path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def poll(self, body, status=200, headers=None, max_items=None):
+        request = self.spider.feed_request({"url": FEED_URL, "name": "Test", "max_items": max_items})
+        response = XmlResponse(url=FEED_URL, body=body, status=status, headers=headers or {}, request=request)
+        return request, list(self.spider.parse_rss(response))
+
+    def test_parse_feed_date(self):
+        self.assertEqual(parse_feed_date("Tue, 02 Jan 2024 10:00:00 +0100"), datetime(2024, 1, 2, 9, 0))
+        self.assertEqual(parse_feed_date("2024-01-02T09:00:00Z"), datetime(2024, 1, 2, 9, 0))
+        self.assertIsNone(parse_feed_date("not a date"))
+
+    def test_conditional_get_and_watermark(self):
+        _, requests = self.poll(
+            rss(("b", "Tue, 02 Jan 2024 10:00:00 GMT"), ("a", "Mon, 01 Jan 2024 10:00:00 GMT")),
+            headers={"ETag": '"v1"', "Last-Modified": "Tue, 02 Jan 2024 10:00:00 GMT"},
+        )
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0].meta["published_at"], datetime(2024, 1, 2, 10, 0))
+
+        request, requests = self.poll(rss(
+            ("c", "Wed, 03 Jan 2024 10:00:00 GMT"),
+            ("b", "Tue, 02 Jan 2024 10:00:00 GMT"),
+            ("a", "Mon, 01 Jan 2024 10:00:00 GMT"),
+        ))
+        self.assertEqual(request.headers["If-None-Match"], b'"v1"')
+        self.assertEqual(request.headers["If-Modified-Since"], b"Tue, 02 Jan 2024 10:00:00 GMT")
+        self.assertEqual([r.meta["title"] for r in requests], ["c"])
+
+        # State survives a restart.
+        reloaded = FeedStateStore(self.path)
+        self.assertEqual(reloaded.get(FEED_URL)["last_published"], "2024-01-03T10:00:00")
+        self.assertEqual(reloaded.get(FEED_URL)["etag"], '"v1"')
+
+    def test_max_items_only_caps_first_poll(self):
+        _, requests = self.poll(rss(
+            ("b", "Tue, 02 Jan 2024 10:00:00 GMT"), ("a", "Mon, 01 Jan 2024 10:00:00 GMT"),
+        ), max_items=1)
+        self.assertEqual([r.meta["title"] for r in requests], ["b"])
+
+        _, requests = self.poll(rss(
+            ("e", "Fri, 05 Jan 2024 10:00:00 GMT"),
+            ("d", "Thu, 04 Jan 2024 10:00:00 GMT"),
+            ("c", "Wed, 03 Jan 2024 10:00:00 GMT"),
+            ("b", "Tue, 02 Jan 2024 10:00:00 GMT"),
+        ), max_items=1)
+        self.assertEqual([r.meta["title"] for r in requests], ["e", "d", "c"])
+
+    def test_failed_articles_are_retried_on_next_poll(self):
+        feed = rss(("b", "Tue, 02 Jan 2024 10:00:00 GMT"), ("a", "Mon, 01 Jan 2024 10:00:00 GMT"))
+        _, requests = self.poll(feed)
+        fetched_b, fetched_a = requests
+        # b fails to fetch; a is fetched but its article fails to store.
+        self.spider.release_article(SimpleNamespace(request=fetched_b, value=IOError("timeout")))
+        self.spider.requeue_article(next(iter(self.spider.parse_article(
+            XmlResponse(url=fetched_a.url, body=b"", request=fetched_a)
+        ))))
+        self.assertNotIn("https://example.com/b", self.spider.url_index)
+
+        # State survives a restart, and an unchanged feed still yields the retries.
+        self.spider.feed_state = FeedStateStore(self.path)
+        _, requests = self.poll(b"", status=304)
+        self.assertEqual([r.meta["title"] for r in requests], ["b", "a"])
+        self.assertEqual(requests[0].meta["published_at"], datetime(2024, 1, 2, 10, 0))
+        self.assertEqual(requests[0].meta["attempts"], 2)
+        _, requests = self.poll(feed)
+        self.assertEqual(requests, [])
+
+        # Articles are given up after MAX_ARTICLE_ATTEMPTS.
+        retry = self.spider.article_request(
+            dict(title="b", url="https://example.com/b", content="text", published_at=None, attempts=3),
+            "Test", FEED_URL,
+        )
+        self.spider.release_article(SimpleNamespace(request=retry, value=IOError("timeout")))
+        self.assertEqual(self.spider.feed_state.take_retries(FEED_URL), [])
+
+    def test_failed_feed_backs_off(self):
+        self.poll(rss(("a", "Mon, 01 Jan 2024 10:00:00 GMT")))
+        interval = self.spider.feed_state.get(FEED_URL)["interval"]
+        request = self.spider.feed_request({"url": FEED_URL, "name": "Test"})
+        self.assertEqual(request.errback, self.spider.feed_failed)
+        self.spider.feed_failed(SimpleNamespace(request=request, value=IOError("timeout")))
+        self.assertGreater(FeedStateStore(self.path).get(FEED_URL)["interval"], interval)
+
+    def test_not_modified_backs_off(self):
+        self.poll(rss(("a", "Mon, 01 Jan 2024 10:00:00 GMT")))
+        interval = self.spider.feed_state.get(FEED_URL)["interval"]
+        _, requests = self.poll(b"", status=304)
+        self.assertEqual(requests, [])
+        self.assertEqual(self.spider.feed_state.get(FEED_URL)["interval"], interval * 1.5)
+
+    def test_adaptive_interval_and_due(self):
+        store = FeedStateStore(self.path, min_interval=60, max_interval=600)
+        feeds = [{"url": "busy", "name": "Busy"}, {"url": "quiet", "name": "Quiet"}]
+        for _ in range(10):
+            store.record_poll("busy", new_items=3, now=0)
+            store.record_poll("quiet", new_items=0, now=0)
+        self.assertEqual(store.get("busy")["interval"], 60)
+        self.assertEqual(store.get("quiet")["interval"], 600)
+        self.assertEqual([f["name"] for f in store.due(feeds, now=120)], ["Busy"])
+
+if __name__ == "__main__":
+    unittest.main()
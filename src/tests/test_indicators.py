@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.indicators import IndicatorStore
+from src.data.models.trading_strategy import TradingStrategy
+
+
+class TestIndicatorStore(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        n = 200
+        self.df = pd.DataFrame({
+            "close": 100 + rng.normal(0, 1, n).cumsum(),
+            "bullish_signal": rng.random(n) < 0.3,
+            "bearish_signal": rng.random(n) < 0.3,
+        }, index=pd.date_range("2024-01-01", periods=n, freq="D"))
+        self.store = IndicatorStore()
+
+    def test_memoizes_per_dataset_and_params(self):
+        """Ensure each (indicator, parameter) column is computed once per dataset."""
+        first = self.store.get(self.df, "sma", window=10)
+        second = self.store.get(self.df.copy(), "sma", window=10)
+        self.assertIs(first, second)
+        self.store.get(self.df, "sma", window=20)
+        self.assertEqual((self.store.hits, self.store.misses), (1, 2))
+        np.testing.assert_allclose(first, self.df["close"].rolling(10).mean().to_numpy())
+
+    def test_in_place_mutation_is_detected(self):
+        before = self.store.get(self.df, "sma", window=5)
+        self.df["close"] *= 2
+        after = self.store.get(self.df, "sma", window=5)
+        np.testing.assert_allclose(after, before * 2)
+
+    def test_unknown_indicator(self):
+        with self.assertRaises(KeyError):
+            self.store.get(self.df, "macd")
+
+    def test_signal_vectors_match_scalar_rules(self):
+        """Ensure buy_signals/sell_signals agree with should_buy/should_sell bar by bar."""
+        strategy = TradingStrategy(bullish_ma_window=10, indicator_store=self.store)
+        buy = strategy.buy_signals(self.df)
+        sell = strategy.sell_signals(self.df)
+        for date in self.df.index:
+            self.assertEqual(bool(strategy.should_buy(self.df, date)), buy.loc[date])
+            self.assertEqual(bool(strategy.should_sell(self.df, date)), sell.loc[date])
+        self.assertEqual(self.store.misses, 1)
+
+if __name__ == "__main__":
+    unittest.main()
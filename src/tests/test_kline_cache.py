@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.scraping.kline_cache import KlineCache, klines_to_array, merge_klines
+from src.tests.kline_fixtures import HOUR_MS, fake_klines
+
+
+class TestKlineCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = KlineCache(self.cache_dir)
+        self.calls = []
+        self.now = (int(time.time() * 1000) // HOUR_MS) * HOUR_MS
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def fetch(self, lo, hi):
+        self.calls.append((lo, hi))
+        return fake_klines(lo, hi)
+
+    def test_klines_to_array(self):
+        arr = klines_to_array(fake_klines(0, 2 * HOUR_MS))
+        self.assertEqual(len(arr), 3)
+        self.assertEqual(arr["close"].tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(arr["number_of_trades"].dtype, np.int64)
+
+    def test_merge_prefers_newer_rows(self):
+        old = klines_to_array(fake_klines(0, 2 * HOUR_MS))
+        new = klines_to_array(fake_klines(HOUR_MS, 3 * HOUR_MS))
+        new["close"] = -1
+        merged = merge_klines(old, new)
+        self.assertEqual(merged["open_time"].tolist(), [0, HOUR_MS, 2 * HOUR_MS, 3 * HOUR_MS])
+        self.assertEqual(merged["close"].tolist(), [0.0, -1.0, -1.0, -1.0])
+
+    def test_fetches_only_missing_ranges(self):
+        """Ensure repeated requests only download the uncovered head and tail."""
+        start = self.now - 48 * HOUR_MS
+        first = self.cache.get_range("BTCUSDT", "1h", start, self.now - 1, self.fetch)
+        self.assertEqual(len(first), 48)
+        self.assertEqual(self.calls, [(start, self.now - 1)])
+
+        again = self.cache.get_range("BTCUSDT", "1h", start + 10 * HOUR_MS, self.now - 1, self.fetch)
+        self.assertEqual(len(again), 38)
+        self.assertEqual(len(self.calls), 1)
+
+        earlier = start - 24 * HOUR_MS
+        wider = self.cache.get_range("BTCUSDT", "1h", earlier, self.now - 1, self.fetch)
+        self.assertEqual(len(wider), 72)
+        self.assertEqual(self.calls[-1], (earlier, start - 1))
+        self.assertTrue(np.all(np.diff(wider["open_time"]) == HOUR_MS))
+
+    def test_open_candle_is_not_cached(self):
+        start = self.now - 5 * HOUR_MS
+        klines = self.cache.get_range("BTCUSDT", "1h", start, self.now + 1, self.fetch)
+        self.assertEqual(len(klines), 6)
+        cached, meta = self.cache.load("BTCUSDT", "1h")
+        self.assertEqual(len(cached), 5)
+        self.assertEqual(meta["end"], self.now - 1)
+
+    def test_offline_serves_cache_only(self):
+        start = self.now - 5 * HOUR_MS
+        self.cache.get_range("ETHUSDT", "1h", start, self.now - 1, self.fetch)
+        klines = self.cache.get_range("ETHUSDT", "1h", start - 10 * HOUR_MS, self.now - 1, self.fetch, offline=True)
+        self.assertEqual(len(klines), 5)
+        self.assertEqual(len(self.calls), 1)
+
+if __name__ == "__main__":
+    unittest.main()
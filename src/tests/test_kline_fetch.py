@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+from src.scraping.scrape_data import WeightLimiter, fetch_klines, klines_to_dataframe, split_time_range
+from src.tests.kline_fixtures import HOUR_MS, fake_klines
+
+
+class TestKlineFetch(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = []
+        self.lock = threading.Lock()
+
+    def get_klines(self, symbol, interval, startTime, endTime, limit):
+        with self.lock:
+            self.pages.append((startTime, endTime))
+        return fake_klines(startTime, endTime)[:limit]
+
+    def test_split_time_range(self):
+        pages = split_time_range(0, 2500 * HOUR_MS, HOUR_MS, limit=1000)
+        self.assertEqual(pages, [
+            (0, 1000 * HOUR_MS - 1),
+            (1000 * HOUR_MS, 2000 * HOUR_MS - 1),
+            (2000 * HOUR_MS, 2500 * HOUR_MS),
+        ])
+
+    def test_parallel_fetch_matches_serial(self):
+        start, end = 5 * HOUR_MS, 3200 * HOUR_MS
+        klines = fetch_klines("BTCUSDT", "1h", start, end, max_workers=4,
+                              limiter=WeightLimiter(), get_klines=self.get_klines)
+        self.assertEqual(len(self.pages), 4)
+        self.assertEqual(klines["open_time"].tolist(), [row[0] for row in fake_klines(start, end)])
+
+        df = klines_to_dataframe(klines)
+        self.assertEqual(df["close"].dtype, "float64")
+        self.assertEqual(list(df.columns)[-1], "date")
+
+    def test_empty_range(self):
+        klines = fetch_klines("BTCUSDT", "1h", 10, 5, limiter=WeightLimiter(), get_klines=self.get_klines)
+        self.assertEqual(len(klines), 0)
+
+    def test_weight_limiter_blocks_over_budget(self):
+        limiter = WeightLimiter(max_weight=4, period=0.2)
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.acquire(2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.19)
+
+    def test_weight_limiter_rejects_weight_above_budget(self):
+        with self.assertRaises(ValueError):
+            WeightLimiter(max_weight=4).acquire(5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.data.models.base import Base
+from src.data.models.market_data import MarketData
+from src.scraping.kline_ingest import ingest_klines, latest_open_time, load_market_data, upsert_klines
+from src.processing.backtester import Backtester
+from src.data.models.trading_strategy import TradingStrategy
+from src.tests.kline_fixtures import HOUR_MS, fake_klines
+
+START = pd.Timestamp("2024-01-01")
+START_MS = START.value // 10**6
+
+
+class TestKlineIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.calls = []
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def fetch(self, symbol, interval, lo, hi):
+        self.calls.append((lo, hi))
+        return fake_klines(lo, hi)
+
+    def count(self):
+        return self.session.query(MarketData).count()
+
+    def test_upsert_skips_duplicates(self):
+        klines = fake_klines(START_MS, START_MS + 9 * HOUR_MS)
+        self.assertEqual(upsert_klines(self.session, "BTCUSDT", klines), 10)
+        upsert_klines(self.session, "BTCUSDT", klines[5:] + fake_klines(START_MS + 10 * HOUR_MS, START_MS + 14 * HOUR_MS))
+        self.session.commit()
+        self.assertEqual(self.count(), 15)
+
+    def test_ingest_resumes_from_latest(self):
+        end = START + pd.Timedelta(hours=99)
+        ingest_klines(self.session, "BTCUSDT", "1h", START, end, batch_size=30, fetch=self.fetch)
+        self.assertEqual(self.count(), 100)
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(latest_open_time(self.session, "BTCUSDT"), end.to_pydatetime())
+
+        self.calls.clear()
+        ingest_klines(self.session, "BTCUSDT", "1h", START, end + pd.Timedelta(hours=10), batch_size=30,
+                      fetch=self.fetch)
+        self.assertEqual(self.calls[0][0], START_MS + 100 * HOUR_MS)
+        self.assertEqual(self.count(), 110)
+
+    def test_backtester_loads_from_database(self):
+        ingest_klines(self.session, "BTCUSDT", "1h", START, START + pd.Timedelta(hours=47), fetch=self.fetch)
+        df = load_market_data(self.session, "BTCUSDT", start=START + pd.Timedelta(hours=10))
+        self.assertEqual(len(df), 38)
+        self.assertEqual(df["close"].iloc[0], (START_MS + 10 * HOUR_MS) / HOUR_MS)
+
+        backtester = Backtester(TradingStrategy(), START, START + pd.Timedelta(hours=23))
+        backtester.load_data(symbol="BTCUSDT", session=self.session)
+        self.assertEqual(len(backtester.df), 24)
+        self.assertEqual(backtester.df.index[0], START)
+
+if __name__ == "__main__":
+    unittest.main()
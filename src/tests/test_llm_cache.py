@@ -0,0 +1,99 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import openai
+from src.scraping.analysis import AsyncArticleAnalyzer
+from src.scraping.llm_cache import AnalysisCache, analysis_key, set_analysis_cache
+from src.scraping.scrape_news import RSSSpider, set_openai_client
+from src.tests.openai_stub import OpenAIStub, BULLISH_REPLY
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "analysis.sqlite")
+        self.cache = AnalysisCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        set_analysis_cache(None)
+        set_openai_client(None)
+        self.tmp.cleanup()
+
+    def test_key_normalization(self):
+        key = analysis_key("BTC  rallies", "Price up.\n", "gpt-4-turbo", 1)
+        self.assertEqual(key, analysis_key("btc rallies", " price up.", "gpt-4-turbo", 1))
+        self.assertNotEqual(key, analysis_key("btc rallies", "price up.", "gpt-4o", 1))
+        self.assertNotEqual(key, analysis_key("btc rallies", "price up.", "gpt-4-turbo", 2))
+
+    def test_hits_misses_and_persistence(self):
+        self.assertIsNone(self.cache.get("k"))
+        self.cache.set("k", {"sentiment": "Bullish"})
+        self.assertEqual(self.cache.get("k"), {"sentiment": "Bullish"})
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+        self.assertEqual(AnalysisCache(self.path).get("k"), {"sentiment": "Bullish"})
+
+    def test_ttl_expiry(self):
+        self.cache.set("k", {"sentiment": "Bullish"})
+        with patch("src.scraping.llm_cache.time.time", return_value=1e12):
+            self.assertIsNone(self.cache.get("k"))
+            self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_hits_do_not_write_until_flushed(self):
+        cache = AnalysisCache(os.path.join(self.tmp.name, "touch.sqlite"))
+        cache.set("k", {"sentiment": "Bullish"})
+        with patch("src.scraping.llm_cache.time.time", return_value=time.time() + 60):
+            cache.get("k")
+        reader = sqlite3.connect(cache.path)
+        stored = lambda: reader.execute("SELECT last_access FROM analyses WHERE key = 'k'").fetchone()[0]
+        before = stored()
+        self.assertIn("k", cache.touched)
+        cache.close()
+        self.assertAlmostEqual(stored() - before, 60, delta=1)
+        reader.close()
+
+    def test_lru_size_eviction(self):
+        cache = AnalysisCache(os.path.join(self.tmp.name, "small.sqlite"), max_entries=2)
+        now = time.time()
+        with patch("src.scraping.llm_cache.time.time", side_effect=[now + 1, now + 2, now + 3, now + 4]):
+            cache.set("a", {})
+            cache.set("b", {})
+            cache.get("a")
+            cache.set("c", {})
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        cache.close()
+
+    def test_async_analyzer_skips_api_on_hit(self):
+        async def run(stub):
+            client = openai.AsyncOpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+            analyzer = AsyncArticleAnalyzer(client=client, cache=self.cache)
+            await analyzer.analyze("BTC rallies", "Price up.")
+            return await analyzer.analyze("btc  rallies", "price up.")
+
+        with OpenAIStub() as stub:
+            analysis = asyncio.run(run(stub))
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(analysis["sentiment"], "Bullish")
+
+    def test_sync_analysis_uses_shared_cache(self):
+        set_analysis_cache(self.cache)
+        client = MagicMock()
+        client.chat.completions.create.return_value.choices = [MagicMock()]
+        client.chat.completions.create.return_value.choices[0].message.content = BULLISH_REPLY
+        set_openai_client(client)
+        spider = RSSSpider()
+        for _ in range(3):
+            self.assertEqual(spider.analyze_article_with_gpt("Title", "Body")["sentiment"], "Bullish")
+        client.chat.completions.create.assert_called_once()
+
+if __name__ == "__main__":
+    unittest.main()
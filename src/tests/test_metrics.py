@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.metrics import compute_metrics, equity_from_trades, trade_pnl, periods_per_year
+from src.processing.execution_engine import simulate_long_flat
+from src.processing.parameter_sweep import ParameterSweep, grid_search_space
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        n = 250
+        self.dates = pd.date_range("2024-01-01", periods=n, freq="D")
+        self.close = 100 + rng.normal(0, 2, n).cumsum()
+        self.bullish = rng.random(n) < 0.15
+        self.bearish = rng.random(n) < 0.15
+        self.result = simulate_long_flat(self.close, self.bullish, self.bearish)
+
+    def test_single_curve_against_pandas(self):
+        equity = pd.Series(self.result["equity"])
+        metrics = compute_metrics(equity.to_numpy(), periods_per_year=365)
+        returns = equity.pct_change().dropna()
+        self.assertAlmostEqual(metrics["sharpe"], returns.mean() / returns.std() * np.sqrt(365))
+        self.assertAlmostEqual(metrics["max_drawdown_pct"], ((equity / equity.cummax()) - 1).min() * 100)
+        self.assertAlmostEqual(metrics["final_value"], self.result["final_value"])
+
+    def test_drawdown_duration(self):
+        metrics = compute_metrics(np.array([100, 110, 105, 100, 108, 111, 90, 95]))
+        self.assertEqual(metrics["max_drawdown_duration"], 3)
+        self.assertAlmostEqual(metrics["max_drawdown_pct"], (90 / 111 - 1) * 100)
+
+    def test_batch_matches_single_runs(self):
+        """Ensure a stacked batch scores exactly like scoring each run on its own."""
+        df = pd.DataFrame({"close": self.close, "bullish_signal": self.bullish, "bearish_signal": self.bearish},
+                          index=self.dates)
+        sweep = ParameterSweep(df, max_workers=1)
+        points = grid_search_space(bullish_ma_window=[3, 5, 10], trading_fee=[0.0, 0.001])
+        equity, position = sweep.equity_curves(points)
+        batch = compute_metrics(equity, position)
+        self.assertEqual(len(batch), 6)
+        for i in range(6):
+            single = compute_metrics(equity[i], position[i])
+            for name, value in single.items():
+                self.assertAlmostEqual(batch[name].iloc[i], value, places=9)
+
+    def test_trade_pnl_matches_trades(self):
+        pnl = trade_pnl(self.result["equity"], self.result["state"])
+        buys = self.result["trade_idx"][self.result["is_buy"]]
+        self.assertEqual(pnl["entry"].tolist(), buys.tolist())
+        self.assertAlmostEqual(pnl["pnl"].sum(), self.result["final_value"] - 10000, places=6)
+
+    def test_equity_from_trades(self):
+        trades = [
+            {"date": self.dates[i], "action": "BUY" if buy else "SELL", "amount": amount}
+            for i, buy, amount in zip(self.result["trade_idx"], self.result["is_buy"], self.result["amounts"])
+        ]
+        equity, position = equity_from_trades(self.close, self.dates, trades)
+        np.testing.assert_allclose(equity, self.result["equity"])
+        np.testing.assert_array_equal(position, self.result["state"])
+
+    def test_periods_per_year(self):
+        self.assertAlmostEqual(periods_per_year(self.dates), 365)
+        self.assertAlmostEqual(periods_per_year(pd.date_range("2024", periods=10, freq="h")), 365 * 24)
+
+if __name__ == "__main__":
+    unittest.main()
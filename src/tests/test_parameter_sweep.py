@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.parameter_sweep import ParameterSweep, grid_search_space, random_search_space
+from src.processing.indicators import sma
+from src.data.models.trading_strategy import TradingStrategy
+
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        n = 400
+        self.df = pd.DataFrame({
+            "close": 1000 + rng.normal(0, 5, n).cumsum(),
+            "bullish_signal": rng.random(n) < 0.2,
+            "bearish_signal": rng.random(n) < 0.2,
+        }, index=pd.date_range("2024-01-01", periods=n, freq="h"))
+
+    def test_grid_search_space(self):
+        space = grid_search_space(bullish_ma_window=[5, 10], trading_fee=[0.001, 0.002, 0.0])
+        self.assertEqual(len(space), 6)
+        self.assertIn({"bullish_ma_window": 10, "trading_fee": 0.0}, space)
+
+    def test_random_search_space(self):
+        space = random_search_space(50, seed=1, bullish_ma_window=(3, 30), trading_fee=(0.0, 0.01),
+                                    initial_balance=[1000, 10000])
+        self.assertEqual(len(space), 50)
+        for point in space:
+            self.assertTrue(3 <= point["bullish_ma_window"] <= 30)
+            self.assertTrue(0.0 <= point["trading_fee"] <= 0.01)
+            self.assertIn(point["initial_balance"], [1000, 10000])
+
+    def test_moving_average_matches_strategy_rule(self):
+        """Ensure the sweep's buy rule agrees with TradingStrategy.should_buy."""
+        strategy = TradingStrategy(bullish_ma_window=7)
+        expected = [bool(strategy.should_buy(self.df, d)) for d in self.df.index]
+        close = self.df["close"].to_numpy()
+        buy = self.df["bullish_signal"].to_numpy() & (close > sma(close, 7))
+        buy[:7] = False
+        self.assertEqual(buy.tolist(), expected)
+
+    def test_parallel_matches_serial(self):
+        space = grid_search_space(bullish_ma_window=[3, 5, 8, 13], trading_fee=[0.001, 0.0005])
+        serial = ParameterSweep(self.df, max_workers=1).run(space)
+        parallel = ParameterSweep(self.df, max_workers=2).run(space)
+        pd.testing.assert_frame_equal(serial, parallel)
+        self.assertEqual(serial["rank"].tolist(), list(range(1, 9)))
+        self.assertTrue(serial["return_pct"].is_monotonic_decreasing)
+
+    def test_ranks_by_return_not_balance(self):
+        space = grid_search_space(bullish_ma_window=[3, 5, 8, 13], initial_balance=[1000, 1000000])
+        table = ParameterSweep(self.df, max_workers=1).run(space)
+        self.assertTrue(table["return_pct"].is_monotonic_decreasing)
+        # Ranking by final_value would put every large-balance point first.
+        self.assertFalse(table["final_value"].is_monotonic_decreasing)
+
+    def test_missing_columns(self):
+        with self.assertRaises(KeyError):
+            ParameterSweep(self.df.drop(columns=["bearish_signal"]))
+
+if __name__ == "__main__":
+    unittest.main()
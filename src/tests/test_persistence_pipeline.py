@@ -0,0 +1,86 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.data.models.base import Base
+from src.data.models.article import Article
+from src.data.models.analysis_summary import AnalysisSummary
+from src.data.models.database import set_engine
+from src.scraping.dedup import UrlIndex
+from src.scraping.pipelines import ArticlePersistencePipeline
+
+
+def make_item(i, sentiment="Bullish"):
+    return {
+        "source": "Test", "title": f"Article {i}", "url": f"https://example.com/{i}", "content": "text",
+        "published_at": datetime(2024, 1, 1),
+        "analysis": {"sentiment": sentiment, "key_points": ["k"], "potential_impact": "up", "credibility_issues": None},
+    }
+
+
+class FakeCrawler:
+    def __init__(self, url_index):
+        self.spider = type("Spider", (), {"url_index": url_index})()
+
+
+class TestPersistencePipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        set_engine(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self.count_statement)
+        self.url_index = UrlIndex()
+        self.pipeline = ArticlePersistencePipeline(FakeCrawler(self.url_index), batch_size=50, flush_interval=60)
+
+    def tearDown(self):
+        self.session.close()
+        set_engine(None)
+
+    def count_statement(self, conn, cursor, statement, *args):
+        if statement.startswith("INSERT"):
+            self.statements.append(statement)
+
+    def test_flushes_in_bulk(self):
+        for i in range(120):
+            self.pipeline.process_item(make_item(i))
+        self.assertEqual(self.session.query(Article).count(), 100)
+        self.pipeline.close_spider()
+        self.assertEqual(self.session.query(Article).count(), 120)
+        self.assertEqual(self.session.query(AnalysisSummary).count(), 120)
+        # One article insert and one summary upsert per batch.
+        self.assertEqual(len(self.statements), 6)
+        self.assertIn("https://example.com/7", self.url_index)
+
+    def test_known_urls_and_in_batch_duplicates_are_skipped(self):
+        self.pipeline.process_item(make_item(1))
+        self.pipeline.flush()
+        for item in (make_item(1, "Bearish"), make_item(2), make_item(2, "Bearish")):
+            self.pipeline.process_item(item)
+        self.pipeline.flush()
+        self.assertEqual(self.session.query(Article).count(), 2)
+        sentiments = {s.article_id: s.sentiment for s in self.session.query(AnalysisSummary)}
+        self.assertEqual(sorted(sentiments.values()), ["Bullish", "Bullish"])
+
+    def test_flushes_on_time_threshold(self):
+        pipeline = ArticlePersistencePipeline(batch_size=50, flush_interval=5)
+        with patch("src.scraping.pipelines.time.monotonic", side_effect=[0, 1, 6]):
+            pipeline.process_item(make_item(1))
+            pipeline.process_item(make_item(2))
+        self.assertEqual(self.session.query(Article).count(), 2)
+
+    def test_failed_batch_is_retried_per_item(self):
+        bad = make_item(3)
+        bad["title"] = None  # violates NOT NULL
+        self.url_index.claim(bad["url"])
+        for item in (make_item(1), bad, make_item(2)):
+            self.pipeline.process_item(item)
+        self.pipeline.flush()
+        self.assertEqual(self.session.query(Article).count(), 2)
+        self.assertNotIn(bad["url"], self.url_index)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.portfolio import PortfolioBacktester
+from src.processing.backtester import Backtester
+from src.data.models.trading_strategy import TradingStrategy
+
+
+def make_frame(start, n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=n, freq="D"),
+        "close": 100 + rng.normal(0, 1, n).cumsum(),
+    })
+
+
+def make_events(dates, seed, column):
+    rng = np.random.default_rng(seed)
+    picked = dates[rng.random(len(dates)) < 0.2]
+    return pd.DataFrame({"date_parsed": picked + pd.Timedelta(hours=6), column: True})
+
+
+class TestPortfolioBacktester(unittest.TestCase):
+
+    def setUp(self):
+        self.symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        self.frames = {
+            "BTCUSDT": make_frame("2023-12-01", 120, 1),
+            "ETHUSDT": make_frame("2023-12-01", 120, 2),
+            "SOLUSDT": make_frame("2024-01-20", 60, 3),  # listed later
+        }
+        self.portfolio = PortfolioBacktester(
+            TradingStrategy(), self.symbols, "2024-01-01", "2024-03-15"
+        )
+        self.portfolio.set_prices(self.frames)
+        for i, symbol in enumerate(self.symbols):
+            self.portfolio.join_signals(
+                symbol,
+                make_events(self.portfolio.dates, 10 + i, "bullish_signal"),
+                make_events(self.portfolio.dates, 20 + i, "bearish_signal"),
+            )
+
+    def test_prices_are_aligned_and_sliced(self):
+        self.assertEqual(self.portfolio.close.shape, (75, 3))
+        self.assertEqual(self.portfolio.dates[0], pd.Timestamp("2024-01-01"))
+
+    def test_end_date_keeps_intraday_bars_of_last_day(self):
+        frame = pd.DataFrame({"date": pd.date_range("2024-03-14", periods=72, freq="h"), "close": 100.0})
+        portfolio = PortfolioBacktester(TradingStrategy(), ["BTCUSDT"], "2024-03-14", "2024-03-15")
+        portfolio.set_prices({"BTCUSDT": frame})
+        self.assertEqual(len(portfolio.dates), 48)
+        self.assertEqual(portfolio.dates[-1], pd.Timestamp("2024-03-15 23:00"))
+        self.assertEqual(self.portfolio.dates[-1], pd.Timestamp("2024-03-15"))
+        self.assertTrue(np.isnan(self.portfolio.close[0, 2]))
+
+    def test_sleeves_match_single_symbol_backtests(self):
+        """Ensure each asset sleeve equals a single-symbol backtest with its share of the balance."""
+        final_value = self.portfolio.execute_strategy()
+        total = 0.0
+        for i, symbol in enumerate(self.symbols):
+            backtester = Backtester(TradingStrategy(), "2024-01-01", "2024-03-15",
+                                    initial_balance=10000 / 3)
+            priced = np.isfinite(self.portfolio.close[:, i])
+            backtester.df = pd.DataFrame({
+                "close": self.portfolio.close[:, i],
+                "bullish_signal": self.portfolio.bullish[:, i] & priced,
+                "bearish_signal": self.portfolio.bearish[:, i] & priced,
+            }, index=self.portfolio.dates)
+            value = backtester.execute_strategy(engine="loop")
+            self.assertAlmostEqual(value, self.portfolio.asset_equity[symbol].iloc[-1], places=6)
+            symbol_trades = [t for t in self.portfolio.trades if t["symbol"] == symbol]
+            self.assertEqual([t["date"] for t in backtester.trades], [t["date"] for t in symbol_trades])
+            total += value
+        self.assertAlmostEqual(final_value, total, places=6)
+
+    def test_unlisted_asset_does_not_trade(self):
+        self.portfolio.execute_strategy()
+        listing = pd.Timestamp("2024-01-20")
+        self.assertFalse(any(t["symbol"] == "SOLUSDT" and t["date"] < listing for t in self.portfolio.trades))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from src.processing.rendering import lttb_indices, downsample_series
+from src.processing.backtester import Backtester
+from src.data.models.trading_strategy import TradingStrategy
+
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 20000
+        self.backtester = Backtester(TradingStrategy(), "2024-01-01", "2024-12-31")
+        self.backtester.df = pd.DataFrame({
+            "close": 100 + rng.normal(0, 1, n).cumsum(),
+            "bullish_signal": rng.random(n) < 0.01,
+            "bearish_signal": rng.random(n) < 0.01,
+        }, index=pd.date_range("2024-01-01", periods=n, freq="min"))
+        self.backtester.execute_strategy()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lttb_keeps_endpoints_and_extremes(self):
+        y = np.sin(np.linspace(0, 20, 5000))
+        y[1234] = 10
+        idx = lttb_indices(y, 200)
+        self.assertEqual(len(idx), 200)
+        self.assertEqual(idx[0], 0)
+        self.assertEqual(idx[-1], 4999)
+        self.assertIn(1234, idx)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+
+    def test_short_series_is_untouched(self):
+        np.testing.assert_array_equal(lttb_indices([1, 2, 3], 10), [0, 1, 2])
+
+    def test_downsample_keeps_trade_bars(self):
+        keep = np.array([7, 8, 9, 15000])
+        dates, close = downsample_series(np.arange(20000), np.zeros(20000), 100, keep=keep)
+        self.assertTrue(set(keep) <= set(dates))
+        self.assertLessEqual(len(dates), 104)
+
+    def test_plot_writes_png_and_svg(self):
+        for name in ("chart.png", "chart.svg"):
+            path = os.path.join(self.tmp.name, name)
+            self.assertEqual(self.backtester.plot_results(path=path, max_points=500), path)
+            self.assertGreater(os.path.getsize(path), 0)
+
+    def test_plot_in_background_worker(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                self.backtester.plot_results(path=os.path.join(self.tmp.name, f"chart{i}.png"), executor=executor)
+                for i in range(2)
+            ]
+            for future in futures:
+                self.assertTrue(os.path.exists(future.result()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import pytest
+import asyncio
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from scrapy.http import Request, HtmlResponse
 from src.scraping.scrape_news import RSSSpider
+from src.scraping.analysis import AsyncArticleAnalyzer
+from src.scraping.pipelines import AnalysisPipeline, ArticlePersistencePipeline
+from src.data.models.database import set_engine
 from src.data.models.article import Article
 from src.data.models.analysis_summary import AnalysisSummary
 
@@ -10,17 +14,21 @@ from src.data.models.analysis_summary import AnalysisSummary
 def spider():
     return RSSSpider()
 
-@patch("src.scraping.scrape_news.client.chat.completions.create")
-def test_rss_spider_parse_article(mock_openai_api, spider, db_session):
+@pytest.fixture
+def openai_client():
     mock_analysis = {
         "sentiment": "Bullish",
         "key_points": ["Institutional interest increasing", "New market ATH"],
         "potential_impact": "Positive short-term momentum",
         "credibility_issues": None
     }
-    mock_openai_api.return_value.choices = [MagicMock()]
-    mock_openai_api.return_value.choices[0].message.content = json.dumps(mock_analysis)
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock()
+    client.chat.completions.create.return_value.choices = [MagicMock()]
+    client.chat.completions.create.return_value.choices[0].message.content = json.dumps(mock_analysis)
+    return client
 
+def test_rss_spider_parse_article(openai_client, spider, db_session):
     request = Request(
         url="https://example.com/bitcoin-new-high",
         meta={
@@ -37,10 +45,19 @@ def test_rss_spider_parse_article(mock_openai_api, spider, db_session):
         request=request
     )
 
-    original_get_session = spider.parse_article.__globals__['get_session']
-    spider.parse_article.__globals__['get_session'] = lambda: db_session
+    item = next(spider.parse_article(response))
+    analysis_pipeline = AnalysisPipeline(analyzer=AsyncArticleAnalyzer(client=openai_client))
+    result = asyncio.run(analysis_pipeline.process_item(item, spider))
 
-    result = next(spider.parse_article(response))
+    set_engine(db_session.get_bind())
+    try:
+        persistence = ArticlePersistencePipeline()
+        persistence.process_item(result, spider)
+        persistence.close_spider(spider)
+    finally:
+        set_engine(None)
 
     assert result['source'] == 'MockSource'
     assert result['analysis']['sentiment'] == 'Bullish'
+    article = db_session.query(Article).filter_by(url="https://example.com/bitcoin-new-high").first()
+    assert db_session.query(AnalysisSummary).filter_by(article_id=article.id).first().sentiment == "Bullish"
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.processing import sentiment
+from src.processing.sentiment import SentimentScorer, score_articles, sentiment_labels
+
+
+class TestSentimentScorer(unittest.TestCase):
+
+    def test_scores_each_text_once(self):
+        scorer = SentimentScorer()
+        texts = ["bitcoin rallies strongly", "market crashes badly", "bitcoin rallies strongly"]
+        with patch.object(sentiment, "polarity", wraps=sentiment.polarity) as polarity:
+            first = scorer.score(texts)
+            second = scorer.score(texts[:2])
+        self.assertEqual(polarity.call_count, 2)
+        self.assertEqual(first[0], first[2])
+        self.assertEqual(list(second), list(first[:2]))
+        self.assertEqual(scorer.stats()["misses"], 2)
+        self.assertEqual(scorer.stats()["hits"], 3)
+
+    def test_lru_bound(self):
+        scorer = SentimentScorer(max_entries=2)
+        scorer.score(["a", "b", "c"])
+        self.assertEqual(len(scorer.memory), 2)
+        self.assertNotIn(sentiment.sentiment_key("a"), scorer.memory)
+
+    def test_persisted_scores_survive_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sentiment.sqlite")
+            scorer = SentimentScorer(path=path)
+            scores = scorer.score(["good news", "terrible news"])
+            scorer.close()
+            scorer = SentimentScorer(path=path)
+            with patch.object(sentiment, "polarity") as polarity:
+                self.assertEqual(list(scorer.score(["terrible news", "good news"])), list(scores[::-1]))
+            polarity.assert_not_called()
+            scorer.close()
+
+    def test_score_articles_and_labels(self):
+        articles = [
+            {"title": "Up", "content": "<p>Bitcoin rallies strongly, great gains!</p>", "published_at": "2025-03-15"},
+            {"title": "Down", "content": "Terrible crash, awful losses.", "published_at": "2025-03-16"},
+        ]
+        scored = score_articles(articles, scorer=SentimentScorer())
+        self.assertEqual(list(sentiment_labels(scored["sentiment_score"])), ["Bullish", "Bearish"])
+        self.assertEqual(scored["date_parsed"].iloc[0], pd.Timestamp("2025-03-15"))
+        # An already scored frame is passed through untouched.
+        with patch.object(sentiment, "polarity") as polarity:
+            again = score_articles(scored)
+        polarity.assert_not_called()
+        self.assertEqual(list(again["sentiment_score"]), list(scored["sentiment_score"]))
+        self.assertTrue(score_articles([]).empty)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.signal_join import align_events, join_signal, bar_width
+
+
+class TestSignalJoin(unittest.TestCase):
+
+    def setUp(self):
+        self.daily = pd.date_range("2024-01-01", periods=10, freq="D")
+        self.events = pd.DataFrame({
+            "date_parsed": pd.to_datetime([
+                "2024-01-03 00:00", "2024-01-03 15:30", "2024-01-05 09:00",
+                "2023-12-31 12:00", "2024-02-01 00:00", None,
+            ]),
+            "bullish_signal": [False, True, True, True, True, True],
+        })
+
+    def test_bar_width(self):
+        self.assertEqual(bar_width(self.daily), pd.Timedelta("1D"))
+        self.assertIsNone(bar_width(self.daily[:1]))
+
+    def test_asof_alignment(self):
+        """Ensure intraday articles land on the bar that was open when they were published."""
+        pos = align_events(self.daily, self.events["date_parsed"])
+        self.assertEqual(pos.tolist(), [2, 2, 4, -1, -1, -1])
+
+    def test_floor_matches_asof_on_regular_bars(self):
+        asof = join_signal(self.daily, self.events, "bullish_signal", how="asof")
+        floor = join_signal(self.daily, self.events, "bullish_signal", how="floor")
+        np.testing.assert_array_equal(asof, floor)
+        self.assertEqual(np.flatnonzero(asof).tolist(), [2, 4])
+
+    def test_asof_skips_gaps(self):
+        """Ensure articles published during a gap in the bars are not assigned to a stale bar."""
+        index = pd.date_range("2024-01-01 00:00", periods=5, freq="min").append(
+            pd.date_range("2024-01-01 00:10", periods=2, freq="min")
+        )
+        events = pd.DataFrame({
+            "date_parsed": pd.to_datetime(["2024-01-01 00:04:30", "2024-01-01 00:07:00", "2024-01-01 00:10:59"]),
+            "bearish_signal": [True, True, True],
+        })
+        signal = join_signal(index, events, "bearish_signal", how="asof")
+        self.assertEqual(np.flatnonzero(signal).tolist(), [4, 5])
+
+    def test_empty_events(self):
+        events = pd.DataFrame(columns=["date_parsed", "bullish_signal"])
+        self.assertFalse(join_signal(self.daily, events, "bullish_signal").any())
+
+    def test_unsorted_index(self):
+        with self.assertRaises(ValueError):
+            align_events(self.daily[::-1], self.events["date_parsed"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.data.models.base import Base
+from src.data.models.market_data import MarketData
+from src.processing.backtester import Backtester
+from src.processing.signal_join import join_signal
+from src.processing.streaming import (
+    StreamingBacktester, iter_dataframe_chunks, iter_cached_klines, iter_market_data
+)
+from src.data.models.trading_strategy import TradingStrategy
+from src.scraping.kline_cache import KlineCache, KLINE_DTYPE
+
+
+class TestStreamingBacktester(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        n = 500
+        self.klines = pd.DataFrame({
+            "close": 1000 + rng.normal(0, 5, n).cumsum(),
+        }, index=pd.date_range("2024-01-01", periods=n, freq="h", name="date"))
+        m = 300
+        times = np.sort(self.klines.index[0] + pd.to_timedelta(rng.integers(-3600, n * 3600, m), unit="s"))
+        self.events = pd.DataFrame({
+            "date_parsed": times,
+            "bullish_signal": rng.random(m) < 0.4,
+            "bearish_signal": rng.random(m) < 0.4,
+        })
+
+    def in_memory(self, use_strategy=False):
+        backtester = Backtester(TradingStrategy(bullish_ma_window=6), "2024-01-01", "2024-12-31")
+        backtester.df = self.klines.copy()
+        for column in ("bullish_signal", "bearish_signal"):
+            backtester.df[column] = join_signal(backtester.df.index, self.events, column)
+        final_value = backtester.execute_strategy(use_strategy=use_strategy)
+        return final_value, backtester.trades
+
+    def test_matches_in_memory_engine(self):
+        """Ensure chunked streaming reproduces the in-memory result for any chunking."""
+        for use_strategy in (False, True):
+            expected_value, expected_trades = self.in_memory(use_strategy)
+            for kline_chunk, event_chunk in [(1, 1), (7, 50), (128, 13), (1000, 1000)]:
+                streamer = StreamingBacktester(TradingStrategy(bullish_ma_window=6), use_strategy=use_strategy)
+                value = streamer.run(
+                    iter_dataframe_chunks(self.klines, kline_chunk),
+                    iter_dataframe_chunks(self.events, event_chunk),
+                )
+                self.assertAlmostEqual(value, expected_value, places=6)
+                self.assertEqual([t["date"] for t in streamer.trades], [t["date"] for t in expected_trades])
+                for expected, actual in zip(expected_trades, streamer.trades):
+                    self.assertAlmostEqual(expected["amount"], actual["amount"], places=9)
+
+    def test_without_events(self):
+        streamer = StreamingBacktester()
+        self.assertEqual(streamer.run(iter_dataframe_chunks(self.klines, 100)), 10000)
+        self.assertEqual(streamer.bars_seen, 500)
+
+    def test_cached_klines_source(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            cache = KlineCache(cache_dir)
+            arr = np.zeros(len(self.klines), dtype=KLINE_DTYPE)
+            arr["open_time"] = self.klines.index.as_unit("ms").asi8
+            arr["close"] = self.klines["close"].to_numpy()
+            cache.store("BTCUSDT", "1h", arr, {"start": 0, "end": 0})
+            chunks = list(iter_cached_klines(cache, "BTCUSDT", "1h", start="2024-01-02", chunk_size=100))
+            self.assertEqual(len(chunks), 5)
+            streamed = pd.concat(chunks)
+            self.assertEqual(streamed.index[0], pd.Timestamp("2024-01-02"))
+            np.testing.assert_allclose(streamed["close"].to_numpy(), self.klines["close"].to_numpy()[24:])
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_market_data_source(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        for i in range(25):
+            open_time = datetime(2024, 1, 1) + timedelta(hours=i)
+            session.add(MarketData(
+                symbol="BTCUSDT", open_time=open_time, close_time=open_time + timedelta(minutes=59),
+                open_price=1.0, high_price=1.0, low_price=1.0, close_price=float(i), volume=1.0, trades_count=1
+            ))
+        session.commit()
+        chunks = list(iter_market_data(session, "BTCUSDT", start=datetime(2024, 1, 1, 5), chunk_size=8))
+        self.assertEqual([len(c) for c in chunks], [8, 8, 4])
+        self.assertEqual(pd.concat(chunks)["close"].tolist(), [float(i) for i in range(5, 25)])
+        session.close()
+
+if __name__ == "__main__":
+    unittest.main()
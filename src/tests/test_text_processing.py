@@ -0,0 +1,41 @@
+import random
+import re
+import unittest
+
+import pandas as pd
+
+from src.processing.text import clean_text, text_features
+
+
+def reference_clean(text):
+    text = re.sub(r'<[^>]*>', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    return text.lower().strip()
+
+
+class TestTextProcessing(unittest.TestCase):
+
+    def test_matches_regex_cleaning(self):
+        rng = random.Random(0)
+        alphabet = "<>/ aZ9!.\t\n\x1c\xa0é"
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(clean_text(text), reference_clean(text), repr(text))
+
+    def test_features(self):
+        content = pd.Series(["<p>Bitcoin UP 5%!</p>", None, "  Crash   incoming "], index=[10, 11, 12])
+        features = text_features(content, pd.Series(["a", "bb", "ccc"], index=[10, 11, 12]))
+        self.assertEqual(features["clean_content"].tolist(), ["bitcoin up 5", "", "crash   incoming"])
+        self.assertEqual(features["word_count"].tolist(), [3, 0, 2])
+        self.assertEqual(features["content_length"].tolist(), [12, 0, 16])
+        self.assertEqual(features["title_length"].tolist(), [1, 2, 3])
+        self.assertEqual(features.index.tolist(), [10, 11, 12])
+
+    def test_process_pool_keeps_order(self):
+        content = pd.Series([f"<b>Article</b> number {i}" for i in range(50)])
+        features = text_features(content, workers=2, chunk_size=7)
+        self.assertEqual(features["clean_content"].tolist(), [f"article number {i}" for i in range(50)])
+        self.assertTrue((features["word_count"] == 3).all())
+
+if __name__ == "__main__":
+    unittest.main()
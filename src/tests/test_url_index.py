@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from scrapy.http import Request, XmlResponse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.data.models.base import Base
+from src.data.models.article import Article
+from src.scraping.dedup import UrlIndex
+from src.scraping.feed_state import FeedStateStore
+from src.scraping.scrape_news import RSSSpider
+
+RSS_BODY = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<item><title>Known</title><link>https://example.com/known</link><description>old</description></item>
+<item><title>New</title><link>https://example.com/new</link><description>fresh</description></item>
+<item><title>New again</title><link>https://example.com/new#comments</link><description>dup</description></item>
+</channel></rss>"""
+
+
+class TestUrlIndex(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        self.session.add(Article(source="Test", title="Known", url="https://example.com/known"))
+        self.session.commit()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.session.close()
+        self.tmp.cleanup()
+
+    def test_load_and_claim(self):
+        index = UrlIndex.load(self.session, batch_size=1)
+        self.assertIn("https://example.com/known", index)
+        self.assertFalse(index.claim("https://example.com/known "))
+        self.assertTrue(index.claim("https://example.com/other"))
+        self.assertFalse(index.claim("https://example.com/other"))
+        index.release("https://example.com/other")
+        self.assertTrue(index.claim("https://example.com/other"))
+
+    def test_parse_rss_skips_known_urls_before_requesting(self):
+        spider = RSSSpider(url_index=UrlIndex.load(self.session),
+                           feed_state=FeedStateStore(os.path.join(self.tmp.name, "state.json")))
+        response = XmlResponse(
+            url="https://example.com/feed", body=RSS_BODY.encode("utf-8"),
+            request=Request("https://example.com/feed", meta={"source_name": "Test"}),
+        )
+        requests = list(spider.parse_rss(response))
+        self.assertEqual([r.url for r in requests], ["https://example.com/new"])
+        self.assertIn("https://example.com/new", spider.url_index)
+
+if __name__ == "__main__":
+    unittest.main()
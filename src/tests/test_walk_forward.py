@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.processing.walk_forward import WalkForward, walk_forward_splits
+from src.processing.parameter_sweep import evaluate_point, grid_search_space
+from src.processing.execution_engine import simulate_long_flat
+
+
+class TestWalkForward(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 365
+        self.df = pd.DataFrame({
+            "close": 1000 + rng.normal(0, 10, n).cumsum(),
+            "bullish_signal": rng.random(n) < 0.2,
+            "bearish_signal": rng.random(n) < 0.2,
+        }, index=pd.date_range("2023-01-01", periods=n, freq="D"))
+
+    def test_bar_count_splits(self):
+        folds = walk_forward_splits(self.df.index, 100, 50)
+        self.assertEqual(folds[:2], [(0, 100, 150), (50, 150, 200)])
+        self.assertEqual(folds[-1], (250, 350, 365))
+        anchored = walk_forward_splits(self.df.index, 100, 50, anchored=True)
+        self.assertTrue(all(train_start == 0 for train_start, _, _ in anchored))
+
+    def test_time_splits(self):
+        folds = walk_forward_splits(self.df.index, "90D", "30D")
+        self.assertEqual(folds[0], (0, 90, 120))
+        self.assertEqual(folds[1], (30, 120, 150))
+        self.assertTrue(all(b == a[2] for a, (_, b, _) in zip(folds, folds[1:])))
+
+    def test_parallel_matches_serial(self):
+        space = grid_search_space(bullish_ma_window=[3, 5, 10, 20])
+        serial = WalkForward(self.df, 120, 30, max_workers=1).run(space)
+        parallel = WalkForward(self.df, 120, 30, max_workers=2).run(space)
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_chosen_params_beat_alternatives_in_training(self):
+        space = grid_search_space(bullish_ma_window=[3, 5, 10, 20])
+        table = WalkForward(self.df, 120, 30, max_workers=1).run(space)
+        close, bull, bear = (self.df[c].to_numpy() for c in ("close", "bullish_signal", "bearish_signal"))
+        for row in table.itertuples():
+            train = slice(self.df.index.get_loc(row.train_start), self.df.index.get_loc(row.test_start))
+            best = max(evaluate_point(close, bull, bear, p, bars=train)["return_pct"] for p in space)
+            self.assertAlmostEqual(row.train_return_pct, best)
+
+    def test_fold_selection_ignores_initial_balance(self):
+        space = grid_search_space(bullish_ma_window=[3, 5, 10, 20], initial_balance=[1000, 1000000])
+        table = WalkForward(self.df, 120, 30, max_workers=1).run(space, chained=False)
+        close, bull, bear = (self.df[c].to_numpy() for c in ("close", "bullish_signal", "bearish_signal"))
+        for row in table.itertuples():
+            train = slice(self.df.index.get_loc(row.train_start), self.df.index.get_loc(row.test_start))
+            best = max(evaluate_point(close, bull, bear, p, bars=train)["return_pct"] for p in space)
+            self.assertAlmostEqual(row.train_return_pct, best)
+
+    def test_chained_carries_cash_and_position(self):
+        """Ensure chained windows equal one continuous run over the test span."""
+        walk_forward = WalkForward(self.df, 120, 30, max_workers=1)
+        table = walk_forward.run(params={"bullish_ma_window": 5})
+        close, bull, bear = (self.df[c].to_numpy() for c in ("close", "bullish_signal", "bearish_signal"))
+        buy = bull & (close > self.df["close"].rolling(5).mean().to_numpy())
+        expected = simulate_long_flat(close[120:], buy[120:], bear[120:])
+
+        self.assertAlmostEqual(walk_forward.equity_curve.iloc[-1], expected["final_value"])
+        compounded = np.prod(1 + table["chained_return_pct"] / 100) * 10000
+        self.assertAlmostEqual(compounded, expected["final_value"], places=6)
+
+    def test_chained_uses_each_folds_trading_fee(self):
+        # The searched fee differs from the base params' default fee.
+        space = grid_search_space(bullish_ma_window=[3, 10], trading_fee=[0.05])
+        walk_forward = WalkForward(self.df, 120, 30, max_workers=1)
+        table = walk_forward.run(space)
+
+        close, bull, bear = (self.df[c].to_numpy() for c in ("close", "bullish_signal", "bearish_signal"))
+        holding, state = 10000, False
+        for i, row in enumerate(table.itertuples()):
+            bars = slice(self.df.index.get_loc(row.test_start), self.df.index.get_loc(row.test_end) + 1)
+            buy = bull & (close > self.df["close"].rolling(row.bullish_ma_window).mean().to_numpy())
+            result = simulate_long_flat(close[bars], buy[bars], bear[bars], initial_balance=holding,
+                                        trading_fee=row.trading_fee, initial_state=state, skip_first=i == 0)
+            holding, state = result["holding"][-1], result["state"][-1]
+        self.assertAlmostEqual(walk_forward.equity_curve.iloc[-1], result["final_value"])
+
+    def test_chained_requires_back_to_back_windows(self):
+        with self.assertRaises(ValueError):
+            WalkForward(self.df, 120, 30, step=10, max_workers=1).run()
+
+if __name__ == "__main__":
+    unittest.main()